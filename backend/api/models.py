@@ -2,7 +2,7 @@
 Pydantic Models for API Requests and Responses
 """
 from pydantic import BaseModel, Field
-from typing import Any, Optional, Literal
+from typing import Any, List, Optional, Literal
 from datetime import datetime
 
 # Allowed audio quality values (kbps)
@@ -41,6 +41,28 @@ class ApiResponse(BaseModel):
     success: bool
     data: Optional[Any] = None
     error: Optional[ErrorDetail] = None
+    next_cursor: Optional[str] = None  # Set by paginated list endpoints while more pages exist
+
+
+# ============================================================================
+# Batch Models
+# ============================================================================
+
+# Items accepted by a single batch request
+MAX_BATCH_ITEMS = 1000
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one item of a batch request (index into the request list)"""
+    index: int
+    success: bool
+    data: Optional[Any] = None
+    error: Optional[ErrorDetail] = None
+
+
+class BatchIds(BaseModel):
+    """Request model for batch deletes"""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
 
 
 # ============================================================================
@@ -51,6 +73,8 @@ class DownloadRequest(BaseModel):
     """Request model for starting a download"""
     url: str = Field(..., description="YouTube video URL")
     quality: AudioQuality = Field(default=DEFAULT_QUALITY, description="Audio quality in kbps")
+    priority: int = Field(default=0, description="Scheduling priority (higher runs first)")
+    force: bool = Field(default=False, description="Download again even if the video is already downloaded or in progress")
 
 
 class Download(BaseModel):
@@ -107,6 +131,28 @@ class QueueItemUpdate(BaseModel):
     position: Optional[int] = None
 
 
+class QueueBatchAddItem(BaseModel):
+    """One URL of a batch queue insert"""
+    url: str
+    priority: int = 0
+    quality: AudioQuality = DEFAULT_QUALITY
+
+
+class QueueBatchAdd(BaseModel):
+    """Request model for adding many URLs to the queue"""
+    items: List[QueueBatchAddItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class QueueBatchUpdateItem(QueueItemUpdate):
+    """Priority/position change for one queue item"""
+    id: int
+
+
+class QueueBatchUpdate(BaseModel):
+    """Request model for reprioritizing many queue items"""
+    items: List[QueueBatchUpdateItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
 # ============================================================================
 # Config Models
 # ============================================================================
@@ -118,6 +164,12 @@ class AppConfig(BaseModel):
     auto_open: bool = True
     language: str = "tr"
     history_retention_days: int = 0  # 0 means forever, otherwise delete after N days
+    max_download_workers: int = 3
+    max_conversion_workers: int = 2
+    auto_scale_workers: bool = False  # Overrides the worker counts above while enabled
+    max_finished_jobs: int = 200  # Finished jobs kept in memory per service
+    finished_job_retention_minutes: int = 60
+    parallel_conversion_min_minutes: int = 0  # 0 disables segmented conversion
 
 
 class ConfigUpdate(BaseModel):
@@ -127,6 +179,12 @@ class ConfigUpdate(BaseModel):
     auto_open: Optional[bool] = None
     language: Optional[str] = None
     history_retention_days: Optional[int] = None
+    max_download_workers: Optional[int] = Field(default=None, ge=1, le=16)
+    max_conversion_workers: Optional[int] = Field(default=None, ge=1, le=16)
+    auto_scale_workers: Optional[bool] = None
+    max_finished_jobs: Optional[int] = Field(default=None, ge=0)
+    finished_job_retention_minutes: Optional[int] = Field(default=None, ge=0)
+    parallel_conversion_min_minutes: Optional[int] = Field(default=None, ge=0)
 
 
 # ============================================================================
@@ -25,7 +25,13 @@ async def get_config():
             "quality": "320",
             "auto_open": true,
             "language": "tr",
-            "history_retention_days": 0
+            "history_retention_days": 0,
+            "max_download_workers": 3,
+            "max_conversion_workers": 2,
+            "auto_scale_workers": false,
+            "max_finished_jobs": 200,
+            "finished_job_retention_minutes": 60,
+            "parallel_conversion_min_minutes": 0
         },
         "error": null
     }
@@ -91,6 +97,30 @@ async def update_config(updates: ConfigUpdate):
             download_service.set_output_dir(update_data['output_dir'])
             conversion_service.set_output_dir(update_data['output_dir'])
 
+        # Resize worker pools / toggle auto-scaling if worker settings changed
+        if {'max_download_workers', 'max_conversion_workers', 'auto_scale_workers'} & update_data.keys():
+            download_service = get_download_service()
+            conversion_service = get_conversion_service()
+            auto_scale = config_manager.get('auto_scale_workers', False)
+            download_service.set_auto_scale(auto_scale)
+            conversion_service.set_auto_scale(auto_scale)
+            if not auto_scale:
+                download_service.set_max_workers(config_manager.get('max_download_workers', 3))
+                conversion_service.set_max_workers(config_manager.get('max_conversion_workers', 2))
+
+        # Apply finished-job retention limits if changed
+        if {'max_finished_jobs', 'finished_job_retention_minutes'} & update_data.keys():
+            max_finished = config_manager.get('max_finished_jobs', 200)
+            retention_seconds = config_manager.get('finished_job_retention_minutes', 60) * 60
+            get_download_service().set_retention(max_finished, retention_seconds)
+            get_conversion_service().set_retention(max_finished, retention_seconds)
+
+        # Apply segmented conversion threshold if changed
+        if 'parallel_conversion_min_minutes' in update_data:
+            get_conversion_service().set_segmenting(
+                config_manager.get('parallel_conversion_min_minutes', 0) * 60
+            )
+
         # Cleanup old history if retention days changed to a new value
         if 'history_retention_days' in update_data:
             new_retention = update_data['history_retention_days']
@@ -156,7 +156,8 @@ async def get_conversions():
 async def get_conversion(conversion_id: str):
     """Get specific conversion details"""
     try:
-        conversion = conversion_service.get_conversion(conversion_id)
+        # Finished conversions evicted from memory are read back from the database
+        conversion = await conversion_service.load_conversion(conversion_id)
         if not conversion:
             return ApiResponse(
                 success=False,
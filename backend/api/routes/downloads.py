@@ -18,11 +18,16 @@ download_service = get_download_service()
 async def create_download(request: DownloadRequest):
     """
     Start a new download
+    A video that is already downloading returns that job; one whose file
+    still exists returns a completed job for it (pass "force": true to
+    download again).
 
     Request:
     {
         "url": "https://youtube.com/watch?v=...",
-        "quality": "320"
+        "quality": "320",
+        "priority": 0,
+        "force": false
     }
 
     Response:
@@ -40,7 +45,9 @@ async def create_download(request: DownloadRequest):
     """
     try:
         # Start download using service
-        download = await download_service.start_download(request.url, request.quality)
+        download = await download_service.start_download(
+            request.url, request.quality, request.priority, force=request.force
+        )
 
         return ApiResponse(
             success=True,
@@ -105,7 +112,8 @@ async def get_download(download_id: str):
     }
     """
     try:
-        download = download_service.get_download(download_id)
+        # Finished jobs evicted from memory are read back from the database
+        download = await download_service.load_download(download_id)
         if not download:
             return ApiResponse(
                 success=False,
@@ -155,3 +163,46 @@ async def cancel_download(download_id: str):
             success=False,
             error=ErrorDetail(code="CANCEL_FAILED", message=str(e))
         )
+
+
+@router.post("/{download_id}/retry", response_model=ApiResponse)
+async def retry_download(download_id: str):
+    """
+    Retry a failed or cancelled download
+    For a playlist, retries every failed/cancelled item
+
+    Response:
+    {
+        "success": true,
+        "data": {
+            "id": "uuid",
+            "status": "pending",
+            ...
+        },
+        "error": null
+    }
+    """
+    try:
+        download = download_service.get_download(download_id)
+        if not download:
+            return ApiResponse(
+                success=False,
+                error=ErrorDetail(code="NOT_FOUND", message="Download not found")
+            )
+
+        retried = download_service.retry_download(download_id)
+        if not retried:
+            return ApiResponse(
+                success=False,
+                error=ErrorDetail(code="NOT_RETRYABLE", message="Nothing to retry for this download")
+            )
+
+        return ApiResponse(
+            success=True,
+            data=download.to_dict()
+        )
+    except Exception as e:
+        return ApiResponse(
+            success=False,
+            error=ErrorDetail(code="RETRY_FAILED", message=str(e))
+        )
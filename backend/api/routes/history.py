@@ -3,7 +3,8 @@ History API Routes
 Handles download history retrieval and management
 """
 from fastapi import APIRouter, Query
-from ..models import ApiResponse, ErrorDetail
+from typing import Optional
+from ..models import ApiResponse, ErrorDetail, BatchIds, BatchItemResult, DEFAULT_QUALITY
 from database.manager import get_database_manager
 from services.download_service import get_download_service
 from datetime import datetime
@@ -18,14 +19,16 @@ download_service = get_download_service()
 @router.get("", response_model=ApiResponse)
 async def get_history(
     limit: int = Query(default=100, ge=1, le=500),
-    offset: int = Query(default=0, ge=0)
+    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None)
 ):
     """
     Get download history
 
     Query params:
     - limit: Max items to return (default 100, max 500)
-    - offset: Skip first N items (default 0)
+    - offset: Skip first N items (default 0, prefer cursor for deep pages)
+    - cursor: Continue after the page that returned this next_cursor
 
     Response:
     {
@@ -41,14 +44,26 @@ async def get_history(
                 "duration": 180
             }
         ],
-        "error": null
+        "error": null,
+        "next_cursor": "..."  // null on the last page
     }
     """
     try:
-        history = await db_manager.get_history(limit=limit, offset=offset)
+        if offset and not cursor:
+            # Legacy offset paging
+            history = await db_manager.get_history(limit=limit, offset=offset)
+            return ApiResponse(success=True, data=history)
+
+        history, next_cursor = await db_manager.get_history_page(limit=limit, cursor_token=cursor)
         return ApiResponse(
             success=True,
-            data=history
+            data=history,
+            next_cursor=next_cursor
+        )
+    except ValueError as e:
+        return ApiResponse(
+            success=False,
+            error=ErrorDetail(code="INVALID_CURSOR", message=str(e))
         )
     except Exception as e:
         return ApiResponse(
@@ -60,7 +75,10 @@ async def get_history(
 @router.get("/search", response_model=ApiResponse)
 async def search_history(q: str = Query(..., min_length=1)):
     """
-    Search download history by video title
+    Search download history by title, channel, file name or URL
+
+    Every word matches as a prefix ("sezen ak" finds "Sezen Aksu"), case,
+    accents and Turkish ı/İ are ignored; best matches come first.
 
     Query params:
     - q: Search query (required, min 1 character)
@@ -102,7 +120,9 @@ async def get_statistics():
         "data": {
             "total_downloads": 42,
             "total_size": 125829120,
-            "total_duration": 7200
+            "total_duration": 7200,
+            "top_channels": [{"channel_name": "Channel", "downloads": 12}],
+            "today_downloads": 3
         },
         "error": null
     }
@@ -120,6 +140,49 @@ async def get_statistics():
         )
 
 
+@router.post("/batch/delete", response_model=ApiResponse)
+async def delete_history_items_batch(request: BatchIds):
+    """
+    Soft delete many history items in one transaction
+
+    Request:
+    {
+        "ids": [1, 2, 3]
+    }
+
+    Response (one result per id, in request order):
+    {
+        "success": true,
+        "data": [
+            {"index": 0, "success": true, "data": {"id": 1}, "error": null},
+            {"index": 1, "success": false, "data": null, "error": {"code": "NOT_FOUND", ...}}
+        ],
+        "error": null
+    }
+    """
+    try:
+        deleted = set(await db_manager.delete_history_items(request.ids))
+
+        results = [
+            BatchItemResult(index=index, success=True, data={"id": history_id})
+            if history_id in deleted else
+            BatchItemResult(
+                index=index, success=False,
+                error=ErrorDetail(code="NOT_FOUND", message="History item not found")
+            )
+            for index, history_id in enumerate(request.ids)
+        ]
+        return ApiResponse(
+            success=True,
+            data=results
+        )
+    except Exception as e:
+        return ApiResponse(
+            success=False,
+            error=ErrorDetail(code="DELETE_FAILED", message=str(e))
+        )
+
+
 @router.get("/{history_id}", response_model=ApiResponse)
 async def get_history_item(history_id: int):
     """
@@ -183,8 +246,11 @@ async def redownload(history_id: int):
                 error=ErrorDetail(code="NOT_FOUND", message="History item not found")
             )
 
-        # Start new download using the URL from history
-        download = await download_service.start_download(item['url'])
+        # Start new download using the URL and quality from history
+        # (forced - de-duplication would hand back the existing file)
+        download = await download_service.start_download(
+            item['url'], item.get('quality') or DEFAULT_QUALITY, force=True
+        )
 
         return ApiResponse(
             success=True,
@@ -3,26 +3,33 @@ Queue API Routes
 Handles download queue management with priority and position
 """
 from fastapi import APIRouter, Query
-from ..models import ApiResponse, ErrorDetail
+from typing import Optional
+from ..models import (
+    ApiResponse, ErrorDetail, BatchIds, BatchItemResult, QueueBatchAdd, QueueBatchUpdate
+)
 from database.manager import get_database_manager
+from services.download_service import get_download_service
 
 router = APIRouter()
 
-# Get global database manager
+# Get global managers
 db_manager = get_database_manager()
+download_service = get_download_service()
 
 
 @router.get("", response_model=ApiResponse)
 async def get_queue(
     limit: int = Query(default=100, ge=1, le=500),
-    offset: int = Query(default=0, ge=0)
+    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None)
 ):
     """
     Get download queue items
 
     Query params:
     - limit: Max items to return (default 100, max 500)
-    - offset: Skip first N items (default 0)
+    - offset: Skip first N items (default 0, prefer cursor for deep pages)
+    - cursor: Continue after the page that returned this next_cursor
 
     Response:
     {
@@ -38,14 +45,26 @@ async def get_queue(
                 "added_at": "2025-11-23T10:00:00"
             }
         ],
-        "error": null
+        "error": null,
+        "next_cursor": "..."  // null on the last page
     }
     """
     try:
-        queue = await db_manager.get_queue(limit=limit, offset=offset)
+        if offset and not cursor:
+            # Legacy offset paging
+            queue = await db_manager.get_queue(limit=limit, offset=offset)
+            return ApiResponse(success=True, data=queue)
+
+        queue, next_cursor = await db_manager.get_queue_page(limit=limit, cursor_token=cursor)
         return ApiResponse(
             success=True,
-            data=queue
+            data=queue,
+            next_cursor=next_cursor
+        )
+    except ValueError as e:
+        return ApiResponse(
+            success=False,
+            error=ErrorDetail(code="INVALID_CURSOR", message=str(e))
         )
     except Exception as e:
         return ApiResponse(
@@ -58,6 +77,7 @@ async def get_queue(
 async def add_to_queue(url: str, priority: int = 0):
     """
     Add item to download queue
+    The item is scheduled for download by its priority and position
 
     Request:
     {
@@ -72,7 +92,8 @@ async def add_to_queue(url: str, priority: int = 0):
             "id": 1,
             "url": "...",
             "priority": 0,
-            "status": "pending"
+            "status": "pending",
+            "download_id": "uuid"
         },
         "error": null
     }
@@ -81,6 +102,12 @@ async def add_to_queue(url: str, priority: int = 0):
         queue_id = await db_manager.add_to_queue(url, priority)
         item = await db_manager.get_queue_item(queue_id)
 
+        # Schedule the download job linked to this queue row
+        download = await download_service.start_download(
+            url, priority=item['priority'], position=item['position'], queue_id=queue_id
+        )
+        item['download_id'] = download.id
+
         return ApiResponse(
             success=True,
             data=item
@@ -92,6 +119,151 @@ async def add_to_queue(url: str, priority: int = 0):
         )
 
 
+@router.post("/batch", response_model=ApiResponse)
+async def add_to_queue_batch(request: QueueBatchAdd):
+    """
+    Add many URLs to the download queue in one request
+    All queue rows are written in a single transaction; positions are
+    assigned in bulk after the current last item.
+    URLs of videos that are already downloading or downloaded resolve to
+    the existing job (data.id is then that job's queue row, if any).
+
+    Request:
+    {
+        "items": [
+            {"url": "https://youtube.com/...", "priority": 0, "quality": "320"},
+            ...
+        ]
+    }
+
+    Response (one result per item, in request order):
+    {
+        "success": true,
+        "data": [
+            {"index": 0, "success": true, "data": {"id": 1, "download_id": "uuid", ...}, "error": null},
+            {"index": 1, "success": false, "data": null, "error": {"code": "INVALID_URL", ...}}
+        ],
+        "error": null
+    }
+    """
+    try:
+        results = [None] * len(request.items)
+        accepted = []
+        for index, item in enumerate(request.items):
+            url = item.url.strip()
+            if not url:
+                results[index] = BatchItemResult(
+                    index=index, success=False,
+                    error=ErrorDetail(code="INVALID_URL", message="URL is empty")
+                )
+                continue
+            accepted.append((index, {'url': url, 'priority': item.priority, 'quality': item.quality}))
+
+        downloads = await download_service.start_downloads([req for _, req in accepted])
+        for (index, _), download in zip(accepted, downloads):
+            results[index] = BatchItemResult(index=index, success=True, data={
+                "id": download.queue_id,
+                "url": download.url,
+                "priority": download.priority,
+                "status": download.status,
+                "file_path": download.file_path,
+                "download_id": download.id,
+            })
+
+        return ApiResponse(
+            success=True,
+            data=results
+        )
+    except Exception as e:
+        return ApiResponse(
+            success=False,
+            error=ErrorDetail(code="ADD_FAILED", message=str(e))
+        )
+
+
+@router.patch("/batch/priority", response_model=ApiResponse)
+async def update_priority_batch(request: QueueBatchUpdate):
+    """
+    Change priority and/or position of many queue items in one transaction
+
+    Request:
+    {
+        "items": [{"id": 1, "priority": 5}, {"id": 2, "position": 0}, ...]
+    }
+
+    Response: one {"index", "success", "data", "error"} result per item
+    """
+    try:
+        updates = [item.model_dump() for item in request.items]
+        updated = set(await db_manager.update_queue_priorities(updates))
+
+        # Re-order pending work right away
+        downloads = download_service.get_downloads_by_queue_ids(list(updated))
+        for item in request.items:
+            download = downloads.get(item.id)
+            if download:
+                download_service.update_priority(download.id, priority=item.priority, position=item.position)
+
+        results = [
+            BatchItemResult(index=index, success=True, data={"id": item.id})
+            if item.id in updated else
+            BatchItemResult(
+                index=index, success=False,
+                error=ErrorDetail(code="NOT_FOUND", message="Queue item not found")
+            )
+            for index, item in enumerate(request.items)
+        ]
+        return ApiResponse(
+            success=True,
+            data=results
+        )
+    except Exception as e:
+        return ApiResponse(
+            success=False,
+            error=ErrorDetail(code="UPDATE_FAILED", message=str(e))
+        )
+
+
+@router.post("/batch/delete", response_model=ApiResponse)
+async def delete_queue_items_batch(request: BatchIds):
+    """
+    Remove many items from the queue (soft delete) in one transaction
+    Linked jobs are cancelled as well.
+
+    Request:
+    {
+        "ids": [1, 2, 3]
+    }
+
+    Response: one {"index", "success", "data", "error"} result per id
+    """
+    try:
+        deleted = set(await db_manager.delete_queue_items(request.ids))
+
+        # Stop the linked jobs as well
+        for download in download_service.get_downloads_by_queue_ids(list(deleted)).values():
+            download_service.cancel_download(download.id)
+
+        results = [
+            BatchItemResult(index=index, success=True, data={"id": queue_id})
+            if queue_id in deleted else
+            BatchItemResult(
+                index=index, success=False,
+                error=ErrorDetail(code="NOT_FOUND", message="Queue item not found")
+            )
+            for index, queue_id in enumerate(request.ids)
+        ]
+        return ApiResponse(
+            success=True,
+            data=results
+        )
+    except Exception as e:
+        return ApiResponse(
+            success=False,
+            error=ErrorDetail(code="DELETE_FAILED", message=str(e))
+        )
+
+
 @router.patch("/{queue_id}/priority", response_model=ApiResponse)
 async def update_priority(queue_id: int, priority: int):
     """
@@ -122,6 +294,11 @@ async def update_priority(queue_id: int, priority: int):
                 error=ErrorDetail(code="NOT_FOUND", message="Queue item not found")
             )
 
+        # Re-order pending work right away
+        download = download_service.get_download_by_queue_id(queue_id)
+        if download:
+            download_service.update_priority(download.id, priority=priority)
+
         item = await db_manager.get_queue_item(queue_id)
         return ApiResponse(
             success=True,
@@ -164,6 +341,11 @@ async def update_position(queue_id: int, position: int):
                 error=ErrorDetail(code="NOT_FOUND", message="Queue item not found")
             )
 
+        # Re-order pending work right away
+        download = download_service.get_download_by_queue_id(queue_id)
+        if download:
+            download_service.update_priority(download.id, position=position)
+
         item = await db_manager.get_queue_item(queue_id)
         return ApiResponse(
             success=True,
@@ -197,6 +379,11 @@ async def delete_queue_item(queue_id: int):
                 error=ErrorDetail(code="NOT_FOUND", message="Queue item not found")
             )
 
+        # Stop the linked job as well
+        download = download_service.get_download_by_queue_id(queue_id)
+        if download:
+            download_service.cancel_download(download.id)
+
         return ApiResponse(
             success=True,
             data=None
@@ -228,6 +415,12 @@ async def clear_queue(status: str = "all"):
     try:
         count = await db_manager.clear_queue(status)
 
+        # Removed pending rows must not run anymore
+        if status in ("all", "pending"):
+            for download in download_service.get_all_downloads():
+                if download.queue_id is not None and download.status == "pending":
+                    download_service.cancel_download(download.id)
+
         return ApiResponse(
             success=True,
             data={"deleted_count": count}
@@ -2,23 +2,261 @@
 WebSocket Handlers for Real-time Progress Updates
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Set
+from collections import OrderedDict, deque
+import asyncio
+import itertools
+import json
 import logging
+import time
+from utils.formatting import format_speed, format_eta
 
 logger = logging.getLogger(__name__)
 
 websocket_router = APIRouter()
 
+# /ws/events: events are collected and sent to subscribers in one frame per interval
+EVENT_BATCH_INTERVAL = 0.1  # seconds
+
+# Per-client outbound queues
+MAX_PROGRESS_FRAMES = 32  # Queued progress frames per client - older ones are dropped
+SLOW_CLIENT_BACKLOG = 256  # Queued frames after which a client is disconnected
+SEND_TIMEOUT = 10  # Seconds a single send may take before the client is dropped
+
+# Resync: recent events kept per job so reconnecting clients only get what they missed
+EVENT_HISTORY = 64  # Events per job
+MAX_TRACKED_JOBS = 2000  # Jobs with history (least recently active ones are dropped)
+
+
+def _dumps(frame: dict) -> str:
+    """Compact JSON (no whitespace)"""
+    return json.dumps(frame, separators=(",", ":"), default=str)
+
+
+# Opt-in compact encoding for /ws/events (?encoding=compact): short keys, raw
+# numbers (bytes/sec, seconds) instead of display strings, no null fields
+COMPACT_KEYS = {
+    "id": "i", "kind": "k", "type": "t", "progress": "p", "speed_bps": "s",
+    "eta_seconds": "e", "status": "st", "video_title": "v", "file_path": "f",
+    "output_path": "o", "error": "er", "total": "n", "completed": "c",
+    "failed": "fl", "cancelled": "x", "events": "ev", "jobs": "j", "seq": "q",
+}
+COMPACT_KINDS = {"download": "d", "conversion": "c"}
+VERBOSE_ONLY_KEYS = ("message", "speed", "eta")
+
+
+def _verbose(message: dict) -> dict:
+    """Add display strings for raw speed/ETA numbers (default encoding)"""
+    if "speed_bps" not in message and "eta_seconds" not in message:
+        return message
+    return {
+        **message,
+        "speed": format_speed(message.get("speed_bps")),
+        "eta": format_eta(message.get("eta_seconds")),
+    }
+
+
+def _compact(message: dict) -> dict:
+    """Short-key form of an event or job snapshot"""
+    return {
+        COMPACT_KEYS.get(key, key): COMPACT_KINDS.get(value, value) if key == "kind" else value
+        for key, value in message.items()
+        if value is not None and key not in VERBOSE_ONLY_KEYS
+    }
+
+
+def _coalesce(events: List[dict]) -> List[dict]:
+    """Keep only the latest progress event per job; other events keep their order"""
+    seen = set()
+    kept = []
+    for event in reversed(events):
+        if event.get("type") == "progress":
+            key = (event["kind"], event["id"])
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(event)
+    kept.reverse()
+    return kept
+
+
+class ClientChannel:
+    """
+    Outbound queue and sender task of one WebSocket
+
+    send() only enqueues, so a slow client never holds up the producer or
+    other clients. Progress frames are droppable: beyond MAX_PROGRESS_FRAMES
+    the oldest queued one is discarded. Other frames (status, completed,
+    error, ...) are always delivered; a client that lets more than
+    SLOW_CLIENT_BACKLOG frames pile up, or stalls a send, is disconnected.
+    """
+
+    def __init__(self, websocket: WebSocket, on_close: Optional[Callable[[], None]] = None):
+        self.websocket = websocket
+        self.closed = False
+        self._on_close = on_close
+        self._frames: deque = deque()  # [text, droppable, live] in send order
+        self._droppable: deque = deque()  # Queued progress entries, oldest first
+        self._queued = 0
+        self._queued_progress = 0
+        self._close_code: Optional[int] = None
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, frame, droppable: bool = False) -> bool:
+        """Queue a frame (dict or pre-encoded text) - O(1), never blocks"""
+        if self.closed:
+            return False
+        entry = [frame if isinstance(frame, str) else _dumps(frame), droppable, True]
+        self._frames.append(entry)
+        self._queued += 1
+
+        if droppable:
+            self._droppable.append(entry)
+            self._queued_progress += 1
+            if self._queued_progress > MAX_PROGRESS_FRAMES:
+                # Drop-oldest: the sender skips dead entries
+                oldest = self._droppable.popleft()
+                oldest[2] = False
+                self._queued -= 1
+                self._queued_progress -= 1
+
+        if self._queued > SLOW_CLIENT_BACKLOG:
+            logger.warning(f"WebSocket client too slow ({self._queued} frames queued), disconnecting")
+            self.close(code=1008)
+            return False
+
+        self._wakeup.set()
+        return True
+
+    def close(self, code: Optional[int] = None):
+        """Stop the sender; with a code the socket is closed from our side"""
+        if self.closed:
+            return
+        self.closed = True
+        self._close_code = code
+        self._wakeup.set()
+        if self._task is not asyncio.current_task() and code is None:
+            self._task.cancel()  # Client already gone - nothing left to deliver
+
+    async def _run(self):
+        """Sender task: deliver queued frames in order"""
+        try:
+            while not self.closed:
+                if not self._frames:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                entry = self._frames.popleft()
+                if not entry[2]:
+                    continue  # Dropped progress frame
+                entry[2] = False
+                self._queued -= 1
+                if entry[1]:
+                    # Everything queued before it was sent or dropped, so it is leftmost
+                    self._droppable.popleft()
+                    self._queued_progress -= 1
+
+                await asyncio.wait_for(self.websocket.send_text(entry[0]), SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            pass
+        except asyncio.TimeoutError:
+            logger.warning("WebSocket send timed out, disconnecting client")
+            self._close_code = 1008
+        except Exception as e:
+            logger.error(f"Error sending to WebSocket: {e}")
+        finally:
+            self.closed = True
+            self._frames.clear()
+            self._droppable.clear()
+            if self._close_code is not None:
+                try:
+                    await self.websocket.close(code=self._close_code)
+                except Exception:
+                    pass
+            if self._on_close:
+                self._on_close()
+
+
+class JobEventLog:
+    """Sequence counter and ring buffer of recent events for one job"""
+
+    __slots__ = ("seq", "floor", "events")
+
+    def __init__(self):
+        self.seq = 0  # Sequence of the latest event
+        self.floor = 0  # Latest sequence not covered by the ring buffer
+        self.events: deque = deque(maxlen=EVENT_HISTORY)
+
+    def append(self, message: dict):
+        if not self.events:
+            # A new log (first event, or recreated after eviction/restart) has
+            # not seen anything before this event
+            self.floor = message["seq"] - 1
+        elif len(self.events) == self.events.maxlen:
+            self.floor = self.events[0]["seq"]
+        self.events.append(message)
+        self.seq = message["seq"]
+
+    def since(self, last_seq: int) -> Optional[List[dict]]:
+        """Events after last_seq, or None if some of them are no longer kept"""
+        if last_seq < self.floor or last_seq > self.seq:
+            return None
+        return [message for message in self.events if message["seq"] > last_seq]
+
+
+class EventSubscriber:
+    """A /ws/events client and the jobs it follows"""
+
+    def __init__(self, websocket: WebSocket, compact: bool = False):
+        self.websocket = websocket
+        self.channel: Optional[ClientChannel] = None
+        self.compact = compact
+        self.job_ids: Set[str] = set()
+        self.all_jobs = False
+
+    def frame(self, frame_type: str, key: str, items: List[dict]) -> dict:
+        """Build a frame in this client's encoding (items already encoded)"""
+        if self.compact:
+            return {"t": frame_type, COMPACT_KEYS[key]: items}
+        return {"type": frame_type, key: items}
+
+    def encode(self, message: dict) -> dict:
+        return _compact(message) if self.compact else _verbose(message)
+
+    def wants(self, job_id: str) -> bool:
+        return self.all_jobs or job_id in self.job_ids
+
 
 class ConnectionManager:
-    """Manages WebSocket connections for download progress updates"""
+    """Manages WebSocket connections for download and conversion progress updates"""
 
     def __init__(self):
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.channels: Dict[WebSocket, ClientChannel] = {}  # Outbound queue per connection
+
+        # Per-job sequence numbers and recent events (for resync on reconnect).
+        # Sequences come from one counter seeded with the start time, so they
+        # only increase per job - also across evictions and server restarts
+        self._sequence = itertools.count(int(time.time() * 1000))
+        self._event_logs: "OrderedDict[str, JobEventLog]" = OrderedDict()
+
+        # Multiplexed /ws/events clients (all state is owned by the server loop)
+        self.event_subscribers: List[EventSubscriber] = []
+        self._pending_events: List[dict] = []
+        self._flusher: Optional[asyncio.Task] = None
 
     async def connect(self, download_id: str, websocket: WebSocket):
         """Accept and store a new WebSocket connection"""
         await websocket.accept()
+        self.register(download_id, websocket)
+
+    def register(self, download_id: str, websocket: WebSocket):
+        """Start delivering a job's events to an accepted connection"""
+        self.channels[websocket] = ClientChannel(
+            websocket, on_close=lambda: self.disconnect(download_id, websocket)
+        )
         if download_id not in self.active_connections:
             self.active_connections[download_id] = []
         self.active_connections[download_id].append(websocket)
@@ -26,36 +264,129 @@ class ConnectionManager:
 
     def disconnect(self, download_id: str, websocket: WebSocket):
         """Remove a WebSocket connection"""
-        if download_id in self.active_connections:
-            self.active_connections[download_id].remove(websocket)
-            if not self.active_connections[download_id]:
+        channel = self.channels.pop(websocket, None)
+        if channel:
+            channel.close()
+        connections = self.active_connections.get(download_id)
+        if connections and websocket in connections:
+            connections.remove(websocket)
+            if not connections:
                 del self.active_connections[download_id]
             logger.info(f"WebSocket disconnected for download: {download_id}")
 
-    async def broadcast(self, download_id: str, message: dict):
+    def send(self, websocket: WebSocket, message: dict):
+        """Queue a message for one connection (keeps it ordered with broadcasts)"""
+        channel = self.channels.get(websocket)
+        if channel:
+            channel.send(message)
+
+    def current_seq(self, job_id: str) -> int:
+        """Sequence of the latest event broadcast for a job (0 = none kept)"""
+        log = self._event_logs.get(job_id)
+        return log.seq if log else 0
+
+    def replay(self, job_id: str, last_seq: int) -> Optional[List[dict]]:
+        """Events a client missed since last_seq, or None if a snapshot is needed"""
+        log = self._event_logs.get(job_id)
+        if log is None:
+            return None
+        return log.since(last_seq)
+
+    def _record(self, job_id: str, kind: str, message: dict) -> dict:
+        """Stamp an event with the job's next sequence number and keep it for resync"""
+        message = {"id": job_id, "kind": kind, **message, "seq": next(self._sequence)}
+        log = self._event_logs.get(job_id)
+        if log is None:
+            log = self._event_logs[job_id] = JobEventLog()
+            if len(self._event_logs) > MAX_TRACKED_JOBS:
+                self._event_logs.popitem(last=False)
+        else:
+            self._event_logs.move_to_end(job_id)
+        log.append(message)
+        return message
+
+    async def connect_events(self, websocket: WebSocket, compact: bool = False) -> EventSubscriber:
+        """Accept a multiplexed /ws/events connection"""
+        await websocket.accept()
+        subscriber = EventSubscriber(websocket, compact)
+        subscriber.channel = ClientChannel(websocket, on_close=lambda: self.disconnect_events(subscriber))
+        self.event_subscribers.append(subscriber)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_events())
+        logger.info(f"Event stream connected ({len(self.event_subscribers)} clients)")
+        return subscriber
+
+    def disconnect_events(self, subscriber: EventSubscriber):
+        """Remove a /ws/events connection"""
+        subscriber.channel.close()
+        if subscriber in self.event_subscribers:
+            self.event_subscribers.remove(subscriber)
+            logger.info(f"Event stream disconnected ({len(self.event_subscribers)} clients)")
+
+    async def _flush_events(self):
+        """Send collected events to each subscriber as one batched frame per interval"""
+        while self.event_subscribers:
+            await asyncio.sleep(EVENT_BATCH_INTERVAL)
+            if not self._pending_events:
+                continue
+            events = _coalesce(self._pending_events)
+            self._pending_events = []
+
+            # Each event is encoded at most once per encoding; frames for
+            # "all jobs" subscribers are serialized once per encoding
+            encoded: Dict[bool, List[dict]] = {}
+            full_frames: Dict[bool, str] = {}
+            progress_only = all(event.get("type") == "progress" for event in events)
+
+            for subscriber in list(self.event_subscribers):
+                compact = subscriber.compact
+                if compact not in encoded:
+                    encoded[compact] = [subscriber.encode(event) for event in events]
+
+                if subscriber.all_jobs:
+                    if compact not in full_frames:
+                        full_frames[compact] = _dumps(subscriber.frame("events", "events", encoded[compact]))
+                    # Progress-only batches may be dropped for a lagging client
+                    subscriber.channel.send(full_frames[compact], droppable=progress_only)
+                    continue
+
+                indexes = [i for i, event in enumerate(events) if event["id"] in subscriber.job_ids]
+                if not indexes:
+                    continue
+                batch = [encoded[compact][i] for i in indexes]
+                droppable = all(events[i].get("type") == "progress" for i in indexes)
+                subscriber.channel.send(subscriber.frame("events", "events", batch), droppable=droppable)
+        self._pending_events = []
+
+    async def broadcast(self, download_id: str, message: dict, kind: str = "download"):
         """
-        Broadcast a message to all connections for a specific download
+        Broadcast a message to all connections for a specific download/conversion
+        (per-job sockets directly, /ws/events subscribers in the next batch)
 
         Message format:
         {
             "type": "progress",  // progress, status, error, completed
             "progress": 50,      // 0-100
-            "speed": "1.5 MB/s",
-            "eta": "00:30"
+            "speed_bps": 1572864,
+            "eta_seconds": 30
         }
+        Per-job sockets also get "speed"/"eta" display strings. Every event
+        is stamped with the job's next "seq" and kept for resync.
         """
-        if download_id in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[download_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to WebSocket: {e}")
-                    disconnected.append(connection)
+        event = self._record(download_id, kind, message)
+
+        if any(subscriber.wants(download_id) for subscriber in self.event_subscribers):
+            self._pending_events.append(event)
 
-            # Remove disconnected connections
-            for conn in disconnected:
-                self.disconnect(download_id, conn)
+        connections = self.active_connections.get(download_id)
+        if connections:
+            # Encode once, enqueue per client - never waits on a socket
+            text = _dumps(_verbose(event))
+            droppable = event.get("type") == "progress"
+            for connection in list(connections):
+                channel = self.channels.get(connection)
+                if channel:
+                    channel.send(text, droppable=droppable)
 
 
 # Global connection manager instance
@@ -69,31 +400,44 @@ async def websocket_endpoint(websocket: WebSocket, download_id: str):
 
     Connect: ws://127.0.0.1:<port>/ws/download/{download_id}
 
+    Reconnect: ws://127.0.0.1:<port>/ws/download/{download_id}?last_seq=<seq>
+    replays only the missed events; without last_seq, or if they are no
+    longer kept, the current state is sent first as a "status" snapshot.
+    Works for conversion ids too. Clients should ignore frames whose
+    "seq" is not newer than the last one they applied.
+
     Messages received:
     {
         "type": "progress",
+        "seq": 1760000000123,
         "progress": 50,
         "speed": "1.5 MB/s",
-        "eta": "00:30"
+        "eta": "00:30",
+        "speed_bps": 1572864,
+        "eta_seconds": 30
     }
     """
-    await manager.connect(download_id, websocket)
+    await websocket.accept()
     try:
-        # Send current download state when connecting
-        from services.download_service import get_download_service
-        service = get_download_service()
-        download = service.get_download(download_id)
-        if download:
-            # Send current state to newly connected client
-            await websocket.send_json({
-                "type": "status",
-                "status": download.status,
-                "progress": download.progress,
-                "speed": download.speed,
-                "eta": download.eta,
-                "video_title": download.video_title,
-            })
-            logger.info(f"Sent current state to WebSocket: {download.status}, {download.progress}%")
+        try:
+            last_seq = int(websocket.query_params["last_seq"])
+        except (KeyError, ValueError):
+            last_seq = None
+
+        missed = manager.replay(download_id, last_seq) if last_seq is not None else None
+        snapshot = None
+        if missed is None:
+            snapshot = await _status_snapshot(download_id)
+
+        # No awaits from here on: nothing can be broadcast between the
+        # snapshot/replay and the live events that follow it
+        manager.register(download_id, websocket)
+        if snapshot:
+            manager.send(websocket, snapshot)
+            missed = manager.replay(download_id, snapshot["seq"]) or []
+            logger.info(f"Sent current state to WebSocket: {snapshot['status']}, {snapshot['progress']}%")
+        for message in missed or []:
+            manager.send(websocket, _verbose(message))
 
         while True:
             # Keep connection alive
@@ -103,7 +447,7 @@ async def websocket_endpoint(websocket: WebSocket, download_id: str):
 
             # Echo back for testing
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                manager.send(websocket, {"type": "pong"})
     except WebSocketDisconnect:
         manager.disconnect(download_id, websocket)
         logger.info(f"Client disconnected from download: {download_id}")
@@ -112,5 +456,162 @@ async def websocket_endpoint(websocket: WebSocket, download_id: str):
         manager.disconnect(download_id, websocket)
 
 
+async def _status_snapshot(job_id: str) -> Optional[dict]:
+    """Current state of a download or conversion as a "status" frame"""
+    from services.download_service import get_download_service
+    from services.conversion_service import get_conversion_service
+
+    download = await get_download_service().load_download(job_id)
+    if download:
+        return {
+            "type": "status",
+            "seq": manager.current_seq(job_id),
+            "status": download.status,
+            "progress": download.progress,
+            "speed": download.speed,
+            "eta": download.eta,
+            "speed_bps": download.speed_bps,
+            "eta_seconds": download.eta_seconds,
+            "video_title": download.video_title,
+            "file_path": download.file_path,
+            "error": download.error,
+        }
+
+    conversion = await get_conversion_service().load_conversion(job_id)
+    if conversion:
+        return {
+            "type": "status",
+            "seq": manager.current_seq(job_id),
+            "status": conversion.status,
+            "progress": conversion.progress,
+            "file_name": conversion.file_name,
+            "output_path": conversion.output_path,
+            "error": conversion.error,
+        }
+    return None
+
+
+async def _job_snapshots(job_ids: Optional[Set[str]]) -> List[dict]:
+    """Current state of the given jobs (None = every job in memory)"""
+    from services.download_service import get_download_service
+    from services.conversion_service import get_conversion_service
+    download_service = get_download_service()
+    conversion_service = get_conversion_service()
+
+    if job_ids is None:
+        downloads = download_service.get_all_downloads()
+        conversions = conversion_service.get_all_conversions()
+    else:
+        downloads, conversions = [], []
+        for job_id in job_ids:
+            download = await download_service.load_download(job_id)
+            if download:
+                downloads.append(download)
+                continue
+            conversion = await conversion_service.load_conversion(job_id)
+            if conversion:
+                conversions.append(conversion)
+
+    return (
+        [{"kind": "download", **download.to_dict(), "seq": manager.current_seq(download.id)}
+         for download in downloads]
+        + [{"kind": "conversion", **conversion.to_dict(), "seq": manager.current_seq(conversion.id)}
+           for conversion in conversions]
+    )
+
+
+@websocket_router.websocket("/ws/events")
+async def events_endpoint(websocket: WebSocket):
+    """
+    Multiplexed WebSocket for downloads and conversions - one socket for any number of jobs
+
+    Connect: ws://127.0.0.1:<port>/ws/events
+             ws://127.0.0.1:<port>/ws/events?encoding=compact  (short keys, see COMPACT_KEYS)
+
+    Messages sent by the client:
+    {"action": "subscribe", "ids": ["uuid", ...]}   // or {"action": "subscribe", "all": true}
+    {"action": "subscribe", "ids": [...], "last_seq": {"uuid": 1760000000123, ...}}  // resync
+    {"action": "unsubscribe", "ids": ["uuid", ...]} // or {"action": "unsubscribe", "all": true}
+    "ping"
+
+    Messages received:
+    {"type": "snapshot", "jobs": [{"kind": "download", "id": "uuid", "status": ..., ...}]}
+    {"type": "events", "events": [{"id": "uuid", "kind": "download", "type": "progress", "seq": ..., ...}]}
+
+    Every event and snapshot carries the job's "seq". On resubscribe, jobs
+    listed in last_seq only get the events they missed; the rest (or jobs
+    whose missed events are no longer kept) get a snapshot. Clients should
+    ignore events whose seq is not newer than the job's last applied one.
+
+    Compact:
+    {"t": "events", "ev": [{"i": "uuid", "k": "d", "t": "progress", "p": 50, "s": 1572864, "e": 30}]}
+    """
+    compact = websocket.query_params.get("encoding") == "compact"
+    subscriber = await manager.connect_events(websocket, compact)
+    try:
+        while True:
+            data = await websocket.receive_text()
+            if data == "ping":
+                subscriber.channel.send({"type": "pong"})
+                continue
+
+            try:
+                request = json.loads(data)
+                action = request["action"]
+                job_ids = set(request.get("ids") or [])
+                last_seqs = {job_id: int(seq) for job_id, seq in (request.get("last_seq") or {}).items()}
+            except (ValueError, KeyError, TypeError, AttributeError):
+                subscriber.channel.send({"type": "error", "message": "Invalid request"})
+                continue
+
+            if action == "subscribe":
+                subscribe_all = bool(request.get("all"))
+                resumable = {
+                    job_id for job_id, seq in last_seqs.items()
+                    if manager.replay(job_id, seq) is not None
+                }
+                if subscribe_all:
+                    jobs = [job for job in await _job_snapshots(None) if job["id"] not in resumable]
+                else:
+                    jobs = await _job_snapshots(job_ids - resumable)
+
+                # No awaits from here on: replay and subscription happen
+                # before any further event can be broadcast
+                missed = []
+                for job_id in resumable:
+                    missed.extend(manager.replay(job_id, last_seqs[job_id]) or [])
+                for job in jobs:
+                    missed.extend(manager.replay(job["id"], job["seq"]) or [])
+                missed.sort(key=lambda message: message["seq"])
+
+                if subscribe_all:
+                    subscriber.all_jobs = True
+                else:
+                    subscriber.job_ids |= job_ids | resumable
+
+                if jobs or not missed:
+                    subscriber.channel.send(
+                        subscriber.frame("snapshot", "jobs", [subscriber.encode(job) for job in jobs])
+                    )
+                if missed:
+                    subscriber.channel.send(
+                        subscriber.frame("events", "events", [subscriber.encode(message) for message in missed])
+                    )
+            elif action == "unsubscribe":
+                if request.get("all"):
+                    subscriber.all_jobs = False
+                    subscriber.job_ids.clear()
+                else:
+                    subscriber.job_ids -= job_ids
+            else:
+                subscriber.channel.send({"type": "error", "message": f"Unknown action: {action}"})
+    except WebSocketDisconnect:
+        logger.info("Client disconnected from event stream")
+    except Exception as e:
+        logger.error(f"WebSocket error: {e}")
+    finally:
+        manager.disconnect_events(subscriber)
+
+
 # Export manager for use in download workers
 __all__ = ["websocket_router", "manager"]
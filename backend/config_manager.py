@@ -21,6 +21,12 @@ DEFAULT_CONFIG = {
     "auto_open": True,
     "language": "tr",
     "history_retention_days": 0,  # 0 = keep forever
+    "max_download_workers": 3,
+    "max_conversion_workers": 2,
+    "auto_scale_workers": False,  # Size pools by throughput (downloads) and CPU load (conversions)
+    "max_finished_jobs": 200,  # Finished jobs kept in memory; older ones are read from the database
+    "finished_job_retention_minutes": 60,
+    "parallel_conversion_min_minutes": 0,  # Encode longer inputs in parallel segments; 0 = off
 }
 
 # Config file path anchored to this file's directory (backend/)
@@ -0,0 +1,104 @@
+"""
+History Search
+FTS5 index over download history (title, channel, file name, URL)
+kept in sync by triggers, with Turkish-aware folding and prefix matching
+"""
+import re
+import sqlite3
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Column weights for bm25() ranking: title, channel, file name, URL
+RANK_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+# unicode61 folds case and (with remove_diacritics 2) ş/ğ/ç/ö/ü to s/g/c/o/u.
+# It does not know Turkish dotted/dotless i, so ı and İ are mapped to i
+# before indexing (in the triggers) and before querying (fold_turkish)
+_FOLD_SQL = "replace(replace(coalesce({0}, ''), 'ı', 'i'), 'İ', 'i')"
+
+_INDEXED = (
+    _FOLD_SQL.format("new.video_title"),
+    _FOLD_SQL.format("new.channel_name"),
+    _FOLD_SQL.format("new.file_name"),
+    _FOLD_SQL.format("new.url"),
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def fold_turkish(text: str) -> str:
+    """Fold ı/İ to i (the tokenizer handles case and other diacritics)"""
+    return text.replace("ı", "i").replace("İ", "i")
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for user input: every word must match as a
+    prefix, e.g. 'sezen aks' -> '"sezen"* "aks"*'. None if no words.
+    """
+    tokens = _TOKEN_PATTERN.findall(fold_turkish(text))
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def ensure_history_fts(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create the history_fts index and its sync triggers if missing and
+    backfill it from existing rows. Soft-deleted rows are not indexed.
+
+    Returns:
+        False if this SQLite build has no FTS5 (callers fall back to LIKE)
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'")
+    if cursor.fetchone():
+        return True
+
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE history_fts USING fts5(
+                video_title, channel_name, file_name, url,
+                tokenize = "unicode61 remove_diacritics 2"
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 not available, history search uses LIKE: {e}")
+        return False
+
+    values = ", ".join(_INDEXED)
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS history_fts_insert
+        AFTER INSERT ON download_history
+        WHEN coalesce(new.is_deleted, 0) = 0
+        BEGIN
+            INSERT INTO history_fts(rowid, video_title, channel_name, file_name, url)
+            VALUES (new.id, {values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS history_fts_update
+        AFTER UPDATE OF video_title, channel_name, file_name, url, is_deleted ON download_history
+        BEGIN
+            DELETE FROM history_fts WHERE rowid = old.id;
+            INSERT INTO history_fts(rowid, video_title, channel_name, file_name, url)
+            SELECT new.id, {values} WHERE coalesce(new.is_deleted, 0) = 0;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS history_fts_delete
+        AFTER DELETE ON download_history
+        BEGIN
+            DELETE FROM history_fts WHERE rowid = old.id;
+        END
+    ''')
+
+    backfill = ", ".join(value.replace("new.", "") for value in _INDEXED)
+    cursor.execute(f'''
+        INSERT INTO history_fts(rowid, video_title, channel_name, file_name, url)
+        SELECT id, {backfill} FROM download_history
+        WHERE coalesce(is_deleted, 0) = 0
+    ''')
+    logger.info(f"Created history search index ({cursor.rowcount} rows)")
+    return True
@@ -4,30 +4,110 @@ SQLite database for download history and queue
 """
 import sqlite3
 import os
+import base64
+import json
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
+from .history_search import RANK_WEIGHTS, build_match_query, ensure_history_fts
+from .history_stats import ensure_history_stats
+
 logger = logging.getLogger(__name__)
 
+# Bound parameters per IN (...) query (SQLite's default limit is 999)
+MAX_QUERY_PARAMS = 500
+
 # Thread pool for async database operations
 _executor = ThreadPoolExecutor(max_workers=3)
 
+# Per-connection tuning (WAL itself is persistent and set once in init_database)
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # Safe with WAL, no fsync per commit
+    "PRAGMA cache_size=-16000",  # 16 MB page cache
+    "PRAGMA mmap_size=134217728",  # 128 MB memory-mapped reads
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",  # Wait for writers instead of failing with "database is locked"
+)
+CACHED_STATEMENTS = 256
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque pagination cursor for the sort key of the last row on a page"""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Sort key from a cursor made by encode_cursor (raises ValueError if invalid)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
 
 class DatabaseManager:
     """Download history and queue database manager"""
 
     def __init__(self, db_path: str = "mp3yap.db"):
         self.db_path = db_path
+        # One long-lived connection per thread (executor, download workers, ...)
+        self._local = threading.local()
+        self.fts_enabled = False
         self.init_database()
 
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a tuned connection for the calling thread"""
+        conn = sqlite3.connect(self.db_path, cached_statements=CACHED_STATEMENTS)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Use the calling thread's connection as a transaction (commits on
+        success, rolls back on error). Connections stay open and keep their
+        prepared statement cache between calls.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open_connection()
+        conn.row_factory = None  # Methods opt in to sqlite3.Row per call
+        with conn:
+            yield conn
+
+    @staticmethod
+    def _active_ids(cursor: sqlite3.Cursor, table: str, ids: List[int]) -> List[int]:
+        """Subset of ids that exist in table and are not soft-deleted, in input order"""
+        found = set()
+        unique_ids = list(dict.fromkeys(ids))
+        for start in range(0, len(unique_ids), MAX_QUERY_PARAMS):
+            chunk = unique_ids[start:start + MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT id FROM {table} WHERE is_deleted = 0 AND id IN ({placeholders})",
+                chunk
+            )
+            found.update(row[0] for row in cursor.fetchall())
+        return [i for i in unique_ids if i in found]
+
     def init_database(self):
         """Initialize database and tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
+            # Readers no longer block the writer (and vice versa)
+            cursor.execute("PRAGMA journal_mode=WAL")
+
             # Download history table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS download_history (
@@ -93,6 +173,17 @@ class DatabaseManager:
                 ON download_history(is_deleted)
             ''')
 
+            # Keyset pagination: one index seek per page, however deep
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_history_active_recent
+                ON download_history(is_deleted, downloaded_at DESC, id DESC)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_queue_active_order
+                ON download_queue(is_deleted, priority DESC, position, added_at, id)
+            ''')
+
             # Migration: Add channel_url column if it doesn't exist
             cursor.execute("PRAGMA table_info(download_history)")
             columns = [col[1] for col in cursor.fetchall()]
@@ -100,18 +191,73 @@ class DatabaseManager:
                 cursor.execute('ALTER TABLE download_history ADD COLUMN channel_url TEXT')
                 logger.info("Migration: Added channel_url column")
 
+            # Migration: Shared media store blob the history file is linked from
+            if 'blob_path' not in columns:
+                cursor.execute('ALTER TABLE download_history ADD COLUMN blob_path TEXT')
+                logger.info("Migration: Added blob_path column")
+
+            # Migration: Bitrate the file was encoded at (duplicates only match the same quality)
+            if 'quality' not in columns:
+                cursor.execute('ALTER TABLE download_history ADD COLUMN quality TEXT')
+                logger.info("Migration: Added quality column")
+
+            # Migration: Queue columns needed to restore download jobs after a restart
+            cursor.execute("PRAGMA table_info(download_queue)")
+            queue_columns = [col[1] for col in cursor.fetchall()]
+            for column in ('job_id', 'parent_job_id', 'quality', 'file_path'):
+                if column not in queue_columns:
+                    cursor.execute(f'ALTER TABLE download_queue ADD COLUMN {column} TEXT')
+                    logger.info(f"Migration: Added download_queue.{column} column")
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_queue_parent_job
+                ON download_queue(parent_job_id)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_queue_job_id
+                ON download_queue(job_id)
+            ''')
+
+            # Duplicate detection by video ID
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_history_video_id
+                ON download_history(video_id)
+            ''')
+
+            # Final state of conversion jobs (evicted from memory after a while)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS conversion_jobs (
+                    id TEXT PRIMARY KEY,
+                    input_path TEXT NOT NULL,
+                    output_path TEXT,
+                    output_format TEXT,
+                    quality TEXT,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    duration REAL,
+                    created_at DATETIME,
+                    completed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Full-text index for history search
+            self.fts_enabled = ensure_history_fts(cursor)
+            # Trigger-maintained aggregates for statistics
+            ensure_history_stats(cursor)
+
             conn.commit()
             logger.info(f"Database initialized: {self.db_path}")
 
     def _add_download_sync(self, video_info: Dict) -> int:
         """Add download to history (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO download_history
                 (video_title, file_name, file_path, format, url,
-                 file_size, duration, channel_name, channel_url, video_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 file_size, duration, channel_name, channel_url, video_id, blob_path, quality)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 video_info.get('title', 'Unknown'),
                 video_info.get('file_name', ''),
@@ -123,6 +269,8 @@ class DatabaseManager:
                 video_info.get('channel_name'),
                 video_info.get('channel_url'),
                 video_info.get('video_id'),
+                video_info.get('blob_path'),
+                video_info.get('quality'),
             ))
             conn.commit()
             return cursor.lastrowid or 0
@@ -134,13 +282,13 @@ class DatabaseManager:
 
     def _get_history_sync(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Get download history (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM download_history
                 WHERE is_deleted = 0
-                ORDER BY downloaded_at DESC
+                ORDER BY downloaded_at DESC, id DESC
                 LIMIT ? OFFSET ?
             ''', (limit, offset))
 
@@ -152,9 +300,50 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, self._get_history_sync, limit, offset)
 
+    def _get_history_page_sync(self, limit: int = 100,
+                               cursor_token: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get a page of download history after a cursor (sync)
+        Keyset pagination on (downloaded_at, id) - no rows are skipped over
+
+        Returns:
+            (items, next_cursor) - next_cursor is None on the last page
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            if cursor_token:
+                downloaded_at, history_id = decode_cursor(cursor_token, 2)
+                cursor.execute('''
+                    SELECT * FROM download_history
+                    WHERE is_deleted = 0 AND (downloaded_at, id) < (?, ?)
+                    ORDER BY downloaded_at DESC, id DESC
+                    LIMIT ?
+                ''', (downloaded_at, history_id, limit + 1))
+            else:
+                cursor.execute('''
+                    SELECT * FROM download_history
+                    WHERE is_deleted = 0
+                    ORDER BY downloaded_at DESC, id DESC
+                    LIMIT ?
+                ''', (limit + 1,))
+
+            items = [dict(row) for row in cursor.fetchall()]
+            if len(items) <= limit:
+                return items, None
+            items = items[:limit]
+            last = items[-1]
+            return items, encode_cursor([last['downloaded_at'], last['id']])
+
+    async def get_history_page(self, limit: int = 100,
+                               cursor_token: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get a page of download history after a cursor (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._get_history_page_sync, limit, cursor_token)
+
     def _get_history_item_sync(self, history_id: int) -> Optional[Dict]:
         """Get specific history item (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute('''
@@ -172,7 +361,7 @@ class DatabaseManager:
 
     def _delete_history_item_sync(self, history_id: int) -> bool:
         """Soft delete history item (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE download_history
@@ -187,36 +376,102 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, self._delete_history_item_sync, history_id)
 
+    def _delete_history_items_sync(self, history_ids: List[int]) -> List[int]:
+        """Soft delete history items in one transaction, returns the ids that were deleted (sync)"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            deleted = self._active_ids(cursor, 'download_history', history_ids)
+            cursor.executemany('''
+                UPDATE download_history
+                SET is_deleted = 1
+                WHERE id = ?
+            ''', [(history_id,) for history_id in deleted])
+            conn.commit()
+            return deleted
+
+    async def delete_history_items(self, history_ids: List[int]) -> List[int]:
+        """Soft delete history items in one transaction (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._delete_history_items_sync, history_ids)
+
+    def _find_completed_downloads_sync(self, video_ids: List[str]) -> Dict[Tuple[str, str], Dict]:
+        """
+        Latest non-deleted history row per (video ID, quality) (sync)
+        Rows recorded before qualities were stored are skipped.
+        """
+        found: Dict[Tuple[str, str], Dict] = {}
+        video_ids = list(dict.fromkeys(video_ids))
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            for start in range(0, len(video_ids), MAX_QUERY_PARAMS):
+                chunk = video_ids[start:start + MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f'''
+                    SELECT * FROM download_history INDEXED BY idx_history_video_id
+                    WHERE video_id IN ({placeholders}) AND is_deleted = 0
+                ''', chunk)
+                for row in cursor.fetchall():
+                    if not row['quality']:
+                        continue
+                    key = (row['video_id'], row['quality'])
+                    latest = found.get(key)
+                    if latest is None or (row['downloaded_at'], row['id']) > (latest['downloaded_at'], latest['id']):
+                        found[key] = dict(row)
+        return found
+
+    async def find_completed_downloads(self, video_ids: List[str]) -> Dict[Tuple[str, str], Dict]:
+        """Latest non-deleted history row per (video ID, quality) (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._find_completed_downloads_sync, video_ids)
+
+    def _get_blob_references_sync(self) -> Dict[str, List[str]]:
+        """Media store blob -> file paths of the non-deleted history rows using it (sync)"""
+        references: Dict[str, List[str]] = {}
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT blob_path, file_path FROM download_history
+                WHERE blob_path IS NOT NULL AND is_deleted = 0
+            ''')
+            for blob_path, file_path in cursor.fetchall():
+                references.setdefault(blob_path, []).append(file_path)
+        return references
+
     def _get_statistics_sync(self) -> Dict:
-        """Get download statistics (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Get download statistics from the trigger-maintained aggregates (sync)"""
+        with self._connect() as conn:
             cursor = conn.cursor()
 
-            # Total downloads
             cursor.execute('''
-                SELECT COUNT(*) FROM download_history
-                WHERE is_deleted = 0
+                SELECT downloads, total_size, CAST(total_duration AS INTEGER) FROM history_totals
+                WHERE id = 1
             ''')
-            total_downloads = cursor.fetchone()[0]
+            total_downloads, total_size, total_duration = cursor.fetchone()
 
-            # Total size
+            # Most downloaded channels
             cursor.execute('''
-                SELECT SUM(file_size) FROM download_history
-                WHERE is_deleted = 0 AND file_size IS NOT NULL
+                SELECT channel_name, downloads FROM history_channel_stats
+                ORDER BY downloads DESC
+                LIMIT 5
             ''')
-            total_size = cursor.fetchone()[0] or 0
+            top_channels = [
+                {'channel_name': name, 'downloads': count}
+                for name, count in cursor.fetchall()
+            ]
 
-            # Total duration
             cursor.execute('''
-                SELECT SUM(duration) FROM download_history
-                WHERE is_deleted = 0 AND duration IS NOT NULL
+                SELECT downloads FROM history_daily_stats
+                WHERE day = DATE('now', 'localtime')
             ''')
-            total_duration = cursor.fetchone()[0] or 0
+            row = cursor.fetchone()
 
             return {
                 'total_downloads': total_downloads,
                 'total_size': total_size,
                 'total_duration': total_duration,
+                'top_channels': top_channels,
+                'today_downloads': row[0] if row else 0,
             }
 
     async def get_statistics(self) -> Dict:
@@ -224,23 +479,34 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, self._get_statistics_sync)
 
-    def _search_history_sync(self, query: str) -> List[Dict]:
-        """Search history by video title (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+    def _search_history_sync(self, query: str, limit: int = 50) -> List[Dict]:
+        """Search history by title, channel, file name or URL, best matches first (sync)"""
+        match = build_match_query(query) if self.fts_enabled else None
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM download_history
-                WHERE is_deleted = 0 AND video_title LIKE ?
-                ORDER BY downloaded_at DESC
-                LIMIT 50
-            ''', (f'%{query}%',))
+            if match:
+                weights = ", ".join(str(w) for w in RANK_WEIGHTS)
+                cursor.execute(f'''
+                    SELECT h.* FROM history_fts
+                    JOIN download_history h ON h.id = history_fts.rowid
+                    WHERE history_fts MATCH ? AND h.is_deleted = 0
+                    ORDER BY bm25(history_fts, {weights}), h.downloaded_at DESC
+                    LIMIT ?
+                ''', (match, limit))
+            else:
+                cursor.execute('''
+                    SELECT * FROM download_history
+                    WHERE is_deleted = 0 AND video_title LIKE ?
+                    ORDER BY downloaded_at DESC
+                    LIMIT ?
+                ''', (f'%{query}%', limit))
 
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
     async def search_history(self, query: str) -> List[Dict]:
-        """Search history by video title (async)"""
+        """Search history by title, channel, file name or URL (async)"""
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, self._search_history_sync, query)
 
@@ -249,7 +515,7 @@ class DatabaseManager:
         if retention_days <= 0:
             return 0  # 0 or negative means keep forever
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE download_history
@@ -268,19 +534,68 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, self._cleanup_old_history_sync, retention_days)
 
+    # ==========================================================================
+    # Conversion Jobs
+    # ==========================================================================
+
+    def _save_conversion_sync(self, conversion: Dict) -> None:
+        """Store the final state of a conversion job (sync)"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO conversion_jobs
+                (id, input_path, output_path, output_format, quality,
+                 status, error, duration, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                conversion['id'],
+                conversion['input_path'],
+                conversion.get('output_path'),
+                conversion.get('output_format'),
+                conversion.get('quality'),
+                conversion['status'],
+                conversion.get('error'),
+                conversion.get('duration'),
+                conversion.get('created_at'),
+            ))
+            conn.commit()
+
+    async def save_conversion(self, conversion: Dict) -> None:
+        """Store the final state of a conversion job (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._save_conversion_sync, conversion)
+
+    def _get_conversion_job_sync(self, conversion_id: str) -> Optional[Dict]:
+        """Get a stored conversion job (sync)"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM conversion_jobs
+                WHERE id = ?
+            ''', (conversion_id,))
+
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    async def get_conversion_job(self, conversion_id: str) -> Optional[Dict]:
+        """Get a stored conversion job (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._get_conversion_job_sync, conversion_id)
+
     # ==========================================================================
     # Queue Management
     # ==========================================================================
 
     def _get_queue_sync(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Get download queue (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM download_queue
                 WHERE is_deleted = 0
-                ORDER BY priority DESC, position ASC, added_at ASC
+                ORDER BY priority DESC, position ASC, added_at ASC, id ASC
                 LIMIT ? OFFSET ?
             ''', (limit, offset))
 
@@ -292,9 +607,64 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, self._get_queue_sync, limit, offset)
 
+    def _get_queue_page_sync(self, limit: int = 100,
+                             cursor_token: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get a page of the download queue after a cursor (sync)
+        Keyset pagination on (priority DESC, position, added_at, id)
+
+        Returns:
+            (items, next_cursor) - next_cursor is None on the last page
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            if cursor_token:
+                priority, position, added_at, queue_id = decode_cursor(cursor_token, 4)
+                # Two index seeks: the rest of the cursor's priority, then the
+                # lower priorities (one OR-ed predicate would scan every
+                # earlier row of the same priority)
+                cursor.execute('''
+                    SELECT * FROM download_queue
+                    WHERE is_deleted = 0 AND priority = ?
+                      AND (position, added_at, id) > (?, ?, ?)
+                    ORDER BY position ASC, added_at ASC, id ASC
+                    LIMIT ?
+                ''', (priority, position, added_at, queue_id, limit + 1))
+                rows = cursor.fetchall()
+                if len(rows) <= limit:
+                    cursor.execute('''
+                        SELECT * FROM download_queue
+                        WHERE is_deleted = 0 AND priority < ?
+                        ORDER BY priority DESC, position ASC, added_at ASC, id ASC
+                        LIMIT ?
+                    ''', (priority, limit + 1 - len(rows)))
+                    rows += cursor.fetchall()
+            else:
+                cursor.execute('''
+                    SELECT * FROM download_queue
+                    WHERE is_deleted = 0
+                    ORDER BY priority DESC, position ASC, added_at ASC, id ASC
+                    LIMIT ?
+                ''', (limit + 1,))
+                rows = cursor.fetchall()
+
+            items = [dict(row) for row in rows]
+            if len(items) <= limit:
+                return items, None
+            items = items[:limit]
+            last = items[-1]
+            return items, encode_cursor([last['priority'], last['position'], last['added_at'], last['id']])
+
+    async def get_queue_page(self, limit: int = 100,
+                             cursor_token: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get a page of the download queue after a cursor (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._get_queue_page_sync, limit, cursor_token)
+
     def _add_to_queue_sync(self, url: str, priority: int = 0) -> int:
         """Add item to queue (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Get next position
@@ -316,9 +686,171 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, self._add_to_queue_sync, url, priority)
 
+    def _add_queue_jobs_sync(self, jobs: List[Dict]) -> List[Tuple[int, int]]:
+        """
+        Insert download jobs into the queue in one transaction (sync)
+        Jobs without a position are appended after the current last position.
+
+        Returns:
+            (queue id, position) per job, in order
+        """
+        if not jobs:
+            return []
+
+        with self._connect() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT MAX(position) FROM download_queue WHERE is_deleted = 0')
+            max_pos = cursor.fetchone()[0]
+            next_position = (max_pos if max_pos is not None else -1) + 1
+
+            rows = []
+            positions = []
+            for job in jobs:
+                position = job.get('position')
+                if position is None:
+                    position = next_position
+                    next_position += 1
+                positions.append(position)
+                rows.append((
+                    job['url'],
+                    job.get('video_title'),
+                    job.get('video_id'),
+                    job.get('priority', 0),
+                    position,
+                    job.get('status', 'pending'),
+                    job.get('job_id'),
+                    job.get('parent_job_id'),
+                    job.get('quality'),
+                ))
+
+            cursor.executemany('''
+                INSERT INTO download_queue
+                (url, video_title, video_id, priority, position, status,
+                 job_id, parent_job_id, quality)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+            # AUTOINCREMENT ids are handed out consecutively while this
+            # transaction holds the write lock
+            cursor.execute('SELECT last_insert_rowid()')
+            last_id = cursor.fetchone()[0]
+
+            conn.commit()
+            return list(zip(range(last_id - len(rows) + 1, last_id + 1), positions))
+
+    async def add_queue_jobs(self, jobs: List[Dict]) -> List[Tuple[int, int]]:
+        """Insert download jobs into the queue in one transaction (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._add_queue_jobs_sync, jobs)
+
+    def _link_queue_job_sync(self, queue_id: int, job_id: str, quality: str) -> bool:
+        """Attach a download job to an existing queue row (sync)"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE download_queue
+                SET job_id = ?, quality = ?
+                WHERE id = ?
+            ''', (job_id, quality, queue_id))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    async def link_queue_job(self, queue_id: int, job_id: str, quality: str) -> bool:
+        """Attach a download job to an existing queue row (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._link_queue_job_sync, queue_id, job_id, quality)
+
+    def _update_queue_status_sync(self, queue_id: int, status: str,
+                                  error_message: Optional[str] = None,
+                                  video_title: Optional[str] = None,
+                                  file_path: Optional[str] = None) -> bool:
+        """Record a queue item's status; stamps started_at/completed_at (sync)"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE download_queue
+                SET status = ?,
+                    error_message = ?,
+                    video_title = COALESCE(?, video_title),
+                    file_path = ?,
+                    started_at = CASE
+                        WHEN ? = 'processing' AND started_at IS NULL THEN CURRENT_TIMESTAMP
+                        WHEN ? = 'pending' THEN NULL
+                        ELSE started_at END,
+                    completed_at = CASE
+                        WHEN ? IN ('completed', 'failed', 'cancelled') THEN CURRENT_TIMESTAMP
+                        ELSE NULL END
+                WHERE id = ?
+            ''', (status, error_message, video_title, file_path, status, status, status, queue_id))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def _get_queue_job_sync(self, job_id: str) -> Optional[Dict]:
+        """Get the queue row of a download job by its job id (sync)"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM download_queue
+                WHERE job_id = ?
+            ''', (job_id,))
+
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    async def get_queue_job(self, job_id: str) -> Optional[Dict]:
+        """Get the queue row of a download job by its job id (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._get_queue_job_sync, job_id)
+
+    def _get_queue_jobs_by_parent_sync(self, parent_job_id: str) -> List[Dict]:
+        """Get the rows of a playlist's items (sync)"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM download_queue
+                WHERE parent_job_id = ?
+                ORDER BY position ASC
+            ''', (parent_job_id,))
+
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    async def get_queue_jobs_by_parent(self, parent_job_id: str) -> List[Dict]:
+        """Get the rows of a playlist's items (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._get_queue_jobs_by_parent_sync, parent_job_id)
+
+    def _get_resumable_jobs_sync(self) -> List[Dict]:
+        """
+        Get unfinished download jobs (pending or interrupted while processing),
+        plus every item of unfinished playlists so their progress can be rebuilt (sync)
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM download_queue
+                WHERE is_deleted = 0 AND job_id IS NOT NULL
+                AND (
+                    status IN ('pending', 'processing')
+                    OR parent_job_id IN (
+                        SELECT job_id FROM download_queue
+                        WHERE is_deleted = 0 AND job_id IS NOT NULL
+                        AND status IN ('pending', 'processing')
+                    )
+                )
+                ORDER BY priority DESC, position ASC, added_at ASC
+            ''')
+
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+
     def _get_queue_item_sync(self, queue_id: int) -> Optional[Dict]:
         """Get specific queue item (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute('''
@@ -336,7 +868,7 @@ class DatabaseManager:
 
     def _update_queue_priority_sync(self, queue_id: int, priority: int) -> bool:
         """Update queue item priority (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE download_queue
@@ -353,7 +885,7 @@ class DatabaseManager:
 
     def _update_queue_position_sync(self, queue_id: int, position: int) -> bool:
         """Update queue item position (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE download_queue
@@ -370,7 +902,7 @@ class DatabaseManager:
 
     def _delete_queue_item_sync(self, queue_id: int) -> bool:
         """Soft delete queue item (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE download_queue
@@ -385,9 +917,52 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(_executor, self._delete_queue_item_sync, queue_id)
 
+    def _delete_queue_items_sync(self, queue_ids: List[int]) -> List[int]:
+        """Soft delete queue items in one transaction, returns the ids that were deleted (sync)"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            deleted = self._active_ids(cursor, 'download_queue', queue_ids)
+            cursor.executemany('''
+                UPDATE download_queue
+                SET is_deleted = 1
+                WHERE id = ?
+            ''', [(queue_id,) for queue_id in deleted])
+            conn.commit()
+            return deleted
+
+    async def delete_queue_items(self, queue_ids: List[int]) -> List[int]:
+        """Soft delete queue items in one transaction (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._delete_queue_items_sync, queue_ids)
+
+    def _update_queue_priorities_sync(self, updates: List[Dict]) -> List[int]:
+        """
+        Change priority and/or position of many queue items in one transaction (sync)
+        Each update is {'id', 'priority', 'position'}; None keeps the current value.
+        Returns the ids that were updated.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            found = set(self._active_ids(cursor, 'download_queue', [u['id'] for u in updates]))
+            cursor.executemany('''
+                UPDATE download_queue
+                SET priority = COALESCE(?, priority), position = COALESCE(?, position)
+                WHERE id = ?
+            ''', [
+                (u.get('priority'), u.get('position'), u['id'])
+                for u in updates if u['id'] in found
+            ])
+            conn.commit()
+            return [u['id'] for u in updates if u['id'] in found]
+
+    async def update_queue_priorities(self, updates: List[Dict]) -> List[int]:
+        """Change priority and/or position of many queue items in one transaction (async)"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, self._update_queue_priorities_sync, updates)
+
     def _clear_queue_sync(self, status: str = "all") -> int:
         """Clear queue items by status (sync)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             if status == "all":
@@ -412,13 +987,17 @@ class DatabaseManager:
         return await loop.run_in_executor(_executor, self._clear_queue_sync, status)
 
 
-# Global database manager instance
+# Global database manager instance with thread-safe initialization
 _db_manager = None
+_db_manager_lock = threading.Lock()
 
 
 def get_database_manager() -> DatabaseManager:
-    """Get or create global database manager instance"""
+    """Get or create global database manager instance (thread-safe)"""
     global _db_manager
     if _db_manager is None:
-        _db_manager = DatabaseManager()
+        with _db_manager_lock:
+            # Double-checked locking pattern
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
     return _db_manager
@@ -48,12 +48,22 @@ async def lifespan(app: FastAPI):
     from services.download_service import get_download_service
     from services.conversion_service import get_conversion_service
 
-    # Inject WebSocket manager into services
+    # Inject WebSocket manager and the server event loop into services
+    # (worker threads send every event back to this loop)
+    loop = asyncio.get_running_loop()
     download_service = get_download_service()
     download_service.set_websocket_manager(manager)
+    download_service.set_event_loop(loop)
 
     conversion_service = get_conversion_service()
     conversion_service.set_websocket_manager(manager)
+    conversion_service.set_event_loop(loop)
+
+    # Pick up jobs left unfinished by a previous run (crash, watchdog exit)
+    download_service.resume_pending_jobs()
+
+    # Free stored media whose downloads were deleted (walks the store - off the loop)
+    loop.run_in_executor(None, download_service.collect_media_garbage)
 
     logger.info("✅ Services initialized")
 
@@ -131,7 +141,8 @@ async def root():
             "history": "/api/history",
             "queue": "/api/queue",
             "config": "/api/config",
-            "websocket": "/ws/download/{download_id}"
+            "websocket": "/ws/download/{download_id}",
+            "events": "/ws/events"
         }
     }
 
@@ -0,0 +1,67 @@
+"""
+Cancellable FFmpeg
+yt-dlp's FFmpegExtractAudio with its FFmpeg child process exposed, so a
+cancelled download can stop a long encode instead of waiting for it
+"""
+import threading
+
+from yt_dlp.postprocessor import ffmpeg as ytdlp_ffmpeg
+from yt_dlp.postprocessor.ffmpeg import FFmpegExtractAudioPP
+from yt_dlp.utils import DownloadCancelled, Popen
+
+# Job whose postprocessor is running on the current thread
+_current = threading.local()
+
+
+class _TrackedPopen(Popen):
+    """yt-dlp's Popen that registers processes started for a cancellable job"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        job = getattr(_current, "job", None)
+        if job is not None:
+            job.ffmpeg_process = self
+            # Cancelled between the postprocessor hook and this start
+            if job.cancel_event.is_set():
+                self.kill()
+
+
+# yt-dlp's FFmpeg postprocessors start every process through this name;
+# outside a CancellableExtractAudioPP run it behaves exactly like Popen
+ytdlp_ffmpeg.Popen = _TrackedPopen
+
+
+class CancellableExtractAudioPP(FFmpegExtractAudioPP):
+    """
+    FFmpegExtractAudio that records its FFmpeg process on the job
+    (job.ffmpeg_process) while it runs; kill_ffmpeg() stops it and the
+    run then ends with DownloadCancelled
+    """
+
+    def __init__(self, job, downloader=None, **kwargs):
+        super().__init__(downloader, **kwargs)
+        self.job = job
+
+    def real_run_ffmpeg(self, *args, **kwargs):
+        _current.job = self.job
+        try:
+            return super().real_run_ffmpeg(*args, **kwargs)
+        except Exception:
+            if self.job.cancel_event.is_set():
+                raise DownloadCancelled()
+            raise
+        finally:
+            _current.job = None
+            self.job.ffmpeg_process = None
+
+
+def kill_ffmpeg(job) -> bool:
+    """Kill the job's running FFmpeg process, if any (any thread)"""
+    process = job.ffmpeg_process
+    if process is None or process.poll() is not None:
+        return False
+    try:
+        process.kill()
+    except OSError:
+        return False
+    return True
@@ -9,10 +9,18 @@ import uuid
 import logging
 import threading
 import queue
-import subprocess
 import re
-from typing import Dict, Optional
+import shutil
+import tempfile
+import itertools
+import time
+import contextlib
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+from database.manager import get_database_manager
+from services.job_record import JobRecord
+from utils.media_probe import inspect_media, media_info, can_copy_audio
 from api.models import AudioQuality, DEFAULT_QUALITY, OutputFormat, DEFAULT_FORMAT, FORMAT_CONFIG
 
 logger = logging.getLogger(__name__)
@@ -21,11 +29,42 @@ logger = logging.getLogger(__name__)
 _conversion_service = None
 _conversion_service_lock = threading.Lock()
 
+# Auto-scaling: how often CPU count/load is re-checked
+AUTOSCALE_INTERVAL = 10  # seconds
 
-class Conversion:
+# Statuses after which a conversion can no longer change
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Finished conversions kept in memory (older/excess ones are served from conversion_jobs)
+FINISHED_JOB_RETENTION = 3600  # seconds
+MAX_FINISHED_JOBS = 200
+
+# Segmented (parallel) encoding of long inputs - off until a minimum duration is set
+SEGMENTABLE_FORMATS = ("mp3", "aac", "flac", "wav")  # Concatenate cleanly with -c copy
+MIN_SEGMENT_SECONDS = 120
+SILENCE_NOISE = "-40dB"
+SILENCE_MIN_SECONDS = 0.5
+SILENCE_SEARCH_WINDOW = 30  # Cut at a silence this close to an even split, else at the split
+ENCODER_SLOT_POLL = 0.1  # seconds between attempts to take a free encoder slot
+
+_SILENCE_PATTERN = re.compile(r'silence_(start|end): (-?[\d.]+)')
+
+
+class Conversion(JobRecord):
     """Conversion tracking object"""
 
+    __slots__ = (
+        "id", "input_path", "quality", "output_format", "status", "progress", "output_path",
+        "file_name", "error", "created_at", "duration", "current_time", "process", "source",
+    )
+
+    SNAPSHOT_FIELDS = frozenset((
+        "id", "input_path", "output_path", "file_name", "output_format", "status",
+        "progress", "error", "created_at", "duration", "source",
+    ))
+
     def __init__(self, conversion_id: str, input_path: str, quality: AudioQuality = DEFAULT_QUALITY, output_format: OutputFormat = DEFAULT_FORMAT):
+        super().__init__()
         self.id = conversion_id
         self.input_path = input_path
         self.quality = quality
@@ -39,9 +78,9 @@ class Conversion:
         self.duration = None  # Total duration in seconds
         self.current_time = None  # Current processed time
         self.process = None  # FFmpeg process handle for cancellation
+        self.source = None  # media_info() of the input once probed
 
-    def to_dict(self):
-        """Convert to dictionary"""
+    def _build_snapshot(self):
         return {
             "id": self.id,
             "input_path": self.input_path,
@@ -53,27 +92,67 @@ class Conversion:
             "error": self.error,
             "created_at": self.created_at.isoformat(),
             "duration": self.duration,
+            "source": self.source,
         }
 
+    @classmethod
+    def from_row(cls, row: Dict) -> "Conversion":
+        """Rebuild a finished conversion from its conversion_jobs row"""
+        conversion = cls(row['id'], row['input_path'], row.get('quality') or DEFAULT_QUALITY,
+                         row.get('output_format') or DEFAULT_FORMAT)
+        conversion.status = row['status']
+        conversion.progress = 100 if row['status'] == "completed" else 0
+        conversion.output_path = row.get('output_path')
+        conversion.error = row.get('error')
+        conversion.duration = row.get('duration')
+        if row.get('created_at'):
+            try:
+                conversion.created_at = datetime.fromisoformat(row['created_at'])
+            except (TypeError, ValueError):
+                pass
+        return conversion
+
 
 class ConversionService:
     """Service for managing file conversions with thread-safe job queue"""
 
-    def __init__(self, output_dir: str = "./music", max_workers: int = 2):
+    def __init__(self, output_dir: str = "./music", max_workers: int = 2, auto_scale: bool = False):
         self.output_dir = os.path.abspath(output_dir)
         self.active_conversions: Dict[str, Conversion] = {}
         self.websocket_manager = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None  # Server event loop, injected at startup
+        self.db_manager = get_database_manager()
 
         # Thread-safe job queue
         self.job_queue = queue.Queue()
         self.conversions_lock = threading.Lock()
         self.shutdown_event = threading.Event()
 
-        # Worker threads
-        self.max_workers = max_workers
+        # Worker threads (resizable at runtime)
+        self.max_workers = max(1, max_workers)
         self.workers = []
+        self.workers_lock = threading.Lock()
+        self._worker_ids = itertools.count()
         self._start_workers()
 
+        # CPU-based auto-scaling
+        self.auto_scale = False
+        self._autoscaler = None
+        if auto_scale:
+            self.set_auto_scale(True)
+
+        # Bounded retention of finished conversions: id -> finish time
+        self.finished_retention = FINISHED_JOB_RETENTION
+        self.max_finished_jobs = MAX_FINISHED_JOBS
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+
+        # Inputs at least this long are encoded in parallel segments (0 = never)
+        self.segment_min_duration = 0
+
+        # Encoding FFmpeg processes across all workers, whole or segment, are capped
+        # at one per core (each worker runs its own event loop, hence a thread semaphore)
+        self._encoder_slots = threading.BoundedSemaphore(os.cpu_count() or 1)
+
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
 
@@ -84,24 +163,149 @@ class ConversionService:
         logger.info(f"Conversion output directory set to: {self.output_dir}")
 
     def _start_workers(self):
-        """Start worker threads for processing conversion jobs"""
-        for i in range(self.max_workers):
-            worker = threading.Thread(
-                target=self._worker_loop,
-                name=f"ConversionWorker-{i}",
+        """Start worker threads up to max_workers"""
+        started = 0
+        with self.workers_lock:
+            while len(self.workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"ConversionWorker-{next(self._worker_ids)}",
+                    daemon=True
+                )
+                self.workers.append(worker)
+                worker.start()
+                started += 1
+        if started:
+            logger.info(f"Started {started} conversion worker threads ({self.max_workers} total)")
+
+    def _retire_if_excess(self) -> bool:
+        """Let the calling worker exit if the pool was shrunk"""
+        with self.workers_lock:
+            if len(self.workers) > self.max_workers:
+                self.workers.remove(threading.current_thread())
+                return True
+        return False
+
+    def set_max_workers(self, max_workers: int):
+        """
+        Resize the worker pool at runtime. Growing starts threads immediately;
+        shrinking lets surplus workers exit after their current job.
+        """
+        max_workers = max(1, int(max_workers))
+        if max_workers == self.max_workers:
+            return
+        self.max_workers = max_workers
+        self._start_workers()
+        logger.info(f"Conversion worker pool resized to {max_workers}")
+
+    def set_auto_scale(self, enabled: bool):
+        """Enable/disable CPU-based worker pool sizing"""
+        self.auto_scale = enabled
+        if enabled and (self._autoscaler is None or not self._autoscaler.is_alive()):
+            self._autoscaler = threading.Thread(
+                target=self._autoscale_loop,
+                name="ConversionAutoscaler",
                 daemon=True
             )
-            worker.start()
-            self.workers.append(worker)
-        logger.info(f"Started {self.max_workers} conversion worker threads")
+            self._autoscaler.start()
+            logger.info("Conversion worker auto-scaling enabled")
+
+    def _cpu_target(self) -> int:
+        """Worker count for the cores not busy with work outside this service"""
+        cpus = os.cpu_count() or 1
+        try:
+            load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            # No load average (Windows) - leave one core for the UI
+            return max(1, cpus - 1)
+
+        with self.conversions_lock:
+            busy = sum(1 for c in self.active_conversions.values() if c.status == "converting")
+        # Our own FFmpeg processes are part of the load average
+        other_load = max(0.0, load - busy)
+        return max(1, min(cpus, int(cpus - other_load)))
+
+    def _autoscale_loop(self):
+        """Periodically size the pool by CPU count and current load"""
+        while self.auto_scale and not self.shutdown_event.is_set():
+            target = self._cpu_target()
+            if target != self.max_workers:
+                logger.info(f"Auto-scaling conversions to {target} workers")
+                self.set_max_workers(target)
+            if self.shutdown_event.wait(AUTOSCALE_INTERVAL):
+                break
+        logger.info("Conversion worker auto-scaling stopped")
+
+    def set_retention(self, max_finished_jobs: Optional[int] = None,
+                      retention_seconds: Optional[float] = None):
+        """Change how many finished conversions are kept in memory, and for how long"""
+        if max_finished_jobs is not None:
+            self.max_finished_jobs = max(0, int(max_finished_jobs))
+        if retention_seconds is not None:
+            self.finished_retention = max(0, retention_seconds)
+        self.evict_finished()
+
+    def set_segmenting(self, min_duration_seconds: float):
+        """Encode inputs at least this long in parallel segments (0 disables)"""
+        self.segment_min_duration = max(0, min_duration_seconds)
+
+    def _finish(self, conversion: Conversion):
+        """Store a finished conversion's final state and start its retention period"""
+        try:
+            self.db_manager._save_conversion_sync({
+                'id': conversion.id,
+                'input_path': conversion.input_path,
+                'output_path': conversion.output_path,
+                'output_format': conversion.output_format,
+                'quality': conversion.quality,
+                'status': conversion.status,
+                'error': conversion.error,
+                'duration': conversion.duration,
+                'created_at': conversion.created_at.isoformat(),
+            })
+        except Exception as e:
+            logger.error(f"Failed to save conversion {conversion.id}: {e}")
+
+        with self.conversions_lock:
+            self._finished[conversion.id] = time.monotonic()
+            self._finished.move_to_end(conversion.id)
+
+    def evict_finished(self) -> int:
+        """
+        Drop finished conversions beyond the count bound or older than the
+        retention period from memory. Their final state stays in conversion_jobs.
+
+        Returns:
+            Number of conversions removed
+        """
+        now = time.monotonic()
+        removed = 0
+        with self.conversions_lock:
+            while self._finished:
+                conversion_id, finished_at = next(iter(self._finished.items()))
+                if (len(self._finished) <= self.max_finished_jobs
+                        and now - finished_at < self.finished_retention):
+                    break
+                del self._finished[conversion_id]
+                if self.active_conversions.pop(conversion_id, None):
+                    removed += 1
+
+        if removed:
+            logger.debug(f"Evicted {removed} finished conversion(s) from memory")
+        return removed
 
     def _worker_loop(self):
         """Worker thread main loop"""
         while not self.shutdown_event.is_set():
+            if self._retire_if_excess():
+                return
             try:
                 conversion = self.job_queue.get(timeout=1)
-                asyncio.run(self._conversion_worker(conversion))
+                if conversion.status != "cancelled":  # Cancelled while queued
+                    asyncio.run(self._conversion_worker(conversion))
+                self._finish(conversion)
                 self.job_queue.task_done()
+                self.evict_finished()
             except queue.Empty:
                 continue
             except Exception as e:
@@ -111,7 +315,9 @@ class ConversionService:
         """Graceful shutdown of worker threads"""
         logger.info("Shutting down conversion service...")
         self.shutdown_event.set()
-        for worker in self.workers:
+        with self.workers_lock:
+            workers = list(self.workers)
+        for worker in workers:
             worker.join(timeout=5)
         logger.info("Conversion service shutdown complete")
 
@@ -119,10 +325,22 @@ class ConversionService:
         """Inject WebSocket manager for progress updates"""
         self.websocket_manager = manager
 
+    def set_event_loop(self, loop: asyncio.AbstractEventLoop):
+        """Inject the server event loop that owns the WebSocket connections"""
+        self.loop = loop
+
     async def broadcast_progress(self, conversion_id: str, message: dict):
-        """Broadcast progress update via WebSocket"""
-        if self.websocket_manager:
-            await self.websocket_manager.broadcast(conversion_id, message)
+        """Broadcast progress update via WebSocket (always sent from the server loop)"""
+        if not self.websocket_manager:
+            return
+        loop = self.loop
+        if loop is None or loop is asyncio.get_running_loop():
+            await self.websocket_manager.broadcast(conversion_id, message, kind="conversion")
+        elif not loop.is_closed():
+            # Called from a worker's private loop - hand off to the server loop
+            asyncio.run_coroutine_threadsafe(
+                self.websocket_manager.broadcast(conversion_id, message, kind="conversion"), loop
+            )
 
     async def start_conversion(self, input_path: str, quality: AudioQuality = DEFAULT_QUALITY, output_format: OutputFormat = DEFAULT_FORMAT) -> Conversion:
         """Start a new conversion"""
@@ -170,12 +388,18 @@ class ConversionService:
 
             conversion.output_path = output_path
 
-            # Get duration first
-            duration = await self._get_duration(input_path)
-            conversion.duration = duration
+            # Probe once: duration for progress, codec/bitrate for the copy decision,
+            # and the source's codec/channels/tags for clients
+            probe = await inspect_media(input_path)
+            conversion.source = media_info(probe)
+            conversion.duration = conversion.source["duration"]
+            copy_audio = can_copy_audio(probe, conversion.output_format, conversion.quality)
 
             # Run FFmpeg conversion with progress
-            await self._run_ffmpeg(conversion, input_path, output_path)
+            if not copy_audio and self._use_segments(conversion):
+                await self._run_segmented(conversion, input_path, output_path)
+            else:
+                await self._run_ffmpeg(conversion, input_path, output_path, copy_audio=copy_audio)
 
             # Conversion completed
             conversion.status = "completed"
@@ -192,6 +416,10 @@ class ConversionService:
             logger.info(f"Conversion {conversion.id} completed: {output_path}")
 
         except Exception as e:
+            if conversion.status == "cancelled":
+                # FFmpeg was stopped by cancel_conversion - already broadcast
+                return
+
             logger.exception(f"Conversion {conversion.id} failed: {e}")
             conversion.status = "failed"
             conversion.error = str(e)
@@ -203,49 +431,82 @@ class ConversionService:
                 "message": f"Conversion failed: {str(e)}"
             })
 
-    async def _get_duration(self, input_path: str) -> Optional[float]:
-        """Get media file duration using ffprobe"""
+    @contextlib.asynccontextmanager
+    async def _encoder_slot(self):
+        """Hold one of the service-wide encoder slots while an FFmpeg encode runs"""
+        while not self._encoder_slots.acquire(blocking=False):
+            await asyncio.sleep(ENCODER_SLOT_POLL)
         try:
-            result = subprocess.run(
-                [
-                    'ffprobe', '-v', 'error',
-                    '-show_entries', 'format=duration',
-                    '-of', 'default=noprint_wrappers=1:nokey=1',
-                    input_path
-                ],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                return float(result.stdout.strip())
-        except Exception as e:
-            logger.warning(f"Could not get duration: {e}")
-        return None
+            yield
+        finally:
+            self._encoder_slots.release()
 
-    async def _run_ffmpeg(self, conversion: Conversion, input_path: str, output_path: str):
-        """Run FFmpeg with progress tracking"""
+    def _encode_args(self, conversion: Conversion) -> List[str]:
+        """FFmpeg output options that re-encode the audio to the requested format/quality"""
         # Get format config
         format_config = FORMAT_CONFIG.get(conversion.output_format, FORMAT_CONFIG["mp3"])
         codec = format_config["codec"]
 
-        cmd = [
-            'ffmpeg', '-y',  # Overwrite output
-            '-i', input_path,
+        args = [
             '-vn',  # No video
             '-acodec', codec,
         ]
 
         # Add bitrate for lossy formats (not for wav/flac)
         if conversion.output_format in ["mp3", "aac", "ogg"]:
-            cmd.extend(['-ab', f'{conversion.quality}k'])
+            args.extend(['-ab', f'{conversion.quality}k'])
+
+        # Add sample rate
+        args.extend(['-ar', '44100'])
+        return args
+
+    async def _run_ffmpeg(self, conversion: Conversion, input_path: str, output_path: str,
+                          copy_audio: bool = False):
+        """
+        Run FFmpeg with progress tracking
+        With copy_audio the source audio stream is remuxed as-is (-c:a copy)
+        instead of being re-encoded.
+        """
+        if copy_audio:
+            cmd = [
+                'ffmpeg', '-y',  # Overwrite output
+                '-i', input_path,
+                '-map', '0:a:0',  # First audio stream only
+                '-c:a', 'copy',
+                '-progress', 'pipe:1',  # Progress to stdout
+                output_path
+            ]
+            logger.info(f"Conversion {conversion.id}: source already matches, copying audio stream")
+        else:
+            cmd = [
+                'ffmpeg', '-y',  # Overwrite output
+                '-i', input_path,
+                *self._encode_args(conversion),
+                '-progress', 'pipe:1',  # Progress to stdout
+                output_path
+            ]
 
-        # Add sample rate and progress
-        cmd.extend([
-            '-ar', '44100',
-            '-progress', 'pipe:1',  # Progress to stdout
-            output_path
-        ])
+        duration = conversion.duration or 0
+
+        async def report(current_seconds: float):
+            if duration > 0:
+                progress = max(0, min(int((current_seconds / duration) * 100), 99))
+                conversion.progress = progress
+
+                await self.broadcast_progress(conversion.id, {
+                    "type": "progress",
+                    "progress": progress,
+                })
 
+        async with self._encoder_slot():
+            await self._run_process(conversion, cmd, output_path, report)
+
+    async def _run_process(self, conversion: Conversion, cmd: List[str], output_path: str,
+                           on_time: Callable[[float], Awaitable[None]]):
+        """
+        Run one FFmpeg process, passing each reported out_time (seconds) to
+        on_time. The process is stopped and output_path removed on cancellation.
+        """
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
@@ -255,64 +516,198 @@ class ConversionService:
         # Store process handle for cancellation
         conversion.process = process
 
-        # Parse progress output
-        duration = conversion.duration or 0
-
-        while True:
-            # Check for cancellation
-            if conversion.status == "cancelled":
-                process.terminate()
-                try:
-                    await asyncio.wait_for(process.wait(), timeout=5.0)
-                except asyncio.TimeoutError:
-                    process.kill()
-                # Clean up partial output file
-                if output_path and os.path.exists(output_path):
+        try:
+            while True:
+                # Check for cancellation
+                if conversion.status == "cancelled":
+                    process.terminate()
+                    try:
+                        await asyncio.wait_for(process.wait(), timeout=5.0)
+                    except asyncio.TimeoutError:
+                        process.kill()
+                    # Clean up partial output file
+                    if output_path and os.path.exists(output_path):
+                        try:
+                            os.remove(output_path)
+                        except Exception:
+                            pass
+                    raise Exception("Conversion cancelled by user")
+
+                line = await process.stdout.readline()
+                if not line:
+                    break
+
+                line = line.decode().strip()
+
+                # Parse out_time for progress
+                if line.startswith('out_time_ms='):
                     try:
-                        os.remove(output_path)
+                        time_ms = int(line.split('=')[1])
+                        await on_time(time_ms / 1_000_000)
                     except Exception:
                         pass
-                raise Exception("Conversion cancelled by user")
-
-            line = await process.stdout.readline()
-            if not line:
-                break
-
-            line = line.decode().strip()
-
-            # Parse out_time for progress
-            if line.startswith('out_time_ms='):
-                try:
-                    time_ms = int(line.split('=')[1])
-                    current_seconds = time_ms / 1_000_000
-
-                    if duration > 0:
-                        progress = max(0, min(int((current_seconds / duration) * 100), 99))
-                        conversion.progress = progress
-
-                        await self.broadcast_progress(conversion.id, {
-                            "type": "progress",
-                            "progress": progress,
-                        })
-                except Exception:
-                    pass
+        except asyncio.CancelledError:
+            # A sibling segment failed - stop this one too
+            process.kill()
+            await process.wait()
+            raise
 
         await process.wait()
 
         # Clear process handle
-        conversion.process = None
+        if conversion.process is process:
+            conversion.process = None
 
         if process.returncode != 0:
             stderr = await process.stderr.read()
             raise Exception(f"FFmpeg error: {stderr.decode()}")
 
+    def _use_segments(self, conversion: Conversion) -> bool:
+        """True if this conversion is long enough to be encoded in parallel segments"""
+        return (
+            self.segment_min_duration > 0
+            and (conversion.duration or 0) >= max(self.segment_min_duration, 2 * MIN_SEGMENT_SECONDS)
+            and conversion.output_format in SEGMENTABLE_FORMATS
+            and (os.cpu_count() or 1) > 1
+        )
+
+    async def _find_silences(self, input_path: str) -> List[float]:
+        """Midpoints of silent stretches in the first audio stream (ffmpeg silencedetect)"""
+        process = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-nostats', '-i', input_path,
+            '-map', '0:a:0',
+            '-af', f'silencedetect=noise={SILENCE_NOISE}:d={SILENCE_MIN_SECONDS}',
+            '-f', 'null', '-',
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+
+        silences = []
+        start = None
+        for kind, value in _SILENCE_PATTERN.findall(stderr.decode(errors='replace')):
+            if kind == 'start':
+                start = float(value)
+            elif start is not None:
+                silences.append((start + float(value)) / 2)
+                start = None
+        return silences
+
+    @staticmethod
+    def _plan_segments(duration: float, parts: int, silences: List[float]) -> List[Tuple[float, Optional[float]]]:
+        """
+        Split [0, duration] into about `parts` (start, end) ranges, moving each
+        cut to the nearest silence within SILENCE_SEARCH_WINDOW (end None = to EOF)
+        """
+        cuts: List[float] = []
+        for k in range(1, parts):
+            ideal = duration * k / parts
+            near = [t for t in silences if abs(t - ideal) <= SILENCE_SEARCH_WINDOW]
+            cut = min(near, key=lambda t: abs(t - ideal)) if near else ideal
+            if cut - (cuts[-1] if cuts else 0.0) >= MIN_SEGMENT_SECONDS / 2:
+                cuts.append(cut)
+
+        starts = [0.0] + cuts
+        ends: List[Optional[float]] = cuts + [None]
+        return list(zip(starts, ends))
+
+    async def _run_segmented(self, conversion: Conversion, input_path: str, output_path: str):
+        """
+        Encode a long input as parallel FFmpeg processes over silence-aligned
+        segments, then join them without re-encoding (concat demuxer, -c copy).
+        Lossy segments keep their own encoder padding, so cuts are placed in
+        silences where possible.
+        """
+        duration = conversion.duration
+        parts = max(2, min(os.cpu_count() or 1, int(duration // MIN_SEGMENT_SECONDS)))
+
+        silences = await self._find_silences(input_path)
+        segments = self._plan_segments(duration, parts, silences)
+        logger.info(f"Conversion {conversion.id}: encoding {len(segments)} segments in parallel "
+                    f"({len(silences)} silences found)")
+
+        extension = os.path.splitext(output_path)[1]
+        work_dir = tempfile.mkdtemp(prefix=".segments-", dir=os.path.dirname(output_path))
+        try:
+            done = [0.0] * len(segments)
+            last_progress = -1
+
+            async def report(index: int, current_seconds: float):
+                nonlocal last_progress
+                done[index] = current_seconds
+                progress = max(0, min(int(sum(done) / duration * 100), 99))
+                if progress != last_progress:
+                    last_progress = progress
+                    conversion.progress = progress
+                    await self.broadcast_progress(conversion.id, {
+                        "type": "progress",
+                        "progress": progress,
+                    })
+
+            async def encode(index: int, start: float, end: Optional[float]) -> str:
+                segment_path = os.path.join(work_dir, f"{index:04d}{extension}")
+                cmd = ['ffmpeg', '-y', '-nostats', '-ss', f'{start:.3f}', '-i', input_path]
+                if end is not None:
+                    cmd.extend(['-t', f'{end - start:.3f}'])
+                cmd.extend([*self._encode_args(conversion), '-progress', 'pipe:1', segment_path])
+                async with self._encoder_slot():
+                    await self._run_process(
+                        conversion, cmd, segment_path,
+                        lambda seconds: report(index, seconds)
+                    )
+                return segment_path
+
+            tasks = [
+                asyncio.ensure_future(encode(index, start, end))
+                for index, (start, end) in enumerate(segments)
+            ]
+            finished, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+            # Pending segments were cancelled above - surface the failure that stopped them
+            for task in finished:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            segment_paths = [task.result() for task in tasks]
+
+            # Join without re-encoding
+            list_path = os.path.join(work_dir, "segments.txt")
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for path in segment_paths:
+                    escaped = path.replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+
+            async def ignore(_seconds: float):
+                pass
+
+            await self._run_process(conversion, [
+                'ffmpeg', '-y', '-nostats',
+                '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-c', 'copy',
+                output_path
+            ], output_path, ignore)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
     def get_conversion(self, conversion_id: str) -> Optional[Conversion]:
         """Get conversion by ID"""
         with self.conversions_lock:
             return self.active_conversions.get(conversion_id)
 
+    async def load_conversion(self, conversion_id: str) -> Optional[Conversion]:
+        """Get a conversion, falling back to conversion_jobs for evicted ones"""
+        conversion = self.get_conversion(conversion_id)
+        if conversion:
+            return conversion
+
+        row = await self.db_manager.get_conversion_job(conversion_id)
+        return Conversion.from_row(row) if row else None
+
     def get_all_conversions(self):
         """Get all active conversions"""
+        self.evict_finished()
         with self.conversions_lock:
             return list(self.active_conversions.values())
 
@@ -344,5 +739,14 @@ def get_conversion_service() -> ConversionService:
                 from config_manager import get_config_manager
                 config = get_config_manager()
                 output_dir = config.get('output_dir', './music')
-                _conversion_service = ConversionService(output_dir=output_dir)
+                _conversion_service = ConversionService(
+                    output_dir=output_dir,
+                    max_workers=config.get('max_conversion_workers', 2),
+                    auto_scale=config.get('auto_scale_workers', False),
+                )
+                _conversion_service.set_retention(
+                    max_finished_jobs=config.get('max_finished_jobs', MAX_FINISHED_JOBS),
+                    retention_seconds=config.get('finished_job_retention_minutes', 60) * 60,
+                )
+                _conversion_service.set_segmenting(config.get('parallel_conversion_min_minutes', 0) * 60)
     return _conversion_service
@@ -9,10 +9,22 @@ import uuid
 import logging
 import threading
 import queue
-from typing import Dict, Optional
+import glob
+import itertools
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import yt_dlp
 from database.manager import get_database_manager
+from database.metadata_cache import get_metadata_cache
+from services.scheduler import PriorityJobQueue
+from services.job_record import JobRecord
+from services.media_store import MEDIA_STORE_DIR, MediaStore
+from services.cancellable_ffmpeg import CancellableExtractAudioPP, kill_ffmpeg
+from utils.formatting import format_speed, format_eta
+from utils.youtube_utils import extract_playlist_id, extract_video_id, normalize_youtube_url
 from api.models import AudioQuality, DEFAULT_QUALITY
 
 logger = logging.getLogger(__name__)
@@ -21,25 +33,104 @@ logger = logging.getLogger(__name__)
 _download_service = None
 _download_service_lock = threading.Lock()
 
+# Statuses after which a download can no longer change
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
 
-class Download:
+# Auto-scaling: bounds and measurement interval for throughput-based sizing
+MIN_AUTO_WORKERS = 1
+MAX_AUTO_WORKERS = 8
+AUTOSCALE_INTERVAL = 10  # seconds
+AUTOSCALE_DEAD_BAND = 0.1  # Rate changes within +/-10% count as steady
+
+# Download status -> download_queue.status
+QUEUE_STATUS = {
+    "pending": "pending",
+    "downloading": "processing",
+    "converting": "processing",
+    "completed": "completed",
+    "failed": "failed",
+    "cancelled": "cancelled",
+}
+
+# Progress events per job: at most this many per second, plus one whenever
+# the integer percentage changes (samples in between are dropped)
+PROGRESS_EVENTS_PER_SECOND = 4
+
+# Finished jobs kept in memory (older/excess ones are served from download_queue)
+FINISHED_JOB_RETENTION = 3600  # seconds
+MAX_FINISHED_JOBS = 200
+
+# Playlist items run below their parent's priority so interactive single
+# downloads can jump ahead of bulk playlist imports
+PLAYLIST_ITEM_PRIORITY_OFFSET = -1
+
+# Bare URL results followed before deciding whether a job is a playlist
+MAX_URL_REDIRECTS = 3
+
+
+class Download(JobRecord):
     """Download tracking object"""
 
-    def __init__(self, download_id: str, url: str, quality: AudioQuality = DEFAULT_QUALITY):
+    __slots__ = (
+        "id", "url", "quality", "priority", "position", "queue_id", "status", "progress",
+        "video_title", "file_path", "error", "created_at", "speed_bps", "eta_seconds",
+        "cancel_event", "ffmpeg_process",
+        "temp_files", "downloaded_bytes", "parent_id", "child_ids",
+    )
+
+    SNAPSHOT_FIELDS = frozenset((
+        "id", "url", "status", "progress", "video_title", "file_path", "error", "created_at",
+        "speed_bps", "eta_seconds", "parent_id", "child_ids", "priority", "position", "queue_id",
+    ))
+
+    def __init__(self, download_id: str, url: str, quality: AudioQuality = DEFAULT_QUALITY,
+                 priority: int = 0, position: Optional[int] = None, queue_id: Optional[int] = None):
+        super().__init__()
         self.id = download_id
         self.url = url
         self.quality = quality
+        self.priority = priority  # Higher runs first
+        self.position = position  # Order within a priority (None = FIFO ahead of positioned jobs)
+        self.queue_id = queue_id  # Linked download_queue row, if any
         self.status = "pending"  # pending, downloading, converting, completed, failed, cancelled
         self.progress = 0  # 0-100
         self.video_title = None
         self.file_path = None
         self.error = None
         self.created_at = datetime.now()
-        self.speed = None
-        self.eta = None
+        self.speed_bps: Optional[float] = None  # Raw numbers - formatted only for display
+        self.eta_seconds: Optional[int] = None
+        self.cancel_event = threading.Event()  # Checked by yt-dlp hooks for cooperative cancellation
+        self.ffmpeg_process = None  # Running FFmpeg encode (killed on cancel)
+        self.temp_files = set()  # Files yt-dlp wrote for this job (for cleanup on cancel)
+        self.downloaded_bytes = 0  # Last reported byte count (for throughput measurement)
+        self.parent_id: Optional[str] = None  # Playlist parent (set on playlist items)
+        self.child_ids: List[str] = []  # Playlist items (set on playlist parents; re-assign, don't mutate)
+
+    def reset_for_retry(self):
+        """Return a failed/cancelled job to its initial pending state"""
+        self.status = "pending"
+        self.progress = 0
+        self.file_path = None
+        self.error = None
+        self.speed_bps = None
+        self.eta_seconds = None
+        self.cancel_event = threading.Event()
+        self.ffmpeg_process = None
+        self.temp_files = set()
+        self.downloaded_bytes = 0
+
+    @property
+    def speed(self) -> Optional[str]:
+        """Transfer rate for display, e.g. "1.23 MB/s" """
+        return format_speed(self.speed_bps)
 
-    def to_dict(self):
-        """Convert to dictionary"""
+    @property
+    def eta(self) -> Optional[str]:
+        """Remaining time for display, e.g. "01:30" """
+        return format_eta(self.eta_seconds)
+
+    def _build_snapshot(self):
         return {
             "id": self.id,
             "url": self.url,
@@ -51,29 +142,67 @@ class Download:
             "created_at": self.created_at.isoformat(),
             "speed": self.speed,
             "eta": self.eta,
+            "speed_bps": self.speed_bps,
+            "eta_seconds": self.eta_seconds,
+            "parent_id": self.parent_id,
+            "child_ids": self.child_ids,
+            "priority": self.priority,
+            "position": self.position,
+            "queue_id": self.queue_id,
         }
 
 
 class DownloadService:
     """Service for managing downloads with thread-safe job queue (TTS pattern)"""
 
-    def __init__(self, output_dir: str = "./music", max_workers: int = 3):
+    def __init__(self, output_dir: str = "./music", max_workers: int = 3, auto_scale: bool = False):
         # Convert to absolute path to ensure compatibility with AudioPlayer
         self.output_dir = os.path.abspath(output_dir)
         self.active_downloads: Dict[str, Download] = {}
         self.websocket_manager = None  # Will be injected
+        self.loop: Optional[asyncio.AbstractEventLoop] = None  # Server event loop, injected at startup
         self.db_manager = get_database_manager()
+        self.metadata_cache = get_metadata_cache()
+        # One store next to the database, shared by every output directory
+        self.media_store = MediaStore(
+            os.path.join(os.path.dirname(os.path.abspath(self.db_manager.db_path)), MEDIA_STORE_DIR)
+        )
 
-        # Thread-safe job queue (TTS pattern)
-        self.job_queue = queue.Queue()
+        # Thread-safe priority job queue (priority, position, enqueue order)
+        self.job_queue = PriorityJobQueue()
         self.downloads_lock = threading.Lock()  # Protect active_downloads dict
         self.shutdown_event = threading.Event()
 
-        # Worker threads for processing downloads
-        self.max_workers = max_workers
+        # Job state is written through to download_queue so it survives restarts;
+        # a single writer thread keeps status updates in order without blocking callers
+        self._state_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DownloadStateWriter")
+
+        # Worker threads for processing downloads (resizable at runtime)
+        self.max_workers = max(1, max_workers)
         self.workers = []
+        self.workers_lock = threading.Lock()
+        self._worker_ids = itertools.count()
         self._start_workers()
 
+        # Throughput-based auto-scaling
+        self.auto_scale = False
+        self._autoscaler = None
+        self._bytes_downloaded = 0  # Aggregate counter, read by the autoscaler
+        self._bytes_lock = threading.Lock()
+        if auto_scale:
+            self.set_auto_scale(True)
+
+        # Bounded retention of finished jobs: top-level job id -> finish time
+        # (playlist items are evicted together with their parent)
+        self.finished_retention = FINISHED_JOB_RETENTION
+        self.max_finished_jobs = MAX_FINISHED_JOBS
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._finished_lock = threading.Lock()
+
+        # Duplicate detection: (canonical video URL, quality) -> latest single-video job
+        # (guarded by downloads_lock)
+        self._jobs_by_video: Dict[Tuple[str, str], str] = {}
+
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
 
@@ -84,28 +213,236 @@ class DownloadService:
         logger.info(f"Download output directory set to: {self.output_dir}")
 
     def _start_workers(self):
-        """Start worker threads for processing download jobs (TTS pattern)"""
-        for i in range(self.max_workers):
-            worker = threading.Thread(
-                target=self._worker_loop,
-                name=f"DownloadWorker-{i}",
+        """Start worker threads up to max_workers (TTS pattern)"""
+        started = 0
+        with self.workers_lock:
+            while len(self.workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"DownloadWorker-{next(self._worker_ids)}",
+                    daemon=True
+                )
+                self.workers.append(worker)
+                worker.start()
+                started += 1
+        if started:
+            logger.info(f"Started {started} download worker threads ({self.max_workers} total)")
+
+    def _retire_if_excess(self) -> bool:
+        """Let the calling worker exit if the pool was shrunk"""
+        with self.workers_lock:
+            if len(self.workers) > self.max_workers:
+                self.workers.remove(threading.current_thread())
+                return True
+        return False
+
+    def set_max_workers(self, max_workers: int):
+        """
+        Resize the worker pool at runtime. Growing starts threads immediately;
+        shrinking lets surplus workers exit after their current job.
+        """
+        max_workers = max(1, int(max_workers))
+        if max_workers == self.max_workers:
+            return
+        self.max_workers = max_workers
+        self._start_workers()
+        logger.info(f"Download worker pool resized to {max_workers}")
+
+    def set_auto_scale(self, enabled: bool):
+        """Enable/disable throughput-based worker pool sizing"""
+        self.auto_scale = enabled
+        if enabled and (self._autoscaler is None or not self._autoscaler.is_alive()):
+            self._autoscaler = threading.Thread(
+                target=self._autoscale_loop,
+                name="DownloadAutoscaler",
                 daemon=True
             )
-            worker.start()
-            self.workers.append(worker)
-        logger.info(f"Started {self.max_workers} download worker threads")
+            self._autoscaler.start()
+            logger.info("Download worker auto-scaling enabled")
+
+    def _autoscale_loop(self):
+        """
+        Hill-climb the worker count on measured aggregate throughput: keep
+        stepping in the same direction while bytes/sec improves, reverse
+        when it drops, hold while it is steady. Only acts while jobs are waiting.
+        """
+        last_bytes = self._bytes_downloaded
+        last_rate = None
+        direction = 1
+
+        while not self.shutdown_event.wait(AUTOSCALE_INTERVAL):
+            if not self.auto_scale:
+                break
+
+            total_bytes = self._bytes_downloaded
+            rate = (total_bytes - last_bytes) / AUTOSCALE_INTERVAL
+            last_bytes = total_bytes
+
+            if self.job_queue.qsize() == 0:
+                last_rate = None  # No backlog - nothing to learn from this interval
+                continue
+
+            step, direction = _scale_step(rate, last_rate, direction)
+            last_rate = rate
+
+            target = min(max(self.max_workers + step, MIN_AUTO_WORKERS), MAX_AUTO_WORKERS)
+            if target != self.max_workers:
+                logger.info(f"Auto-scaling downloads: {rate / 1024:.0f} KB/s -> {target} workers")
+                self.set_max_workers(target)
+
+        logger.info("Download worker auto-scaling stopped")
+
+    def set_retention(self, max_finished_jobs: Optional[int] = None,
+                      retention_seconds: Optional[float] = None):
+        """Change how many finished jobs are kept in memory, and for how long"""
+        if max_finished_jobs is not None:
+            self.max_finished_jobs = max(0, int(max_finished_jobs))
+        if retention_seconds is not None:
+            self.finished_retention = max(0, retention_seconds)
+        self.evict_finished()
+
+    def _track_finished(self, download: Download):
+        """Record when a top-level job reached (or left) a terminal state"""
+        if download.parent_id:
+            return
+        with self._finished_lock:
+            if download.status in TERMINAL_STATUSES:
+                self._finished[download.id] = time.monotonic()
+                self._finished.move_to_end(download.id)
+            else:
+                self._finished.pop(download.id, None)  # Retried
+
+    def evict_finished(self) -> int:
+        """
+        Drop finished jobs beyond the count bound or older than the retention
+        period from memory. Their final state stays in download_queue.
+
+        Returns:
+            Number of jobs removed (including playlist items)
+        """
+        now = time.monotonic()
+        expired = []
+        with self._finished_lock:
+            while self._finished:
+                download_id, finished_at = next(iter(self._finished.items()))
+                if (len(self._finished) <= self.max_finished_jobs
+                        and now - finished_at < self.finished_retention):
+                    break
+                del self._finished[download_id]
+                expired.append(download_id)
+
+        if not expired:
+            return 0
+
+        removed = 0
+        with self.downloads_lock:
+            for download_id in expired:
+                download = self.active_downloads.get(download_id)
+                if not download or download.status not in TERMINAL_STATUSES:
+                    continue
+                if any(
+                    self.active_downloads[cid].status not in TERMINAL_STATUSES
+                    for cid in download.child_ids if cid in self.active_downloads
+                ):
+                    continue  # An item is being retried
+                for child_id in download.child_ids:
+                    child = self.active_downloads.pop(child_id, None)
+                    if child:
+                        self._unindex_job(child)
+                        removed += 1
+                del self.active_downloads[download_id]
+                self._unindex_job(download)
+                removed += 1
+
+        if removed:
+            logger.debug(f"Evicted {removed} finished download job(s) from memory")
+        return removed
+
+    def _index_job(self, download: Download):
+        """Make a single-video job the target for duplicates of its URL and quality (caller holds downloads_lock)"""
+        key = _dedup_key(download.url, download.quality)
+        if key:
+            self._jobs_by_video[key] = download.id
+
+    def _unindex_job(self, download: Download):
+        """Forget an evicted job (caller holds downloads_lock)"""
+        key = _dedup_key(download.url, download.quality)
+        if key and self._jobs_by_video.get(key) == download.id:
+            del self._jobs_by_video[key]
+
+    def find_active_duplicate(self, url: str, quality: AudioQuality = DEFAULT_QUALITY) -> Optional[Download]:
+        """Unfinished job for the same video and quality, if any - thread-safe, O(1)"""
+        key = _dedup_key(url, quality)
+        if not key:
+            return None
+        with self.downloads_lock:
+            download = self.active_downloads.get(self._jobs_by_video.get(key))
+            if download and download.status not in TERMINAL_STATUSES:
+                return download
+        return None
+
+    async def find_duplicates(self, requests: List[Tuple[str, AudioQuality]]) -> List[Optional[Download]]:
+        """
+        Existing result for each (url, quality): the unfinished job for the same
+        video and quality, otherwise a completed job for a history file of that
+        quality that still exists on disk
+        """
+        results = [self.find_active_duplicate(url, quality) for url, quality in requests]
+
+        keys = [_dedup_key(url, quality) for url, quality in requests]
+        video_ids = [
+            extract_video_id(key[0]) for key, found in zip(keys, results)
+            if found is None and key
+        ]
+        if not video_ids:
+            return results
+
+        rows = await self.db_manager.find_completed_downloads(video_ids)
+        reused: Dict[Tuple[str, str], Download] = {}
+        for index, (url, quality) in enumerate(requests):
+            if results[index] is not None or not keys[index]:
+                continue
+            row_key = (extract_video_id(keys[index][0]), quality)
+            if row_key in reused:
+                results[index] = reused[row_key]
+                continue
+            row = rows.get(row_key)
+            if row and row.get('file_path') and os.path.exists(row['file_path']):
+                results[index] = reused[row_key] = self._completed_from_history(url, quality, row)
+        return results
+
+    def _completed_from_history(self, url: str, quality: AudioQuality, row: Dict) -> Download:
+        """Register an already-completed job pointing at an existing history file"""
+        download = Download(str(uuid.uuid4()), url, quality)
+        download.video_title = row.get('video_title')
+        download.file_path = row['file_path']
+        download.status = "completed"
+        download.progress = 100
+        with self.downloads_lock:
+            self.active_downloads[download.id] = download
+        self._track_finished(download)
+        logger.info(f"Reusing downloaded file for {url}: {download.file_path}")
+        return download
 
     def _worker_loop(self):
         """Worker thread main loop - processes jobs from queue (TTS pattern)"""
         while not self.shutdown_event.is_set():
+            if self._retire_if_excess():
+                return
             try:
                 # Get job from queue with timeout to check shutdown periodically
                 download = self.job_queue.get(timeout=1)
 
-                # Process the download
-                asyncio.run(self._download_worker(download))
+                # Skip jobs cancelled while still queued
+                if download.cancel_event.is_set():
+                    self.job_queue.task_done()
+                    continue
+
+                # Process the download (blocking) - events go to the server loop
+                self._download_worker(download)
 
                 self.job_queue.task_done()
+                self.evict_finished()
             except queue.Empty:
                 continue  # Timeout - check shutdown and loop again
             except Exception as e:
@@ -117,28 +454,75 @@ class DownloadService:
         self.shutdown_event.set()
 
         # Wait for all workers to finish
-        for worker in self.workers:
+        with self.workers_lock:
+            workers = list(self.workers)
+        for worker in workers:
             worker.join(timeout=5)
 
+        # Flush pending job state writes
+        self._state_writer.shutdown(wait=True)
+
         logger.info("Download service shutdown complete")
 
     def set_websocket_manager(self, manager):
         """Inject WebSocket manager for progress updates"""
         self.websocket_manager = manager
 
+    def set_event_loop(self, loop: asyncio.AbstractEventLoop):
+        """Inject the server event loop that owns the WebSocket connections"""
+        self.loop = loop
+
     async def broadcast_progress(self, download_id: str, message: dict):
         """Broadcast progress update via WebSocket"""
         if self.websocket_manager:
             await self.websocket_manager.broadcast(download_id, message)
 
-    async def start_download(self, url: str, quality: AudioQuality = DEFAULT_QUALITY) -> Download:
-        """Start a new download - adds to thread-safe queue (TTS pattern)"""
+    def _emit(self, download_id: str, message: dict):
+        """Schedule a broadcast on the server event loop (safe from worker threads)"""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.broadcast_progress(download_id, message), loop)
+
+    async def start_download(self, url: str, quality: AudioQuality = DEFAULT_QUALITY, priority: int = 0,
+                             position: Optional[int] = None, queue_id: Optional[int] = None,
+                             force: bool = False) -> Download:
+        """
+        Start a new download - adds to thread-safe priority queue
+        Unless force is set, a video that is already being downloaded returns
+        that job, and one whose downloaded file still exists returns a
+        completed job for it.
+        """
+        if not force and queue_id is None:
+            existing = (await self.find_duplicates([(url, quality)]))[0]
+            if existing:
+                return existing
+
         download_id = str(uuid.uuid4())
-        download = Download(download_id, url, quality)
+        download = Download(download_id, url, quality, priority, position, queue_id)
+
+        # Write through to download_queue before the job can start
+        try:
+            if queue_id is None:
+                added = await self.db_manager.add_queue_jobs([{
+                    'url': url,
+                    'video_id': extract_video_id(url),
+                    'priority': priority,
+                    'position': position,
+                    'job_id': download_id,
+                    'quality': quality,
+                }])
+                # Schedule by the position the queue row got, like GET /api/queue lists it
+                download.queue_id, download.position = added[0]
+            else:
+                await self.db_manager.link_queue_job(queue_id, download_id, quality)
+        except Exception as e:
+            logger.error(f"Failed to persist download {download_id} to queue: {e}")
 
         # Thread-safe: Store in active downloads with lock
         with self.downloads_lock:
             self.active_downloads[download_id] = download
+            self._index_job(download)
 
         # Add to job queue - worker threads will process it
         self.job_queue.put(download)
@@ -146,25 +530,169 @@ class DownloadService:
         logger.info(f"Queued download {download_id} for {url} (queue size: {self.job_queue.qsize()})")
         return download
 
-    async def _download_worker(self, download: Download):
-        """Background worker that performs the actual download"""
+    async def start_downloads(self, requests: List[Dict], force: bool = False) -> List[Download]:
+        """
+        Start many downloads at once - their queue rows are written in one transaction
+        Each request is {'url', 'quality', 'priority'}; positions are assigned in bulk.
+        Duplicates resolve like in start_download (also within the batch).
+        Returns one job per request, in order.
+        """
+        if not requests:
+            return []
+
+        pairs = [(req['url'], req.get('quality', DEFAULT_QUALITY)) for req in requests]
+        results: List[Optional[Download]] = [None] * len(requests) if force else await self.find_duplicates(pairs)
+
+        downloads = []
+        batch_jobs: Dict[Tuple[str, str], Download] = {}
+        for index, (url, quality) in enumerate(pairs):
+            if results[index] is not None:
+                continue
+            key = None if force else _dedup_key(url, quality)
+            if key and key in batch_jobs:
+                results[index] = batch_jobs[key]
+                continue
+            download = Download(str(uuid.uuid4()), url, quality, requests[index].get('priority', 0))
+            results[index] = download
+            downloads.append(download)
+            if key:
+                batch_jobs[key] = download
+
+        if not downloads:
+            return results
+
+        added = await self.db_manager.add_queue_jobs([{
+            'url': download.url,
+            'video_id': extract_video_id(download.url),
+            'priority': download.priority,
+            'job_id': download.id,
+            'quality': download.quality,
+        } for download in downloads])
+
+        with self.downloads_lock:
+            for download, (queue_id, position) in zip(downloads, added):
+                download.queue_id = queue_id
+                download.position = position  # Bulk-assigned after existing queue items
+                self.active_downloads[download.id] = download
+                self._index_job(download)
+
+        for download in downloads:
+            self.job_queue.put(download)
+
+        logger.info(f"Queued {len(downloads)} downloads (queue size: {self.job_queue.qsize()})")
+        return results
+
+    def _complete_from_store(self, download: Download, ydl: yt_dlp.YoutubeDL, info: dict) -> bool:
+        """
+        Finish a job from the media store if this video was already encoded at
+        the requested quality: the stored file is linked into the output dir
+        under the name yt-dlp would have used.
+
+        Returns:
+            True if the job was completed from the store
+        """
+        video_id = info.get('id')
+        if not video_id or info.get('_type', 'video') != 'video':
+            return False
+        blob_path = self.media_store.find(video_id, 'mp3', download.quality)
+        if not blob_path:
+            return False
+
+        target = os.path.splitext(ydl.prepare_filename({**info, 'ext': 'mp3'}))[0] + '.mp3'
+        try:
+            self.media_store.materialize(blob_path, target)
+        except OSError as e:
+            logger.warning(f"Could not reuse stored media for {download.url}: {e}")
+            return False
+
+        download.video_title = info.get('title') or download.video_title
+        download.file_path = target
+        self._complete(download, info, blob_path)
+        return True
+
+    def _complete(self, download: Download, info: dict, blob_path: Optional[str]):
+        """Mark a job completed, record it in history and broadcast the result"""
+        download.status = "completed"
+        download.progress = 100
+
+        # Get file size
+        file_size = None
+        if os.path.exists(download.file_path):
+            file_size = os.path.getsize(download.file_path)
+
+        # Save to database
+        try:
+            video_info = {
+                'title': download.video_title,
+                'file_name': os.path.basename(download.file_path),
+                'file_path': download.file_path,
+                'format': 'mp3',
+                'url': download.url,
+                'file_size': file_size,
+                'duration': info.get('duration'),
+                'channel_name': info.get('uploader'),
+                'channel_url': info.get('channel_url') or info.get('uploader_url'),
+                'video_id': info.get('id', ''),
+                'blob_path': blob_path,
+                'quality': download.quality,
+            }
+            # Already on a worker thread - use the sync API directly
+            self.db_manager._add_download_sync(video_info)
+            logger.info(f"Download saved to database: {download.video_title}")
+        except Exception as e:
+            logger.error(f"Failed to save download to database: {e}")
+
+        self._persist_state(download)
+        self._emit(download.id, {
+            "type": "completed",
+            "status": "completed",
+            "progress": 100,
+            "file_path": download.file_path,
+            "message": "Download completed!"
+        })
+        self._update_parent(download)
+
+        logger.info(f"Download {download.id} completed: {download.file_path}")
+
+    def _download_worker(self, download: Download):
+        """Perform the actual download (runs on a worker thread)"""
         try:
             download.status = "downloading"
-            await self.broadcast_progress(download.id, {
+            self._persist_state(download)
+            self._emit(download.id, {
                 "type": "status",
                 "status": "downloading",
                 "message": "Starting download..."
             })
 
-            # Get the event loop for progress hook
-            loop = asyncio.get_event_loop()
+            # Last emitted progress event (for coalescing yt-dlp's callbacks)
+            last_emit_at = 0.0
+            last_emit_progress = None
+            min_interval = 1.0 / PROGRESS_EVENTS_PER_SECOND
 
             # Progress hook for yt-dlp
             def progress_hook(d):
+                nonlocal last_emit_at, last_emit_progress
+
+                # Track files for cleanup (final name, .part name)
+                for key in ('filename', 'tmpfilename'):
+                    if d.get(key):
+                        download.temp_files.add(d[key])
+
+                # Cooperative cancellation - aborts the transfer
+                if download.cancel_event.is_set():
+                    raise yt_dlp.utils.DownloadCancelled()
+
                 if d['status'] == 'downloading':
                     # Extract progress
                     try:
                         downloaded = d.get('downloaded_bytes', 0)
+
+                        # Feed the aggregate throughput counter
+                        if downloaded and downloaded > download.downloaded_bytes:
+                            with self._bytes_lock:
+                                self._bytes_downloaded += downloaded - download.downloaded_bytes
+                            download.downloaded_bytes = downloaded
                         # Try total_bytes first, then estimate
                         total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
 
@@ -177,150 +705,499 @@ class DownloadService:
                         else:
                             progress = download.progress  # Keep current
 
-                        download.progress = min(progress, 99)  # Cap at 99 until complete
-
-                        # Extract and format speed (ensure 2 decimal places)
-                        speed_raw = d.get('speed')  # Bytes per second
-                        if speed_raw and isinstance(speed_raw, (int, float)):
-                            if speed_raw >= 1024 * 1024:
-                                speed = f"{speed_raw / (1024 * 1024):.2f} MB/s"
-                            elif speed_raw >= 1024:
-                                speed = f"{speed_raw / 1024:.2f} KB/s"
-                            else:
-                                speed = f"{speed_raw:.0f} B/s"
-                        else:
-                            speed = d.get('_speed_str', 'N/A')
+                        progress = min(progress, 99)  # Cap at 99 until complete
+                        if progress != download.progress:
+                            download.progress = progress
 
-                        eta = d.get('_eta_str', 'N/A')
+                        # Coalesce: fragmented streams call back hundreds of times per
+                        # second - drop samples until the percentage moves or the
+                        # interval has passed (the next sample carries the latest state)
+                        now = time.monotonic()
+                        if download.progress == last_emit_progress and now - last_emit_at < min_interval:
+                            return
+                        last_emit_at = now
+                        last_emit_progress = download.progress
 
-                        download.speed = speed
-                        download.eta = eta
+                        # Raw numbers only - display strings are built by the consumers
+                        speed = d.get('speed')  # Bytes per second
+                        eta = d.get('eta')  # Seconds
+                        download.speed_bps = round(speed) if isinstance(speed, (int, float)) else None
+                        download.eta_seconds = int(eta) if isinstance(eta, (int, float)) else None
 
-                        # Broadcast progress from executor thread to event loop
-                        asyncio.run_coroutine_threadsafe(
-                            self.broadcast_progress(download.id, {
-                                "type": "progress",
-                                "progress": download.progress,
-                                "speed": speed,
-                                "eta": eta
-                            }),
-                            loop
-                        )
+                        self._emit(download.id, {
+                            "type": "progress",
+                            "progress": download.progress,
+                            "speed_bps": download.speed_bps,
+                            "eta_seconds": download.eta_seconds,
+                        })
+                        self._update_parent(download)
 
                     except Exception as e:
                         logger.error(f"Error parsing progress: {e}")
 
                 elif d['status'] == 'finished':
                     download.status = "converting"
-                    asyncio.run_coroutine_threadsafe(
-                        self.broadcast_progress(download.id, {
-                            "type": "status",
-                            "status": "converting",
-                            "message": "Converting to MP3..."
-                        }),
-                        loop
-                    )
-
-            # yt-dlp options
+                    self._emit(download.id, {
+                        "type": "status",
+                        "status": "converting",
+                        "message": "Converting to MP3..."
+                    })
+
+            # Postprocessor hook - stops before/after FFmpeg runs if cancelled
+            def postprocessor_hook(d):
+                filepath = d.get('info_dict', {}).get('filepath')
+                if filepath:
+                    download.temp_files.add(filepath)
+                if download.cancel_event.is_set():
+                    raise yt_dlp.utils.DownloadCancelled()
+
+            # yt-dlp options (FFmpegExtractAudio is added below - cancellable)
             ydl_opts = {
                 'format': 'bestaudio/best',
                 'outtmpl': os.path.join(self.output_dir, '%(title)s [%(id)s].%(ext)s'),
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': download.quality,
-                }],
                 'progress_hooks': [progress_hook],
+                'postprocessor_hooks': [postprocessor_hook],
+                'continuedl': True,  # Resume .part files of interrupted jobs
                 'quiet': True,
                 'no_warnings': True,
             }
 
-            # Perform download
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract info first to get title
-                info = ydl.extract_info(download.url, download=False)
-                download.video_title = info.get('title', 'Unknown')
-
-                # Broadcast title
-                await self.broadcast_progress(download.id, {
+            # Show the title right away if we have seen this URL before
+            cached = self.metadata_cache.get(download.url)
+            if cached and cached.get('_type') == 'playlist' and cached.get('entries'):
+                # Playlist seen recently - fan out without touching the network
+                self._expand_playlist(download, cached)
+                return
+            if cached and cached.get('title'):
+                download.video_title = cached['title']
+                self._emit(download.id, {
                     "type": "info",
                     "video_title": download.video_title
                 })
 
-                # Download
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: ydl.download([download.url])
-                )
+            # Perform download
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.add_post_processor(CancellableExtractAudioPP(
+                    download, preferredcodec='mp3', preferredquality=download.quality
+                ))
+
+                # Encoded before at this quality - link it without touching the network
+                if cached and self._complete_from_store(download, ydl, cached):
+                    return
+
+                # Extract info once (unprocessed) to get the title early;
+                # the same info dict is then processed and downloaded below,
+                # so the page/player responses are only fetched one time
+                info = ydl.extract_info(download.url, download=False, process=False)
+                info = self._resolve_url_result(ydl, info)
+
+                # Playlists fan out into one job per video (entries are unresolved here)
+                if info.get('_type') in ('playlist', 'multi_video'):
+                    self._expand_playlist(download, info)
+                    return
 
-            # Download completed
-            download.status = "completed"
-            download.progress = 100
+                title = info.get('title') or download.video_title or 'Unknown'
+
+                # Broadcast title (unless the cached one already matched)
+                if title != download.video_title:
+                    download.video_title = title
+                    self._emit(download.id, {
+                        "type": "info",
+                        "video_title": download.video_title
+                    })
+
+                if self._complete_from_store(download, ydl, info):
+                    return
+
+                # Download (blocking - we are already on a worker thread)
+                info = ydl.process_ie_result(info, download=True)
+                download.video_title = info.get('title') or download.video_title
+
+            try:
+                self.metadata_cache.put(info)
+            except Exception as e:
+                logger.warning(f"Could not cache metadata for {download.url}: {e}")
+
+            # Cancelled while the last postprocessor was finishing
+            if download.cancel_event.is_set():
+                raise yt_dlp.utils.DownloadCancelled()
 
-            # Find the downloaded file using yt-dlp's sanitized filename
             video_id = info.get('id', '')
 
-            # Use yt-dlp's prepare_filename to get the actual sanitized filename
-            info['ext'] = 'mp3'  # Set extension for prepare_filename
-            prepared_path = ydl.prepare_filename(info)
-            # The extension might be different, ensure it's .mp3
-            base_path = os.path.splitext(prepared_path)[0]
-            download.file_path = base_path + '.mp3'
+            # Final path after FFmpegExtractAudio, as reported by yt-dlp
+            requested = info.get('requested_downloads') or [{}]
+            download.file_path = requested[0].get('filepath')
+
+            if not download.file_path:
+                # Use yt-dlp's prepare_filename to get the actual sanitized filename
+                info['ext'] = 'mp3'  # Set extension for prepare_filename
+                prepared_path = ydl.prepare_filename(info)
+                # The extension might be different, ensure it's .mp3
+                base_path = os.path.splitext(prepared_path)[0]
+                download.file_path = base_path + '.mp3'
 
             # If file doesn't exist, try to find it by video ID pattern
             if not os.path.exists(download.file_path):
-                import glob
                 pattern = os.path.join(self.output_dir, f'*[{video_id}].mp3')
                 matches = glob.glob(pattern)
                 if matches:
                     download.file_path = matches[0]
                     logger.info(f"Found file by pattern: {download.file_path}")
 
-            # Get file size
-            file_size = None
-            if os.path.exists(download.file_path):
-                file_size = os.path.getsize(download.file_path)
+            # Keep the encoded file for later requests of the same video/quality
+            blob_path = self.media_store.ingest(download.file_path, video_id, 'mp3', download.quality)
 
-            # Save to database
-            try:
-                video_info = {
-                    'title': download.video_title,
-                    'file_name': os.path.basename(download.file_path),
-                    'file_path': download.file_path,
-                    'format': 'mp3',
-                    'url': download.url,
-                    'file_size': file_size,
-                    'duration': info.get('duration'),
-                    'channel_name': info.get('uploader'),
-                    'channel_url': info.get('channel_url') or info.get('uploader_url'),
-                    'video_id': video_id,
-                }
-                await self.db_manager.add_download(video_info)
-                logger.info(f"Download saved to database: {download.video_title}")
-            except Exception as e:
-                logger.error(f"Failed to save download to database: {e}")
-
-            await self.broadcast_progress(download.id, {
-                "type": "completed",
-                "status": "completed",
-                "progress": 100,
-                "file_path": download.file_path,
-                "message": "Download completed!"
-            })
+            self._complete(download, info, blob_path)
 
-            logger.info(f"Download {download.id} completed: {download.file_path}")
+        except yt_dlp.utils.DownloadCancelled:
+            self._finish_cancelled(download)
 
         except Exception as e:
+            if download.cancel_event.is_set():
+                # Errors raised while tearing down a cancelled transfer
+                self._finish_cancelled(download)
+                return
+
             logger.exception(f"Download {download.id} failed: {e}")
             download.status = "failed"
             download.error = str(e)
+            self._persist_state(download)
 
-            await self.broadcast_progress(download.id, {
+            self._emit(download.id, {
                 "type": "error",
                 "status": "failed",
                 "error": str(e),
                 "message": f"Download failed: {str(e)}"
             })
+            self._update_parent(download)
+
+    @staticmethod
+    def _resolve_url_result(ydl: yt_dlp.YoutubeDL, info: dict) -> dict:
+        """
+        Follow bare URL results without processing them. A watch?v=X&list=Y
+        URL extracts to {'_type': 'url'} pointing at the playlist, which
+        process_ie_result would otherwise download serially in one job.
+        """
+        for _ in range(MAX_URL_REDIRECTS):
+            if info.get('_type') != 'url' or not info.get('url'):
+                break
+            info = ydl.extract_info(info['url'], download=False, process=False,
+                                    ie_key=info.get('ie_key'))
+        return info
+
+    def _expand_playlist(self, parent: Download, info: dict):
+        """
+        Turn a playlist job into one child job per entry. Children share the
+        parent's id and are scheduled across all workers; the parent only
+        reports aggregate progress from then on.
+        """
+        if parent.cancel_event.is_set():
+            raise yt_dlp.utils.DownloadCancelled()
+
+        entries = [entry for entry in (info.get('entries') or []) if entry]
+        try:
+            self.metadata_cache.put({**info, 'entries': entries})
+        except Exception as e:
+            logger.warning(f"Could not cache playlist metadata for {parent.url}: {e}")
+
+        children = []
+        for index, entry in enumerate(entries):
+            url = entry.get('url') or entry.get('webpage_url')
+            if not url and entry.get('id'):
+                url = f"https://www.youtube.com/watch?v={entry['id']}"
+            if not url:
+                continue
+            child = Download(
+                str(uuid.uuid4()), url, parent.quality,
+                priority=parent.priority + PLAYLIST_ITEM_PRIORITY_OFFSET,
+                position=index,
+            )
+            child.parent_id = parent.id
+            child.video_title = entry.get('title')
+            children.append(child)
+
+        if not children:
+            raise Exception("Playlist has no downloadable entries")
+
+        # Persist the items before they can start (single transaction)
+        try:
+            added = self.db_manager._add_queue_jobs_sync([{
+                'url': child.url,
+                'video_title': child.video_title,
+                'video_id': extract_video_id(child.url),
+                'priority': child.priority,
+                'position': child.position,
+                'job_id': child.id,
+                'parent_job_id': parent.id,
+                'quality': child.quality,
+            } for child in children])
+            for child, (queue_id, _) in zip(children, added):
+                child.queue_id = queue_id
+        except Exception as e:
+            logger.error(f"Failed to persist playlist items for {parent.id}: {e}")
+
+        with self.downloads_lock:
+            for child in children:
+                self.active_downloads[child.id] = child
+                self._index_job(child)
+            parent.child_ids = [child.id for child in children]
+            parent.video_title = info.get('title') or parent.video_title
+            parent.status = "downloading"
+            parent.progress = 0
+        self._persist_state(parent)
+
+        self._emit(parent.id, {
+            "type": "playlist",
+            "video_title": parent.video_title,
+            "child_ids": parent.child_ids,
+            "total": len(children),
+        })
+
+        for child in children:
+            self.job_queue.put(child)
+
+        logger.info(f"Playlist {parent.id} expanded into {len(children)} jobs")
+
+    def _update_parent(self, child: Download):
+        """Recompute a playlist parent's aggregate progress/status from its children"""
+        if not child.parent_id:
+            return
+
+        with self.downloads_lock:
+            parent = self.active_downloads.get(child.parent_id)
+            if not parent or not parent.child_ids:
+                return
+            children = [self.active_downloads[cid] for cid in parent.child_ids if cid in self.active_downloads]
+            if not children:
+                return
+
+            counts = {status: 0 for status in TERMINAL_STATUSES}
+            progress_sum = 0
+            for item in children:
+                if item.status in counts:
+                    counts[item.status] += 1
+                    progress_sum += 100
+                else:
+                    progress_sum += item.progress
+            total = len(children)
+            finished = sum(counts.values()) == total
+
+            old_status, old_progress = parent.status, parent.progress
+            parent.progress = 100 if finished else min(progress_sum // total, 99)
+            if not finished:
+                parent.status = "downloading"
+                parent.error = None
+            elif counts["completed"]:
+                parent.status = "completed"
+                failed = total - counts["completed"]
+                parent.error = f"{failed} of {total} items did not complete" if failed else None
+            elif counts["cancelled"] == total:
+                parent.status = "cancelled"
+            else:
+                parent.status = "failed"
+                parent.error = "All playlist items failed"
+
+            if parent.status == old_status and parent.progress == old_progress:
+                return
+            if parent.status != old_status:
+                self._persist_state(parent)
+            message = {
+                "type": "progress",
+                "status": parent.status,
+                "progress": parent.progress,
+                "total": total,
+                "completed": counts["completed"],
+                "failed": counts["failed"],
+                "cancelled": counts["cancelled"],
+            }
+            if parent.status != old_status and finished:
+                message["type"] = "completed" if parent.status == "completed" else "status"
+                message["error"] = parent.error
+
+        self._emit(parent.id, message)
+
+    def _persist_state(self, download: Download):
+        """Queue a write of the job's status to its download_queue row (any thread)"""
+        self._track_finished(download)
+        if download.queue_id is None:
+            return
+        status = QUEUE_STATUS.get(download.status, download.status)
+        error, video_title, file_path = download.error, download.video_title, download.file_path
+
+        def write():
+            try:
+                self.db_manager._update_queue_status_sync(
+                    download.queue_id, status, error, video_title, file_path
+                )
+            except Exception as e:
+                logger.error(f"Failed to persist state of download {download.id}: {e}")
+
+        try:
+            self._state_writer.submit(write)
+        except RuntimeError:
+            # Writer already shut down - write inline
+            write()
+
+    def collect_media_garbage(self) -> int:
+        """
+        Delete media store blobs that no history row uses any more (blocking -
+        run off the event loop)
+
+        Returns:
+            Number of blobs deleted
+        """
+        try:
+            references = self.db_manager._get_blob_references_sync()
+        except Exception as e:
+            logger.error(f"Failed to load media store references: {e}")
+            return 0
+        return self.media_store.collect_garbage(references)
+
+    def resume_pending_jobs(self) -> int:
+        """
+        Reload unfinished jobs from download_queue after a restart and queue them
+        again. Interrupted transfers continue from their .part files (continuedl);
+        playlist parents are rebuilt from their items.
+
+        Returns:
+            Number of jobs put back on the queue
+        """
+        try:
+            rows = self.db_manager._get_resumable_jobs_sync()
+        except Exception as e:
+            logger.error(f"Failed to load pending jobs: {e}")
+            return 0
+
+        restored: Dict[str, Download] = {}
+        for row in rows:
+            download = self._download_from_row(row)
+            restored[download.id] = download
+
+        # Rebuild playlist parent -> item links (rows are already in position order)
+        for download in restored.values():
+            parent = restored.get(download.parent_id) if download.parent_id else None
+            if parent:
+                parent.child_ids = parent.child_ids + [download.id]
+
+        with self.downloads_lock:
+            for download_id, download in restored.items():
+                self.active_downloads.setdefault(download_id, download)
+                if not download.child_ids and download.status not in TERMINAL_STATUSES:
+                    self._index_job(download)
+
+        resumed = []
+        for download in restored.values():
+            if download.child_ids:
+                download.status = "downloading"  # Already expanded - progress comes from items
+            elif download.status not in TERMINAL_STATUSES:
+                download.status = "pending"
+                self._persist_state(download)
+                self.job_queue.put(download)
+                resumed.append(download)
+
+        for download in restored.values():
+            if download.child_ids:
+                self._update_parent(restored[download.child_ids[0]])
+
+        if resumed:
+            logger.info(f"Resumed {len(resumed)} download job(s) from the previous session")
+        return len(resumed)
+
+    @staticmethod
+    def _download_from_row(row: Dict) -> Download:
+        """Rebuild a job from its download_queue row"""
+        download = Download(
+            row['job_id'], row['url'], row.get('quality') or DEFAULT_QUALITY,
+            priority=row.get('priority') or 0,
+            position=row.get('position'),
+            queue_id=row['id'],
+        )
+        download.parent_id = row.get('parent_job_id')
+        download.video_title = row.get('video_title')
+        if row['status'] in TERMINAL_STATUSES:
+            download.status = row['status']
+            download.progress = 100 if row['status'] == "completed" else 0
+            download.error = row.get('error_message')
+            download.file_path = row.get('file_path')
+        if row.get('added_at'):
+            try:
+                download.created_at = datetime.fromisoformat(row['added_at'])
+            except (TypeError, ValueError):
+                pass
+        return download
+
+    async def load_download(self, download_id: str) -> Optional[Download]:
+        """
+        Get a job's state, falling back to download_queue for finished jobs
+        that were evicted from memory (a playlist comes back with its items)
+        """
+        download = self.get_download(download_id)
+        if download:
+            return download
+
+        row = await self.db_manager.get_queue_job(download_id)
+        if not row:
+            return None
+        download = self._download_from_row(row)
+        if row['status'] == "processing":
+            # In flight when the server stopped (_download_from_row reports
+            # it as pending so startup resumes it) - not re-queued in memory
+            download.status = "downloading"
+        item_rows = await self.db_manager.get_queue_jobs_by_parent(download_id)
+        download.child_ids = [item['job_id'] for item in item_rows]
+        return download
+
+    def _finish_cancelled(self, download: Download):
+        """Remove partial files and broadcast the final cancelled event"""
+        self._cleanup_partial_files(download)
+        download.status = "cancelled"
+        download.speed_bps = None
+        download.eta_seconds = None
+        self._persist_state(download)
+        self._emit(download.id, {
+            "type": "status",
+            "status": "cancelled",
+            "message": "Download cancelled"
+        })
+        self._update_parent(download)
+        logger.info(f"Download {download.id} cancelled, partial files removed")
+
+    def _cleanup_partial_files(self, download: Download):
+        """
+        Remove temporary and intermediate files of a cancelled download
+        (.part, .ytdl, fragments, the source file before conversion and a
+        half-written .mp3). Same patterns as the desktop Downloader.
+        """
+        # Only a conversion in progress can leave a half-written .mp3 behind;
+        # otherwise an .mp3 with the same name belongs to an earlier download
+        was_converting = download.status == "converting"
+
+        files_to_clean = set()
+        for file_path in download.temp_files:
+            base = file_path[:-len('.part')] if file_path.endswith('.part') else file_path
+            files_to_clean.update({base, base + '.part', base + '.ytdl'})
+            if was_converting:
+                files_to_clean.add(os.path.splitext(base)[0] + '.mp3')
+
+            # Fragment files (e.g. name.part-Frag12) and other variants
+            dir_path = os.path.dirname(base) or '.'
+            base_name = os.path.basename(base)
+            try:
+                for file in os.listdir(dir_path):
+                    if file.startswith(base_name) and ('.part' in file or file.endswith('.ytdl')):
+                        files_to_clean.add(os.path.join(dir_path, file))
+            except OSError as e:
+                logger.warning(f"Could not list directory for cleanup: {e}")
+
+        for file_path in files_to_clean:
+            if os.path.exists(file_path):
+                try:
+                    os.remove(file_path)
+                    logger.info(f"Cleaned up temp file: {os.path.basename(file_path)}")
+                except OSError as e:
+                    logger.error(f"Could not remove {file_path}: {e}")
+
+        download.temp_files.clear()
 
     def get_download(self, download_id: str) -> Optional[Download]:
         """Get download by ID - thread-safe"""
@@ -329,17 +1206,163 @@ class DownloadService:
 
     def get_all_downloads(self):
         """Get all active downloads - thread-safe"""
+        self.evict_finished()
         with self.downloads_lock:
             return list(self.active_downloads.values())
 
-    def cancel_download(self, download_id: str):
-        """Cancel a download - thread-safe"""
+    def cancel_download(self, download_id: str) -> bool:
+        """
+        Cancel a download - thread-safe
+
+        Queued jobs are dropped immediately. Running jobs are stopped by the
+        yt-dlp progress/postprocessor hooks, and a running FFmpeg encode is
+        killed; the worker then removes partial files and broadcasts the
+        final "cancelled" event. Cancelling a
+        playlist parent cancels all of its unfinished items.
+        """
         with self.downloads_lock:
             download = self.active_downloads.get(download_id)
-            if download:
+            if not download or download.status in TERMINAL_STATUSES:
+                return False
+
+            download.cancel_event.set()
+            child_ids = list(download.child_ids)
+
+        # A running encode is stopped now rather than after it finishes
+        if kill_ffmpeg(download):
+            logger.info(f"Stopped FFmpeg of download {download_id}")
+
+        if child_ids:
+            for child_id in child_ids:
+                self.cancel_download(child_id)
+            logger.info(f"Playlist {download_id} cancellation requested")
+            return True
+
+        with self.downloads_lock:
+            was_pending = download.status == "pending"
+            if was_pending:
                 download.status = "cancelled"
-                # TODO: Actually cancel yt-dlp process
-                logger.info(f"Download {download_id} cancelled")
+
+        if was_pending:
+            self._persist_state(download)
+            self._emit(download_id, {
+                "type": "status",
+                "status": "cancelled",
+                "message": "Download cancelled"
+            })
+            self._update_parent(download)
+        logger.info(f"Download {download_id} cancellation requested")
+        return True
+
+    def update_priority(self, download_id: str, priority: Optional[int] = None,
+                        position: Optional[int] = None) -> bool:
+        """
+        Change a job's priority/position - thread-safe
+        Pending work is re-ordered immediately; for a playlist parent the
+        new priority carries over to its items.
+        """
+        with self.downloads_lock:
+            download = self.active_downloads.get(download_id)
+            if not download:
+                return False
+            if priority is not None:
+                download.priority = priority
+            if position is not None:
+                download.position = position
+            children = [
+                self.active_downloads[cid] for cid in download.child_ids
+                if cid in self.active_downloads
+            ]
+            for child in children:
+                child.priority = download.priority + PLAYLIST_ITEM_PRIORITY_OFFSET
+
+        self.job_queue.reprioritize(download)
+        for child in children:
+            self.job_queue.reprioritize(child)
+        logger.info(f"Download {download_id} priority={download.priority} position={download.position}")
+        return True
+
+    def get_download_by_queue_id(self, queue_id: int) -> Optional[Download]:
+        """Find the job linked to a download_queue row - thread-safe"""
+        with self.downloads_lock:
+            for download in self.active_downloads.values():
+                if download.queue_id == queue_id:
+                    return download
+        return None
+
+    def get_downloads_by_queue_ids(self, queue_ids: List[int]) -> Dict[int, Download]:
+        """Find the jobs linked to many download_queue rows in one pass - thread-safe"""
+        wanted = set(queue_ids)
+        with self.downloads_lock:
+            return {
+                download.queue_id: download
+                for download in self.active_downloads.values()
+                if download.queue_id in wanted
+            }
+
+    def retry_download(self, download_id: str) -> int:
+        """
+        Re-queue a failed or cancelled download - thread-safe
+        For a playlist parent, every failed/cancelled item is retried.
+
+        Returns:
+            Number of jobs put back on the queue
+        """
+        with self.downloads_lock:
+            download = self.active_downloads.get(download_id)
+            if not download:
+                return 0
+
+            if download.child_ids:
+                targets = [
+                    self.active_downloads[cid] for cid in download.child_ids
+                    if cid in self.active_downloads
+                    and self.active_downloads[cid].status in ("failed", "cancelled")
+                ]
+            elif download.status in ("failed", "cancelled"):
+                targets = [download]
+            else:
+                targets = []
+
+            for target in targets:
+                target.reset_for_retry()
+                self._index_job(target)
+
+        for target in targets:
+            self._persist_state(target)
+            self.job_queue.put(target)
+            self._emit(target.id, {
+                "type": "status",
+                "status": "pending",
+                "message": "Download queued for retry"
+            })
+            self._update_parent(target)
+
+        if targets:
+            logger.info(f"Retrying {len(targets)} job(s) for download {download_id}")
+        return len(targets)
+
+
+def _scale_step(rate: float, last_rate: Optional[float], direction: int) -> Tuple[int, int]:
+    """
+    One hill-climbing decision for the autoscaler
+
+    Returns:
+        (worker count change, direction to keep exploring in)
+    """
+    if last_rate is None or rate > last_rate * (1 + AUTOSCALE_DEAD_BAND):
+        return direction, direction  # First sample, or the last step paid off
+    if rate < last_rate * (1 - AUTOSCALE_DEAD_BAND):
+        return -direction, -direction  # Real drop - undo the last step
+    return 0, direction  # Steady - keep the current size
+
+
+def _dedup_key(url: str, quality: str) -> Optional[Tuple[str, str]]:
+    """(canonical video URL, quality) used to detect duplicate downloads (None for playlists and unknown URLs)"""
+    if extract_playlist_id(url):
+        return None
+    canonical = normalize_youtube_url(url)
+    return (canonical, quality) if canonical else None
 
 
 def get_download_service() -> DownloadService:
@@ -353,5 +1376,13 @@ def get_download_service() -> DownloadService:
                 from config_manager import get_config_manager
                 config = get_config_manager()
                 output_dir = config.get('output_dir', './music')
-                _download_service = DownloadService(output_dir=output_dir)
+                _download_service = DownloadService(
+                    output_dir=output_dir,
+                    max_workers=config.get('max_download_workers', 3),
+                    auto_scale=config.get('auto_scale_workers', False),
+                )
+                _download_service.set_retention(
+                    max_finished_jobs=config.get('max_finished_jobs', MAX_FINISHED_JOBS),
+                    retention_seconds=config.get('finished_job_retention_minutes', 60) * 60,
+                )
     return _download_service
@@ -0,0 +1,55 @@
+"""
+Job Record
+Slotted base class for download/conversion jobs with a cached, versioned snapshot
+"""
+import abc
+import itertools
+from typing import Any, Dict, FrozenSet
+
+# Process-wide version counter - next() is atomic, so concurrent writers on
+# different threads never hand out the same version
+_versions = itertools.count(1)
+
+
+class JobRecord(abc.ABC):
+    """
+    Base for job records polled by the API and WebSocket snapshots
+
+    Subclasses declare their own __slots__, list the fields that appear in
+    to_dict() in SNAPSHOT_FIELDS and build the dict in _build_snapshot().
+    Assigning one of those fields bumps `version`; to_dict() returns the
+    cached dict until then, so repeated polls allocate nothing. Fields holding
+    mutable containers must be re-assigned (or touch() called) after changes.
+    """
+
+    __slots__ = ("version", "_snapshot")
+
+    SNAPSHOT_FIELDS: FrozenSet[str] = frozenset()
+
+    def __init__(self):
+        object.__setattr__(self, "version", next(_versions))
+        object.__setattr__(self, "_snapshot", None)
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name in self.SNAPSHOT_FIELDS:
+            object.__setattr__(self, "version", next(_versions))
+
+    def touch(self):
+        """Invalidate the snapshot after an in-place change"""
+        object.__setattr__(self, "version", next(_versions))
+
+    @abc.abstractmethod
+    def _build_snapshot(self) -> Dict[str, Any]:
+        """Build the to_dict() payload from the current field values"""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (cached and shared between callers - do not mutate)"""
+        # (version, dict) is swapped in as one attribute so a concurrent
+        # writer can at worst force one extra rebuild, never a stale result
+        version = self.version
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] != version:
+            snapshot = (version, self._build_snapshot())
+            object.__setattr__(self, "_snapshot", snapshot)
+        return snapshot[1]
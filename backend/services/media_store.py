@@ -0,0 +1,175 @@
+"""
+Media Store
+Encoded audio kept once per (video_id, codec, bitrate) and linked into output
+directories, so a repeat download of the same video/quality is a file link
+"""
+import os
+import re
+import sys
+import errno
+import shutil
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional
+
+try:
+    import fcntl  # Linux/macOS only - reflinks are simply skipped elsewhere
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Store directory next to the database - one store for every output directory
+MEDIA_STORE_DIR = "media_store"
+
+# Blobs younger than this are never collected (their history row may not be written yet)
+GC_GRACE_SECONDS = 3600
+
+# ioctl(dest_fd, FICLONE, src_fd): copy-on-write clone (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+_SAFE_KEY = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def _reflink(src: str, dst: str):
+    """Clone src to dst sharing its data blocks (raises OSError where unsupported)"""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflink not supported on this platform")
+    with open(src, 'rb') as source, open(dst, 'xb') as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+        except OSError:
+            dest.close()
+            os.unlink(dst)
+            raise
+
+
+def _clone(src: str, dst: str, allow_copy: bool) -> str:
+    """
+    Make dst share src's data: reflink, then hardlink, then (if allowed) copy
+
+    Returns:
+        The method used ("reflink", "hardlink" or "copy")
+    """
+    try:
+        _reflink(src, dst)
+        return "reflink"
+    except OSError:
+        pass
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        if not allow_copy:
+            raise
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+class MediaStore:
+    """Shared store of encoded downloads (thread-safe, sync - call from worker threads)"""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def blob_path(self, video_id: str, codec: str, bitrate: str) -> Optional[str]:
+        """Store path for a key, e.g. media_store/dQw4w9WgXcQ/mp3-320.mp3 (None for unsafe ids)"""
+        if not (_SAFE_KEY.match(video_id or '') and _SAFE_KEY.match(codec) and _SAFE_KEY.match(str(bitrate))):
+            return None
+        return os.path.join(self.root, video_id, f"{codec}-{bitrate}.{codec}")
+
+    def find(self, video_id: str, codec: str, bitrate: str) -> Optional[str]:
+        """Path of the stored blob for a key, or None"""
+        path = self.blob_path(video_id, codec, bitrate)
+        if path and os.path.isfile(path) and os.path.getsize(path) > 0:
+            return path
+        return None
+
+    def ingest(self, file_path: str, video_id: str, codec: str, bitrate: str) -> Optional[str]:
+        """
+        Add a finished download to the store (reflink, hardlink or - for an
+        output directory on another filesystem - copy)
+
+        Returns:
+            The blob path, or None if it could not be stored
+        """
+        path = self.blob_path(video_id, codec, bitrate)
+        if not path or not os.path.isfile(file_path):
+            return None
+        if os.path.exists(path):
+            return path  # Stored by an earlier or concurrent download
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            method = _clone(file_path, temp, allow_copy=True)
+            os.replace(temp, path)  # A concurrent ingest of the same key stored identical data
+        except OSError as e:
+            logger.warning(f"Could not add {file_path} to the media store {self.root}: {e}")
+            if os.path.exists(temp):
+                os.unlink(temp)
+            return None
+        if method == "copy":
+            logger.info(f"Copied {file_path} into the media store (no links across filesystems)")
+        return path
+
+    def materialize(self, blob: str, target: str) -> str:
+        """
+        Place a stored blob at target (reflink, hardlink or copy). An existing
+        file at target is replaced atomically unless it already is the blob.
+
+        Returns:
+            The method used ("existing", "reflink", "hardlink" or "copy")
+        """
+        if os.path.exists(target) and os.path.samefile(blob, target):
+            return "existing"
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp = f"{target}.{uuid.uuid4().hex[:8]}.tmp"
+        method = _clone(blob, temp, allow_copy=True)
+        try:
+            os.replace(temp, target)
+        except OSError:
+            os.unlink(temp)
+            raise
+        logger.info(f"Linked stored media into {target} ({method})")
+        return method
+
+    def collect_garbage(self, references: Dict[str, List[str]]) -> int:
+        """
+        Delete blobs no longer in use: not referenced by a live history row,
+        or no longer linked anywhere (link count 1) while none of their
+        history rows' files exist
+
+        Args:
+            references: blob path -> file paths of the live history rows using it
+
+        Returns:
+            Number of blobs deleted
+        """
+        removed = 0
+        cutoff = time.time() - GC_GRACE_SECONDS
+        for dir_path, _, files in os.walk(self.root, topdown=False):
+            for name in files:
+                blob = os.path.join(dir_path, name)
+                try:
+                    stat = os.stat(blob)
+                    if stat.st_ctime > cutoff:
+                        continue
+                    file_paths = references.get(blob)
+                    if file_paths and (stat.st_nlink > 1 or any(p and os.path.exists(p) for p in file_paths)):
+                        continue
+                    os.unlink(blob)
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"Could not collect {blob}: {e}")
+            if dir_path != self.root:
+                try:
+                    os.rmdir(dir_path)  # Only succeeds once the video's directory is empty
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"Removed {removed} unused file(s) from the media store")
+        return removed
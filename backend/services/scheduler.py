@@ -0,0 +1,95 @@
+"""
+Priority Job Scheduler
+Thread-safe priority queue feeding the service worker threads
+Drop-in for queue.Queue (put/get/task_done/qsize) with live re-prioritization
+"""
+import queue
+import threading
+import itertools
+import heapq
+import time
+from typing import Any, Dict, List, Optional
+
+
+class PriorityJobQueue:
+    """
+    Heap of pending jobs ordered by (priority DESC, position ASC, enqueue order)
+
+    Jobs must expose `id`, `priority` and `position` attributes. Jobs without a
+    position come first within their priority, in FIFO order. Changing a job's
+    priority/position and calling reprioritize() moves it immediately; stale
+    heap entries are skipped lazily on get().
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}  # job id -> live heap entry
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._unfinished = 0
+
+    @staticmethod
+    def _sort_key(job: Any, seq: int) -> tuple:
+        if job.position is None:
+            return (-job.priority, 0, 0, seq)
+        return (-job.priority, 1, job.position, seq)
+
+    def put(self, job: Any) -> None:
+        """Add (or re-add) a job"""
+        with self._cond:
+            if job.id not in self._entries:
+                self._unfinished += 1
+            self._push(job, next(self._counter))
+            self._cond.notify()
+
+    def _push(self, job: Any, seq: int) -> None:
+        entry = [self._sort_key(job, seq), seq, job]
+        self._entries[job.id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Pop the highest-priority job, waiting up to timeout (raises queue.Empty)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                while self._heap:
+                    entry = heapq.heappop(self._heap)
+                    job = entry[2]
+                    if self._entries.get(job.id) is entry:
+                        del self._entries[job.id]
+                        return job
+                    # Stale entry left behind by reprioritize() - skip it
+
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                    self._cond.wait(remaining)
+
+    def reprioritize(self, job: Any) -> bool:
+        """Re-sort a waiting job after its priority/position changed"""
+        with self._cond:
+            entry = self._entries.get(job.id)
+            if entry is None:
+                return False  # Already running or finished
+            # Keep the original enqueue order as the tie-breaker
+            self._push(job, entry[1])
+            return True
+
+    def task_done(self) -> None:
+        """Mark a job taken with get() as processed"""
+        with self._cond:
+            if self._unfinished <= 0:
+                raise ValueError("task_done() called too many times")
+            self._unfinished -= 1
+
+    def qsize(self) -> int:
+        """Number of jobs waiting to run"""
+        with self._cond:
+            return len(self._entries)
+
+    def empty(self) -> bool:
+        """True when no job is waiting"""
+        return self.qsize() == 0
@@ -0,0 +1,100 @@
+"""Pytest configuration and shared fixtures for the backend"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Backend modules are imported as top-level packages (api, services, database, ...)
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+# Integration script - starts a real server, run it directly: python3 tests/test_backend.py
+collect_ignore = ["test_backend.py"]
+
+
+@pytest.fixture
+def db_manager(tmp_path, monkeypatch):
+    """Fresh DatabaseManager on a temporary file, installed as the global instance"""
+    from database import manager
+    db = manager.DatabaseManager(str(tmp_path / "test.db"))
+    monkeypatch.setattr(manager, "_db_manager", db)
+    return db
+
+
+@pytest.fixture
+def download_service(tmp_path, monkeypatch, db_manager):
+    """
+    DownloadService on temporary storage whose workers are already stopped,
+    so queued jobs are never actually downloaded
+    """
+    from database import metadata_cache
+    from services.download_service import DownloadService
+
+    monkeypatch.setattr(metadata_cache, "_metadata_cache",
+                        metadata_cache.MetadataCache(db_manager))
+
+    service = DownloadService(output_dir=str(tmp_path / "music"), max_workers=1)
+    service.shutdown()
+    return service
+
+
+class FakeYDL:
+    """
+    Stands in for yt_dlp.YoutubeDL (see the fake_ydl fixture)
+
+    extract_info returns a copy of infos[url], or of default_info.
+    process_ie_result runs transfer(ydl, source_path) - which may report
+    progress or raise - and then writes the final mp3 like FFmpegExtractAudio.
+    """
+    default_info = {'_type': 'video', 'id': "aaaaaaaaaaa", 'title': "Song"}
+    infos = {}
+    transfer = None
+    extracted = []  # (url, download, process, ie_key) per extract_info call
+    processed = []  # Info dicts passed to process_ie_result
+
+    def __init__(self, opts=None):
+        self.opts = opts or {}
+        self.postprocessors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=True, process=True, ie_key=None):
+        self.extracted.append((url, download, process, ie_key))
+        return dict(self.infos.get(url, self.default_info))
+
+    def prepare_filename(self, info):
+        return self.opts['outtmpl'] % info
+
+    def add_post_processor(self, pp, when='post_process'):
+        self.postprocessors.append(pp)
+
+    def process_ie_result(self, info, download=True):
+        self.processed.append(info)
+        source = self.prepare_filename({**info, 'ext': "webm"})
+        os.makedirs(os.path.dirname(source), exist_ok=True)
+        if type(self).transfer:
+            type(self).transfer(self, source)
+        path = os.path.splitext(source)[0] + ".mp3"
+        with open(path, "wb") as f:
+            f.write(b"mp3")
+        return {**info, 'requested_downloads': [{'filepath': path}]}
+
+    def progress(self, source, downloaded, total=100, **fields):
+        """Call the progress hooks like a running transfer of `source`"""
+        for hook in self.opts['progress_hooks']:
+            hook({'status': "downloading", 'filename': source, 'tmpfilename': source + ".part",
+                  'downloaded_bytes': downloaded, 'total_bytes': total, **fields})
+
+
+@pytest.fixture
+def fake_ydl(monkeypatch):
+    """A fresh FakeYDL class installed as yt_dlp.YoutubeDL for the download service"""
+    from services import download_service
+    fake = type("FakeYDL", (FakeYDL,), {'infos': {}, 'transfer': None, 'extracted': [], 'processed': []})
+    monkeypatch.setattr(download_service.yt_dlp, "YoutubeDL", fake)
+    return fake
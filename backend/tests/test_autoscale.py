@@ -0,0 +1,31 @@
+"""Tests for the download autoscaler's hill-climbing decision"""
+from services.download_service import _scale_step
+
+
+def test_first_sample_steps_in_current_direction():
+    assert _scale_step(100.0, None, 1) == (1, 1)
+
+
+def test_improvement_keeps_direction():
+    assert _scale_step(150.0, 100.0, 1) == (1, 1)
+    assert _scale_step(150.0, 100.0, -1) == (-1, -1)
+
+
+def test_real_drop_reverses():
+    assert _scale_step(80.0, 100.0, 1) == (-1, -1)
+
+
+def test_steady_rate_holds_worker_count():
+    for rate in (91.0, 100.0, 109.0):
+        assert _scale_step(rate, 100.0, 1) == (0, 1)
+
+
+def test_constant_load_does_not_oscillate():
+    workers, direction, last_rate = 3, 1, None
+    sizes = []
+    for _ in range(10):
+        step, direction = _scale_step(1000.0, last_rate, direction)
+        last_rate = 1000.0
+        workers += step
+        sizes.append(workers)
+    assert sizes[1:] == [sizes[1]] * 9
@@ -0,0 +1,74 @@
+"""Tests for stopping a running FFmpeg encode of a cancelled download"""
+import os
+import stat
+import threading
+import time
+
+import pytest
+from yt_dlp.utils import DownloadCancelled
+
+from services.cancellable_ffmpeg import CancellableExtractAudioPP, kill_ffmpeg
+from services.download_service import Download
+
+
+@pytest.fixture
+def hanging_ffmpeg(tmp_path, monkeypatch):
+    """An ffmpeg on PATH that reports a version and otherwise never finishes"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text(
+        "#!/bin/sh\n"
+        # Version/feature probes answer at once, encodes (with -i) hang
+        'case "$*" in *" -i "*) ;; *) echo "ffmpeg version 6.0 Copyright"; exit 0;; esac\n'
+        'echo "ffmpeg version 6.0" >&2\n'
+        "exec sleep 30\n"  # exec: killing ffmpeg stops the sleep
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    source = tmp_path / "song.webm"
+    source.write_bytes(b"webm")
+    return str(source), str(tmp_path / "song.mp3")
+
+
+def run_encode(download, source, target):
+    """Run the postprocessor's FFmpeg call on a thread; returns (thread, errors)"""
+    errors = []
+
+    def encode():
+        try:
+            CancellableExtractAudioPP(download, preferredcodec='mp3').real_run_ffmpeg(
+                [(source, [])], [(target, [])])
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=encode)
+    thread.start()
+    return thread, errors
+
+
+def test_kill_stops_the_running_encode(hanging_ffmpeg):
+    download = Download("job", "https://youtu.be/aaaaaaaaaaa")
+    thread, errors = run_encode(download, *hanging_ffmpeg)
+
+    deadline = time.monotonic() + 5
+    while download.ffmpeg_process is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    started = time.monotonic()
+    download.cancel_event.set()  # As cancel_download does before killing
+    assert kill_ffmpeg(download)
+    thread.join(5)
+
+    assert not thread.is_alive() and time.monotonic() - started < 5
+    assert [type(e) for e in errors] == [DownloadCancelled]
+    assert download.ffmpeg_process is None
+    assert not kill_ffmpeg(download)
+
+
+def test_encode_started_after_cancel_is_killed(hanging_ffmpeg):
+    download = Download("job", "https://youtu.be/aaaaaaaaaaa")
+    download.cancel_event.set()
+    thread, errors = run_encode(download, *hanging_ffmpeg)
+    thread.join(5)
+    assert not thread.is_alive()
+    assert [type(e) for e in errors] == [DownloadCancelled]
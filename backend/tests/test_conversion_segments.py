@@ -0,0 +1,122 @@
+"""Tests for segmented (parallel) conversion planning and failure handling"""
+import asyncio
+import os
+import threading
+
+import pytest
+
+from services import conversion_service as cs
+from services.conversion_service import ConversionService
+
+
+def make_service(cpus=4):
+    """ConversionService without worker threads or database"""
+    service = ConversionService.__new__(ConversionService)
+    service._encoder_slots = threading.BoundedSemaphore(cpus)
+
+    async def broadcast_progress(conversion_id, data):
+        pass
+
+    service.broadcast_progress = broadcast_progress
+    return service
+
+
+def make_conversion(duration=1800, output_format="mp3"):
+    conversion = cs.Conversion.__new__(cs.Conversion)
+    for name, value in {
+        "id": "c1", "duration": duration, "output_format": output_format,
+        "quality": "192", "status": "processing", "process": None, "progress": 0,
+    }.items():
+        object.__setattr__(conversion, name, value)
+    return conversion
+
+
+class TestPlanSegments:
+    def test_even_split_without_silences(self):
+        assert ConversionService._plan_segments(1200, 4, []) == [
+            (0.0, 300.0), (300.0, 600.0), (600.0, 900.0), (900.0, None)
+        ]
+
+    def test_cuts_move_to_nearest_silence_in_window(self):
+        segments = ConversionService._plan_segments(1200, 4, [290, 320, 610, 880, 1000])
+        assert segments == [(0.0, 290), (290, 610), (610, 880), (880, None)]
+
+    def test_silence_outside_window_is_ignored(self):
+        segments = ConversionService._plan_segments(1200, 2, [500])
+        assert segments == [(0.0, 600.0), (600.0, None)]
+
+    def test_segments_cover_whole_input(self):
+        segments = ConversionService._plan_segments(3600, 8, [437.5, 905.1, 1333.0])
+        assert segments[0][0] == 0.0
+        assert segments[-1][1] is None
+        for (_, end), (start, _) in zip(segments, segments[1:]):
+            assert end == start
+
+
+def test_silence_pattern_parses_start_and_end():
+    stderr = (
+        "[silencedetect @ 0x1] silence_start: 10.5\n"
+        "[silencedetect @ 0x1] silence_end: 12.5 | silence_duration: 2\n"
+    )
+    assert cs._SILENCE_PATTERN.findall(stderr) == [("start", "10.5"), ("end", "12.5")]
+
+
+def test_failed_segment_raises_its_error_and_cleans_up(tmp_path, monkeypatch):
+    service = make_service()
+    conversion = make_conversion()
+    started = []
+
+    async def no_silences(input_path):
+        return []
+
+    async def fake_run_process(conv, cmd, output_path, on_time):
+        started.append(output_path)
+        if output_path.endswith("0001.mp3"):
+            raise Exception("FFmpeg error: boom")
+        await asyncio.sleep(10)  # Still running when the sibling fails
+
+    monkeypatch.setattr(service, "_find_silences", no_silences)
+    monkeypatch.setattr(service, "_run_process", fake_run_process)
+    monkeypatch.setattr(cs.os, "cpu_count", lambda: 4)
+
+    with pytest.raises(Exception, match="boom"):
+        asyncio.run(service._run_segmented(
+            conversion, str(tmp_path / "in.webm"), str(tmp_path / "out.mp3")
+        ))
+
+    assert len(started) > 1
+    assert os.listdir(tmp_path) == []  # Segment directory removed
+    assert service._encoder_slots.acquire(blocking=False)  # Slots were released
+
+
+def test_encoder_slots_are_shared_across_conversions(tmp_path, monkeypatch):
+    service = make_service(cpus=2)
+    running = 0
+    peak = 0
+
+    async def no_silences(input_path):
+        return []
+
+    async def fake_run_process(conv, cmd, output_path, on_time):
+        nonlocal running, peak
+        if "-ss" in cmd:  # Segment encodes hold a slot; the concat join does not
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+        with open(output_path, "w") as f:
+            f.write("x")
+
+    monkeypatch.setattr(service, "_find_silences", no_silences)
+    monkeypatch.setattr(service, "_run_process", fake_run_process)
+    monkeypatch.setattr(cs.os, "cpu_count", lambda: 4)
+
+    async def two_conversions():
+        await asyncio.gather(*(
+            service._run_segmented(make_conversion(), str(tmp_path / "in.webm"),
+                                   str(tmp_path / f"out{i}.mp3"))
+            for i in range(2)
+        ))
+
+    asyncio.run(two_conversions())
+    assert peak <= 2
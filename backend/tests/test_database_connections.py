@@ -0,0 +1,51 @@
+"""Tests for the per-thread SQLite connections of DatabaseManager"""
+import sqlite3
+import threading
+
+import pytest
+
+
+def test_connection_is_reused_within_a_thread(db_manager):
+    with db_manager._connect() as first:
+        pass
+    with db_manager._connect() as second:
+        pass
+    assert first is second
+
+
+def test_each_thread_gets_its_own_connection(db_manager):
+    with db_manager._connect() as main_conn:
+        pass
+    seen = []
+
+    def worker():
+        with db_manager._connect() as conn:
+            seen.append(conn)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen and seen[0] is not main_conn
+
+
+def test_connections_are_tuned(db_manager):
+    with db_manager._connect() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_failed_transaction_rolls_back(db_manager):
+    with pytest.raises(sqlite3.IntegrityError):
+        with db_manager._connect() as conn:
+            conn.execute("INSERT INTO download_queue (url) VALUES ('kept?')")
+            conn.execute("INSERT INTO download_queue (url) VALUES (NULL)")  # NOT NULL
+    with db_manager._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM download_queue").fetchone()[0] == 0
+
+
+def test_row_factory_does_not_leak_between_calls(db_manager):
+    db_manager._add_download_sync({'title': "song"})
+    assert isinstance(db_manager._get_history_sync()[0], dict)
+    with db_manager._connect() as conn:
+        assert conn.row_factory is None
@@ -0,0 +1,63 @@
+"""Tests for cooperative cancellation of running downloads"""
+import os
+import subprocess
+
+from services.download_service import Download
+
+URL = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+
+
+def test_cancel_aborts_transfer_and_removes_partial_files(download_service, fake_ydl, monkeypatch):
+    events = []
+    monkeypatch.setattr(download_service, "_emit", lambda job_id, message: events.append(message))
+    download = Download("job", URL)
+    download_service.active_downloads[download.id] = download
+
+    def transfer(ydl, source):
+        for suffix in (".part", ".part-Frag1", ".ytdl"):
+            open(source + suffix, "wb").close()
+        ydl.progress(source, 10)
+        download_service.cancel_download(download.id)
+        ydl.progress(source, 20)
+        raise AssertionError("transfer was not aborted")
+
+    fake_ydl.transfer = transfer
+    download_service._download_worker(download)
+
+    assert download.status == "cancelled"
+    assert os.listdir(download_service.output_dir) == []
+    assert events[-1]["status"] == "cancelled"
+
+
+def test_cancel_kills_a_running_encode(download_service):
+    download = Download("job", URL)
+    download.status = "converting"
+    download.ffmpeg_process = subprocess.Popen(["sleep", "30"])
+    download_service.active_downloads[download.id] = download
+
+    assert download_service.cancel_download(download.id)
+    assert download.ffmpeg_process.wait(timeout=5) != 0
+
+
+def test_cancel_of_queued_job_is_immediate(download_service):
+    download = Download("job", URL)
+    download_service.active_downloads[download.id] = download
+    assert download_service.cancel_download(download.id)
+    assert download.status == "cancelled"
+    assert not download_service.cancel_download(download.id)
+
+
+def test_cleanup_keeps_an_earlier_mp3_unless_converting(download_service, tmp_path):
+    folder = tmp_path / "partial"
+    folder.mkdir()
+    base = folder / "Song [aaaaaaaaaaa].webm"
+    mp3 = folder / "Song [aaaaaaaaaaa].mp3"
+    download = Download("job", URL)
+
+    for converting in (False, True):
+        for path in (base, mp3, folder / (base.name + ".part")):
+            path.write_bytes(b"x")
+        download.status = "converting" if converting else "downloading"
+        download.temp_files.add(str(base) + ".part")
+        download_service._cleanup_partial_files(download)
+        assert sorted(os.listdir(folder)) == ([] if converting else [mp3.name])
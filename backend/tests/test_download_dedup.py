@@ -0,0 +1,92 @@
+"""Tests for duplicate detection of download jobs"""
+import asyncio
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+SHORT_URL = "https://youtu.be/dQw4w9WgXcQ"
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+def start(service, url, quality="192", force=False):
+    return asyncio.run(service.start_download(url, quality, force=force))
+
+
+def record_history(db, tmp_path, quality):
+    path = tmp_path / f"song-{quality}.mp3"
+    path.write_bytes(b"mp3")
+    db._add_download_sync({
+        'title': "Song", 'file_name': path.name, 'file_path': str(path),
+        'url': URL, 'video_id': VIDEO_ID, 'quality': quality,
+    })
+    return str(path)
+
+
+def test_same_video_and_quality_returns_active_job(download_service):
+    first = start(download_service, URL)
+    assert start(download_service, SHORT_URL).id == first.id
+
+
+def test_other_quality_starts_new_job(download_service):
+    first = start(download_service, URL, "320")
+    second = start(download_service, URL, "128")
+    assert second.id != first.id
+    assert second.quality == "128"
+
+
+def test_force_starts_new_job(download_service):
+    first = start(download_service, URL)
+    assert start(download_service, URL, force=True).id != first.id
+
+
+def test_history_file_reused_only_for_matching_quality(download_service, db_manager, tmp_path):
+    path = record_history(db_manager, tmp_path, "320")
+
+    reused = start(download_service, URL, "320")
+    assert reused.status == "completed"
+    assert reused.file_path == path
+
+    fresh = start(download_service, URL, "128")
+    assert fresh.status == "pending"
+
+
+def test_history_file_missing_on_disk_is_not_reused(download_service, db_manager, tmp_path):
+    import os
+    os.remove(record_history(db_manager, tmp_path, "192"))
+    assert start(download_service, URL, "192").status == "pending"
+
+
+def test_batch_dedups_within_batch_by_quality(download_service):
+    jobs = asyncio.run(download_service.start_downloads([
+        {'url': URL, 'quality': "192"},
+        {'url': SHORT_URL, 'quality': "192"},
+        {'url': URL, 'quality': "320"},
+    ]))
+    assert jobs[0].id == jobs[1].id
+    assert jobs[2].id != jobs[0].id
+
+
+def test_playlist_urls_are_not_deduplicated(download_service):
+    from services.download_service import _dedup_key
+    assert _dedup_key(URL + "&list=PL123", "192") is None
+    assert _dedup_key(URL, "192") == ("https://youtube.com/watch?v=" + VIDEO_ID, "192")
+
+
+def test_redownload_from_history_is_forced(download_service, db_manager, tmp_path, monkeypatch):
+    from services import download_service as ds
+    monkeypatch.setattr(ds, "_download_service", download_service)
+    from api.routes import history
+    monkeypatch.setattr(history, "db_manager", db_manager)
+    monkeypatch.setattr(history, "download_service", download_service)
+
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"mp3")
+    history_id = db_manager._add_download_sync({
+        'title': "Song", 'url': "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+        'video_id': "aaaaaaaaaaa", 'file_path': str(song), 'quality': "192",
+    })
+
+    response = asyncio.run(history.redownload(history_id))
+
+    assert response.success
+    assert response.data["status"] == "pending"
+    download = download_service.get_download(response.data["id"])
+    assert download.quality == "192"
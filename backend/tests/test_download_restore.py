@@ -0,0 +1,34 @@
+"""Tests for restoring download jobs from download_queue"""
+import asyncio
+
+
+def add_job(db, job_id, status):
+    (queue_id, _), = db._add_queue_jobs_sync([{
+        'url': "https://www.youtube.com/watch?v=dQw4w9WgXcQ", 'job_id': job_id, 'quality': "192",
+    }])
+    db._update_queue_status_sync(queue_id, status, None, "Song", None)
+    return queue_id
+
+
+def test_evicted_in_flight_job_reports_downloading(download_service, db_manager):
+    add_job(db_manager, "job-1", "processing")
+    download = asyncio.run(download_service.load_download("job-1"))
+    assert download.status == "downloading"
+
+
+def test_in_flight_row_is_rebuilt_as_pending_for_resume(db_manager):
+    from services.download_service import DownloadService
+    add_job(db_manager, "job-2", "processing")
+    row = db_manager._get_queue_job_sync("job-2")
+    assert DownloadService._download_from_row(row).status == "pending"
+
+
+def test_finished_job_keeps_terminal_state(download_service, db_manager):
+    add_job(db_manager, "job-3", "failed")
+    download = asyncio.run(download_service.load_download("job-3"))
+    assert download.status == "failed"
+    assert download.video_title == "Song"
+
+
+def test_unknown_job_is_none(download_service):
+    assert asyncio.run(download_service.load_download("missing")) is None
@@ -0,0 +1,57 @@
+"""Tests for sending worker-thread events through the server event loop"""
+import asyncio
+import threading
+
+from services.conversion_service import ConversionService
+
+
+class RecordingManager:
+    """Records each broadcast with the loop it ran on"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def broadcast(self, job_id, message, kind="download"):
+        self.calls.append((job_id, message["type"], asyncio.get_running_loop()))
+
+
+def run_from_worker_thread(service, target):
+    """Call target() on a worker thread while the service's server loop is running"""
+    async def scenario():
+        manager = RecordingManager()
+        service.set_websocket_manager(manager)
+        service.set_event_loop(asyncio.get_running_loop())
+        worker = threading.Thread(target=target)
+        worker.start()
+        await asyncio.get_running_loop().run_in_executor(None, worker.join)
+        await asyncio.sleep(0.05)
+        return manager.calls, asyncio.get_running_loop()
+
+    return asyncio.run(scenario())
+
+
+def test_download_events_are_broadcast_on_the_server_loop(download_service):
+    def worker():
+        for i in range(3):
+            download_service._emit("job", {"type": "progress", "progress": i})
+
+    calls, server_loop = run_from_worker_thread(download_service, worker)
+    assert [(job_id, kind) for job_id, kind, _ in calls] == [("job", "progress")] * 3
+    assert all(loop is server_loop for _, _, loop in calls)
+
+
+def test_emit_without_server_loop_is_dropped(download_service):
+    download_service.set_websocket_manager(RecordingManager())
+    download_service._emit("job", {"type": "progress"})  # No loop injected - must not raise
+    assert download_service.websocket_manager.calls == []
+
+
+def test_conversion_broadcasts_from_a_private_loop_are_handed_off(tmp_path, db_manager):
+    service = ConversionService(output_dir=str(tmp_path), max_workers=1)
+    service.shutdown()
+
+    def worker():
+        asyncio.run(service.broadcast_progress("conv", {"type": "status"}))
+
+    calls, server_loop = run_from_worker_thread(service, worker)
+    assert len(calls) == 1 and calls[0][2] is server_loop
@@ -0,0 +1,44 @@
+"""Tests for full-text history search"""
+from database.history_search import build_match_query, fold_turkish
+
+
+def add(db, title, channel=None, file_name="song.mp3"):
+    return db._add_download_sync({'title': title, 'channel_name': channel, 'file_name': file_name})
+
+
+def titles(rows):
+    return [row['video_title'] for row in rows]
+
+
+def test_match_query_prefixes_every_word():
+    assert build_match_query("sezen aks") == '"sezen"* "aks"*'
+    assert build_match_query('a"b OR c') == '"a"* "b"* "OR"* "c"*'
+    assert build_match_query("  -- ") is None
+
+
+def test_turkish_dotless_i_is_folded():
+    assert fold_turkish("IŞIK ılık İstanbul") == "IŞIK ilik istanbul"
+
+
+def test_search_matches_prefixes_across_fields(db_manager):
+    assert db_manager.fts_enabled
+    add(db_manager, "Gülümse", channel="Sezen Aksu")
+    add(db_manager, "Unrelated")
+    assert titles(db_manager._search_history_sync("sez aks")) == ["Gülümse"]
+
+
+def test_search_folds_case_diacritics_and_dotless_i(db_manager):
+    add(db_manager, "Işıklar Sönünce")
+    assert titles(db_manager._search_history_sync("isiklar sonunce")) == ["Işıklar Sönünce"]
+
+
+def test_title_match_ranks_above_file_name_match(db_manager):
+    add(db_manager, "Other", file_name="yesterday.mp3")
+    add(db_manager, "Yesterday")
+    assert titles(db_manager._search_history_sync("yesterday")) == ["Yesterday", "Other"]
+
+
+def test_deleted_rows_are_not_found(db_manager):
+    history_id = add(db_manager, "Gone Song")
+    db_manager._delete_history_item_sync(history_id)
+    assert db_manager._search_history_sync("gone") == []
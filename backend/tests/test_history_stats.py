@@ -0,0 +1,89 @@
+"""Tests for the trigger-maintained history statistics"""
+import time
+
+import pytest
+
+from database.manager import DatabaseManager
+
+
+def add(db, title, channel, size, duration):
+    return db._add_download_sync({
+        'title': title, 'channel_name': channel,
+        'file_size': size, 'duration': duration,
+    })
+
+
+def test_statistics_follow_inserts_and_deletes(db_manager):
+    first = add(db_manager, "a", "Chan A", 1000, 100)
+    add(db_manager, "b", "Chan A", 2000, 60)
+    add(db_manager, "c", "Chan B", 500, 20)
+
+    stats = db_manager._get_statistics_sync()
+    assert stats['total_downloads'] == 3
+    assert stats['total_size'] == 3500
+    assert stats['total_duration'] == 180
+    assert stats['today_downloads'] == 3
+    assert stats['top_channels'][0] == {'channel_name': "Chan A", 'downloads': 2}
+
+    db_manager._delete_history_item_sync(first)  # Soft delete
+    stats = db_manager._get_statistics_sync()
+    assert stats['total_downloads'] == 2
+    assert stats['total_size'] == 2500
+    assert stats['total_duration'] == 80
+
+
+def test_emptied_channel_is_removed(db_manager):
+    only = add(db_manager, "a", "Gone", 10, 1)
+    db_manager._delete_history_item_sync(only)
+    assert db_manager._get_statistics_sync()['top_channels'] == []
+
+
+def test_total_duration_stays_an_integer(db_manager):
+    add(db_manager, "a", "Chan", 10, 90.6)
+    add(db_manager, "b", "Chan", 10, 89.4)
+    total = db_manager._get_statistics_sync()['total_duration']
+    assert total == 180
+    assert isinstance(total, int)
+
+
+@pytest.fixture
+def far_east(monkeypatch):
+    """Local time UTC+14, so a UTC evening is already the next local day"""
+    monkeypatch.setenv("TZ", "Etc/GMT-14")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def daily(db):
+    with db._connect() as conn:
+        return dict(conn.execute("SELECT day, downloads FROM history_daily_stats").fetchall())
+
+
+def test_days_are_local_dates(db_manager, far_east):
+    item = add(db_manager, "a", "Chan", 10, 1)
+    with db_manager._connect() as conn:
+        conn.execute("UPDATE download_history SET downloaded_at = '2024-01-01 20:00:00' WHERE id = ?", (item,))
+    assert daily(db_manager) == {"2024-01-02": 1}
+
+    add(db_manager, "b", "Chan", 10, 1)  # Now (UTC) - counted for the local today
+    assert db_manager._get_statistics_sync()['today_downloads'] == 1
+
+
+def test_utc_days_are_migrated(db_manager, far_east):
+    item = add(db_manager, "a", "Chan", 10, 1)
+    with db_manager._connect() as conn:
+        conn.execute("UPDATE download_history SET downloaded_at = '2024-01-01 20:00:00' WHERE id = ?", (item,))
+        # Database written before days were local: UTC triggers and buckets
+        for name, sql in conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'history_stats_%'"
+        ).fetchall():
+            conn.execute(f"DROP TRIGGER {name}")
+            conn.execute(sql.replace(", 'localtime')", ")"))
+        conn.execute("UPDATE history_daily_stats SET day = '2024-01-01'")
+
+    migrated = DatabaseManager(db_manager.db_path)
+    assert daily(migrated) == {"2024-01-02": 1}
+    add(migrated, "b", "Chan", 10, 1)
+    assert migrated._get_statistics_sync()['today_downloads'] == 1
@@ -0,0 +1,36 @@
+"""Tests for the versioned job record snapshots"""
+import pytest
+
+from services.download_service import Download
+from services.job_record import JobRecord
+
+
+def test_job_record_is_abstract():
+    with pytest.raises(TypeError):
+        JobRecord()
+
+    class Incomplete(JobRecord):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_snapshot_is_cached_until_a_field_changes():
+    download = Download("d1", "https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    first = download.to_dict()
+    assert download.to_dict() is first
+
+    download.progress = 50
+    second = download.to_dict()
+    assert second is not first
+    assert second["progress"] == 50
+
+
+def test_touch_invalidates_after_in_place_change():
+    download = Download("d1", "https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    download.child_ids = []
+    before = download.to_dict()
+    download.child_ids.append("c1")
+    download.touch()
+    assert download.to_dict() is not before
@@ -0,0 +1,102 @@
+"""Tests for the cached async ffprobe inspection"""
+import asyncio
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from utils import media_probe
+from utils.media_probe import inspect_media, media_info
+
+PROBE = {
+    "format": {"duration": "12.5", "format_name": "mp3", "bit_rate": "192000", "tags": {"Title": "Song"}},
+    "streams": [{"codec_type": "audio", "codec_name": "mp3", "channels": 2, "sample_rate": "44100"}],
+}
+
+
+@pytest.fixture
+def fake_ffprobe(tmp_path, monkeypatch):
+    """Put an ffprobe on PATH that prints PROBE and counts its runs (or sleeps with delay)"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "calls"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(media_probe, "_probe_cache", type(media_probe._probe_cache)())
+
+    def install(delay=0):
+        script = bin_dir / "ffprobe"
+        hang = f"exec sleep {delay}\n" if delay else ""  # exec: killing the probe stops the sleep
+        script.write_text(
+            "#!/bin/sh\n"
+            f"echo run >> '{calls}'\n"
+            f"{hang}"
+            f"echo '{json.dumps(PROBE)}'\n"
+        )
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        return lambda: calls.read_text().count("run") if calls.exists() else 0
+
+    return install
+
+
+def test_probe_is_cached_per_file_version(fake_ffprobe, tmp_path):
+    runs = fake_ffprobe()
+    media = tmp_path / "song.mp3"
+    media.write_bytes(b"a")
+
+    assert asyncio.run(inspect_media(str(media))) == PROBE
+    asyncio.run(inspect_media(str(media)))
+    assert runs() == 1
+
+    media.write_bytes(b"changed")  # New size/mtime - probed again
+    os.utime(media, (time.time() + 5, time.time() + 5))
+    asyncio.run(inspect_media(str(media)))
+    assert runs() == 2
+
+
+def test_hung_probe_times_out(fake_ffprobe, tmp_path):
+    fake_ffprobe(delay=5)
+    media = tmp_path / "song.mp3"
+    media.write_bytes(b"a")
+
+    started = time.monotonic()
+    assert asyncio.run(inspect_media(str(media), timeout=0.2)) is None
+    assert time.monotonic() - started < 3
+    assert media_probe._probe_cache == {}  # Failures are not cached
+
+
+def test_missing_file_is_none(fake_ffprobe, tmp_path):
+    fake_ffprobe()
+    assert asyncio.run(inspect_media(str(tmp_path / "missing.mp3"))) is None
+
+
+def test_media_info_summary():
+    assert media_info(PROBE) == {
+        "duration": 12.5, "format": "mp3", "codec": "mp3", "bitrate": 192000,
+        "channels": 2, "sample_rate": 44100, "tags": {"title": "Song"},
+    }
+    assert media_info(None)["duration"] is None
+
+
+def test_conversion_exposes_source_info(fake_ffprobe, tmp_path, monkeypatch):
+    from services.conversion_service import Conversion, ConversionService
+
+    fake_ffprobe()
+    media = tmp_path / "song.mp3"
+    media.write_bytes(b"a")
+    service = ConversionService.__new__(ConversionService)
+    service.output_dir = str(tmp_path / "out")
+    service.websocket_manager = None
+    conversion = Conversion("c1", str(media), "192", "mp3")
+
+    async def fake_run_ffmpeg(conv, input_path, output_path, copy_audio=False):
+        pass
+
+    monkeypatch.setattr(service, "_run_ffmpeg", fake_run_ffmpeg)
+    asyncio.run(service._conversion_worker(conversion))
+
+    snapshot = conversion.to_dict()
+    assert snapshot["status"] == "completed"
+    assert snapshot["duration"] == 12.5
+    assert snapshot["source"] == media_info(PROBE)
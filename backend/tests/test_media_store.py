@@ -0,0 +1,110 @@
+"""Tests for the shared media store"""
+import logging
+import os
+
+from services import media_store
+from services.media_store import MEDIA_STORE_DIR, MediaStore
+
+
+def make_file(path, data=b"mp3 data"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_blob_path_rejects_unsafe_keys(tmp_path):
+    store = MediaStore(str(tmp_path / "store"))
+    assert store.blob_path("../etc", "mp3", "320") is None
+    assert store.blob_path("dQw4w9WgXcQ", "mp3", "320").endswith(
+        os.path.join("dQw4w9WgXcQ", "mp3-320.mp3"))
+
+
+def test_ingest_then_materialize_shares_the_file(tmp_path):
+    store = MediaStore(str(tmp_path / "store"))
+    source = make_file(tmp_path / "music" / "song.mp3")
+
+    blob = store.ingest(source, "vid", "mp3", "192")
+    assert blob == store.find("vid", "mp3", "192")
+    assert store.find("vid", "mp3", "320") is None
+
+    target = str(tmp_path / "other" / "song.mp3")
+    assert store.materialize(blob, target) in ("reflink", "hardlink")
+    assert open(target, "rb").read() == b"mp3 data"
+    assert store.materialize(blob, source) == "existing"
+
+
+def test_store_on_another_filesystem_gets_a_copy(tmp_path, monkeypatch):
+    store = MediaStore(str(tmp_path / "store"))
+    source = make_file(tmp_path / "song.mp3")
+
+    def no_link(src, dst):
+        raise OSError(18, "Invalid cross-device link")
+
+    monkeypatch.setattr(media_store, "_reflink", no_link)
+    monkeypatch.setattr(media_store.os, "link", no_link)
+    blob = store.ingest(source, "vid", "mp3", "192")
+    assert blob == store.find("vid", "mp3", "192")
+    assert not os.path.samefile(blob, source)
+    assert os.listdir(os.path.dirname(blob)) == ["mp3-192.mp3"]
+
+
+def test_failed_ingest_is_not_stored_and_warns(tmp_path, monkeypatch, caplog):
+    store = MediaStore(str(tmp_path / "store"))
+    source = make_file(tmp_path / "song.mp3")
+
+    def disk_full(src, dst, allow_copy):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(media_store, "_clone", disk_full)
+    with caplog.at_level(logging.WARNING, logger="services.media_store"):
+        assert store.ingest(source, "vid", "mp3", "192") is None
+    assert "Could not add" in caplog.text
+    assert store.find("vid", "mp3", "192") is None
+
+
+def test_garbage_collection_keeps_only_blobs_in_use(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_store, "GC_GRACE_SECONDS", -60)
+    store = MediaStore(str(tmp_path / "store"))
+    kept_file = make_file(tmp_path / "music" / "kept.mp3")
+    deleted_file = make_file(tmp_path / "music" / "deleted.mp3")
+    unreferenced_file = make_file(tmp_path / "music" / "unreferenced.mp3")
+    kept = store.ingest(kept_file, "kept", "mp3", "192")
+    deleted = store.ingest(deleted_file, "deleted", "mp3", "192")
+    unreferenced = store.ingest(unreferenced_file, "unreferenced", "mp3", "192")
+    os.remove(deleted_file)  # The visible file is gone - the blob is the only link left
+
+    removed = store.collect_garbage({kept: [kept_file], deleted: [deleted_file]})
+
+    assert removed == 2
+    assert store.find("kept", "mp3", "192") == kept
+    assert not os.path.exists(deleted) and not os.path.exists(unreferenced)
+    assert sorted(os.listdir(store.root)) == ["kept"]
+    assert os.path.exists(unreferenced_file)
+
+
+def test_recent_blobs_are_not_collected(tmp_path):
+    store = MediaStore(str(tmp_path / "store"))
+    blob = store.ingest(make_file(tmp_path / "song.mp3"), "vid", "mp3", "192")
+    assert store.collect_garbage({}) == 0
+    assert os.path.exists(blob)
+
+
+def test_one_store_for_every_output_dir(download_service, db_manager, tmp_path):
+    expected = os.path.join(os.path.dirname(db_manager.db_path), MEDIA_STORE_DIR)
+    assert download_service.media_store.root == expected
+
+    download_service.set_output_dir(str(tmp_path / "elsewhere"))
+    assert download_service.media_store.root == expected
+
+
+def test_service_collects_blobs_of_deleted_history(download_service, db_manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(media_store, "GC_GRACE_SECONDS", -60)
+    store = download_service.media_store
+    song = make_file(tmp_path / "music" / "song.mp3")
+    blob = store.ingest(song, "vid", "mp3", "192")
+    history_id = db_manager._add_download_sync({'title': "Song", 'file_path': song, 'blob_path': blob})
+
+    assert download_service.collect_media_garbage() == 0
+    db_manager._delete_history_item_sync(history_id)
+    assert download_service.collect_media_garbage() == 1
+    assert store.find("vid", "mp3", "192") is None
@@ -0,0 +1,81 @@
+"""Tests for the persistent yt-dlp metadata cache"""
+import itertools
+
+import pytest
+
+from database import metadata_cache as mc
+from database.metadata_cache import MetadataCache, cache_key_for_url
+
+VIDEO = {'id': "dQw4w9WgXcQ", 'title': "Song", 'duration': 212, 'formats': [{'url': "x"}]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Deterministic time.time() for TTL and LRU ordering"""
+    now = {'t': 1000.0}
+    monkeypatch.setattr(mc.time, "time", lambda: now['t'])
+    return now
+
+
+@pytest.fixture
+def cache(db_manager):
+    return MetadataCache(db_manager, max_entries=2)
+
+
+def test_playlist_id_wins_for_watch_urls():
+    assert cache_key_for_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ") == "video:dQw4w9WgXcQ"
+    assert cache_key_for_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL1") == "playlist:PL1"
+    assert cache_key_for_url("https://example.com/") is None
+
+
+def test_put_stores_slim_info(cache, clock):
+    cache.put(VIDEO)
+    cached = cache.get("https://youtu.be/dQw4w9WgXcQ")
+    assert cached == {'id': "dQw4w9WgXcQ", 'title': "Song", 'duration': 212, '_type': 'video'}
+
+
+def test_entries_expire_after_ttl(cache, clock):
+    cache.put(VIDEO)
+    clock['t'] += mc.VIDEO_TTL_SECONDS + 1
+    assert cache.get("https://youtu.be/dQw4w9WgXcQ") is None
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    ids = [f"vid{i:08d}" for i in range(3)]
+    ticks = itertools.count()
+    for video_id in ids[:2]:
+        clock['t'] = 1000.0 + next(ticks)
+        cache.put({'id': video_id, 'title': video_id})
+
+    clock['t'] = 1000.0 + mc.ACCESS_TOUCH_INTERVAL
+    assert cache.get_by_key(f"video:{ids[0]}")  # Refresh the older entry
+
+    clock['t'] += 1
+    cache.put({'id': ids[2], 'title': ids[2]})
+    assert cache.get_by_key(f"video:{ids[1]}") is None
+    assert cache.get_by_key(f"video:{ids[0]}") is not None
+
+
+def test_playlist_entries_are_kept(cache, clock):
+    cache.put({'_type': 'playlist', 'id': "PL1", 'title': "Mix",
+               'entries': [{'id': "a", 'url': "u", 'title': "A", 'formats': []}, None]})
+    cached = cache.get_by_key("playlist:PL1")
+    assert cached['entries'] == [{'id': "a", 'url': "u", 'title': "A"}]
+    assert cached['playlist_count'] == 1
+
+
+def test_recent_hits_stay_read_only(cache, clock, db_manager):
+    cache.put(VIDEO)
+    statements = []
+    with db_manager._connect() as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        clock['t'] += mc.ACCESS_TOUCH_INTERVAL - 1
+        assert cache.get_by_key("video:dQw4w9WgXcQ")
+        assert not [sql for sql in statements if "UPDATE" in sql]
+
+        clock['t'] += 1
+        assert cache.get_by_key("video:dQw4w9WgXcQ")
+        assert [sql for sql in statements if "UPDATE" in sql]
+    finally:
+        conn.set_trace_callback(None)
@@ -0,0 +1,74 @@
+"""Tests for keyset pagination of history and queue"""
+import pytest
+
+from database.manager import decode_cursor, encode_cursor
+
+
+def collect(fetch, limit):
+    """All rows reached by following next_cursor"""
+    rows, token, pages = [], None, 0
+    while True:
+        page, token = fetch(limit, token)
+        rows.extend(page)
+        pages += 1
+        if token is None:
+            return rows, pages
+
+
+def test_cursor_round_trip_and_validation():
+    token = encode_cursor(["2024-01-01 10:00:00", 7])
+    assert decode_cursor(token, 2) == ["2024-01-01 10:00:00", 7]
+    with pytest.raises(ValueError):
+        decode_cursor(token, 4)
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!", 2)
+
+
+def test_history_pages_cover_every_row_once(db_manager):
+    # Same-second timestamps - the id tie-breaker must keep pages apart
+    ids = [db_manager._add_download_sync({'title': f"song {i}"}) for i in range(25)]
+    db_manager._delete_history_item_sync(ids[3])
+
+    rows, pages = collect(db_manager._get_history_page_sync, 10)
+    assert pages == 3
+    assert [row['id'] for row in rows] == sorted(set(ids) - {ids[3]}, reverse=True)
+
+
+def test_history_exact_page_has_no_next_cursor(db_manager):
+    for i in range(5):
+        db_manager._add_download_sync({'title': f"song {i}"})
+    assert db_manager._get_history_page_sync(5, None)[1] is None
+
+
+def test_queue_pages_follow_priority_then_position(db_manager):
+    jobs = [{'url': f"u{i}", 'priority': i % 3} for i in range(20)]
+    db_manager._add_queue_jobs_sync(jobs)
+
+    rows, _ = collect(db_manager._get_queue_page_sync, 7)
+    keys = [(-row['priority'], row['position'], row['id']) for row in rows]
+    assert len(rows) == 20
+    assert keys == sorted(keys)
+
+
+def test_deep_queue_pages_seek_the_index(db_manager):
+    db_manager._add_queue_jobs_sync([{'url': f"u{i}", 'priority': 0} for i in range(30)])
+    _, token = db_manager._get_queue_page_sync(10, None)
+
+    statements = []
+    with db_manager._connect() as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        db_manager._get_queue_page_sync(10, token)
+    finally:
+        conn.set_trace_callback(None)
+
+    queries = [sql for sql in statements if "FROM download_queue" in sql]
+    assert queries
+    for sql in queries:
+        plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+        assert "USING INDEX idx_queue_active_order" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+    # Same priority as the cursor: bounded by the cursor's position, not only by priority
+    assert "priority=? AND (position" in " ".join(
+        row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + queries[0])
+    )
@@ -0,0 +1,47 @@
+"""Tests for fanning out playlist URLs into per-video jobs"""
+from services.download_service import Download, DownloadService
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL123"
+WATCH_IN_LIST_URL = "https://www.youtube.com/watch?v=aaaaaaaaaaa&list=PL123"
+
+PLAYLIST = {
+    '_type': 'playlist', 'id': "PL123", 'title': "Mix", 'webpage_url': PLAYLIST_URL,
+    'entries': [
+        {'_type': 'url', 'id': "aaaaaaaaaaa", 'url': "https://www.youtube.com/watch?v=aaaaaaaaaaa", 'title': "A"},
+        {'_type': 'url', 'id': "bbbbbbbbbbb", 'url': "https://www.youtube.com/watch?v=bbbbbbbbbbb", 'title': "B"},
+    ],
+}
+
+
+def playlist_infos(fake_ydl):
+    # watch?v=X&list=Y extracts to a bare URL result pointing at the playlist
+    fake_ydl.infos[WATCH_IN_LIST_URL] = {'_type': 'url', 'url': PLAYLIST_URL, 'ie_key': "YoutubeTab"}
+    fake_ydl.infos[PLAYLIST_URL] = PLAYLIST
+
+
+def test_resolve_url_result_follows_redirect(fake_ydl):
+    playlist_infos(fake_ydl)
+    ydl = fake_ydl()
+    info = ydl.extract_info(WATCH_IN_LIST_URL, download=False, process=False)
+    resolved = DownloadService._resolve_url_result(ydl, info)
+    assert resolved['_type'] == 'playlist'
+    assert fake_ydl.extracted[-1] == (PLAYLIST_URL, False, False, "YoutubeTab")
+
+
+def test_resolve_url_result_keeps_video_info(fake_ydl):
+    info = {'_type': 'video', 'id': "x", 'title': "X"}
+    assert DownloadService._resolve_url_result(fake_ydl(), info) is info
+
+
+def test_watch_url_with_list_fans_out(download_service, fake_ydl):
+    playlist_infos(fake_ydl)
+    parent = Download("parent", WATCH_IN_LIST_URL)
+    download_service.active_downloads[parent.id] = parent
+
+    download_service._download_worker(parent)
+
+    assert fake_ydl.processed == []  # The playlist is not downloaded inside one job
+    assert len(parent.child_ids) == 2
+    children = [download_service.active_downloads[cid] for cid in parent.child_ids]
+    assert [child.video_title for child in children] == ["A", "B"]
+    assert all(child.parent_id == parent.id for child in children)
@@ -0,0 +1,46 @@
+"""Tests for coalescing yt-dlp progress callbacks"""
+from services import download_service as ds
+from services.download_service import Download
+
+URL = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def run_with_samples(download_service, fake_ydl, monkeypatch, samples):
+    """Run a job whose transfer reports `samples` as (clock, downloaded bytes of 1000)"""
+    clock = Clock()
+    monkeypatch.setattr(ds.time, "monotonic", clock.monotonic)
+    events = []
+    monkeypatch.setattr(download_service, "_emit", lambda job_id, message: events.append(message))
+
+    def transfer(ydl, source):
+        for at, downloaded in samples:
+            clock.now = at
+            ydl.progress(source, downloaded, total=1000, speed=2048.4, eta=3.7)
+
+    fake_ydl.transfer = transfer
+    download = Download("job", URL)
+    download_service.active_downloads[download.id] = download
+    download_service._download_worker(download)
+    return [event for event in events if event["type"] == "progress"]
+
+
+def test_bursts_within_one_percent_are_coalesced(download_service, fake_ydl, monkeypatch):
+    samples = [(1000.0, 100 + i // 10) for i in range(100)] + [(1000.0, 200)]
+    progress = run_with_samples(download_service, fake_ydl, monkeypatch, samples)
+    assert [event["progress"] for event in progress] == [10, 20]
+    assert progress[0]["speed_bps"] == 2048 and progress[0]["eta_seconds"] == 3
+
+
+def test_unchanged_percentage_is_resent_after_the_interval(download_service, fake_ydl, monkeypatch):
+    interval = 1.0 / ds.PROGRESS_EVENTS_PER_SECOND
+    samples = [(1000.0, 100), (1000.0 + interval / 2, 101), (1000.0 + interval, 102)]
+    progress = run_with_samples(download_service, fake_ydl, monkeypatch, samples)
+    assert [event["progress"] for event in progress] == [10, 10]
@@ -0,0 +1,34 @@
+"""Tests for the single-transaction queue batch operations"""
+import asyncio
+
+
+def urls(n, offset=0):
+    return [f"https://www.youtube.com/watch?v=vid{i + offset:08d}" for i in range(n)]
+
+
+def test_add_queue_jobs_returns_ids_and_positions(db_manager):
+    first = db_manager._add_queue_jobs_sync([{'url': u} for u in urls(2)])
+    second = db_manager._add_queue_jobs_sync([{'url': u} for u in urls(2, 2)] + [{'url': "x", 'position': 0}])
+    assert [position for _, position in first] == [0, 1]
+    assert [position for _, position in second] == [2, 3, 0]
+
+    ids = [queue_id for queue_id, _ in first + second]
+    rows = {row['id']: row['position'] for row in db_manager._get_queue_sync(limit=10)}
+    assert {queue_id: rows[queue_id] for queue_id in ids} == dict(first + second)
+
+
+def test_batch_jobs_are_scheduled_after_queued_work(download_service):
+    earlier = asyncio.run(download_service.start_download(urls(1)[0]))
+    batch = asyncio.run(download_service.start_downloads([{'url': u} for u in urls(3, 1)]))
+
+    assert earlier.position == 0
+    assert [job.position for job in batch] == [1, 2, 3]
+
+    order = [download_service.job_queue.get(timeout=0).id for _ in range(4)]
+    assert order == [earlier.id] + [job.id for job in batch]
+
+
+def test_batch_delete_reports_only_active_rows(db_manager):
+    ids = [queue_id for queue_id, _ in db_manager._add_queue_jobs_sync([{'url': u} for u in urls(3)])]
+    assert sorted(db_manager._delete_queue_items_sync(ids[:2] + [9999])) == sorted(ids[:2])
+    assert db_manager._delete_queue_items_sync(ids[:1]) == []
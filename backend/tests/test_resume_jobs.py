@@ -0,0 +1,35 @@
+"""Tests for resuming persisted download jobs after a restart"""
+
+
+def test_unfinished_jobs_are_queued_again(download_service, db_manager):
+    db_manager._add_queue_jobs_sync([
+        {'url': "https://youtu.be/aaaaaaaaaaa", 'job_id': "pending", 'status': "pending"},
+        {'url': "https://youtu.be/bbbbbbbbbbb", 'job_id': "interrupted", 'status': "processing"},
+        {'url': "https://youtu.be/ccccccccccc", 'job_id': "done", 'status': "completed"},
+    ])
+
+    assert download_service.resume_pending_jobs() == 2
+
+    queued = {download_service.job_queue.get(timeout=0).id for _ in range(2)}
+    assert queued == {"pending", "interrupted"}
+    assert download_service.get_download("done") is None
+    assert db_manager._get_queue_job_sync("interrupted")['status'] == "pending"
+    assert download_service.find_active_duplicate("https://www.youtube.com/watch?v=bbbbbbbbbbb").id == "interrupted"
+
+
+def test_playlist_parent_is_rebuilt_from_its_items(download_service, db_manager):
+    db_manager._add_queue_jobs_sync([
+        {'url': "https://www.youtube.com/playlist?list=PL1", 'job_id': "parent", 'status': "processing"},
+        {'url': "https://youtu.be/aaaaaaaaaaa", 'job_id': "item1", 'status': "completed",
+         'parent_job_id': "parent"},
+        {'url': "https://youtu.be/bbbbbbbbbbb", 'job_id': "item2", 'status': "pending",
+         'parent_job_id': "parent"},
+    ])
+
+    assert download_service.resume_pending_jobs() == 1
+
+    parent = download_service.get_download("parent")
+    assert parent.child_ids == ["item1", "item2"]
+    assert parent.status == "downloading"
+    assert download_service.job_queue.get(timeout=0).id == "item2"
+    assert download_service.job_queue.qsize() == 0
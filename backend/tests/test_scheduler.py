@@ -0,0 +1,61 @@
+"""Tests for the priority job scheduler"""
+import queue
+import threading
+import time
+
+import pytest
+
+from services.scheduler import PriorityJobQueue
+
+
+class Job:
+    def __init__(self, job_id, priority=0, position=None):
+        self.id = job_id
+        self.priority = priority
+        self.position = position
+
+
+def drain(jobs):
+    return [jobs.get(timeout=0).id for _ in range(jobs.qsize())]
+
+
+def test_orders_by_priority_then_position_then_fifo():
+    jobs = PriorityJobQueue()
+    for job in (Job("low", 0, 0), Job("b", 5, 2), Job("a", 5, 1), Job("c", 5, 2), Job("free", 5)):
+        jobs.put(job)
+    assert drain(jobs) == ["free", "a", "b", "c", "low"]
+
+
+def test_reprioritize_moves_waiting_job():
+    jobs = PriorityJobQueue()
+    first, second = Job("first", 0, 0), Job("second", 0, 1)
+    jobs.put(first)
+    jobs.put(second)
+
+    second.priority = 10
+    assert jobs.reprioritize(second)
+    assert jobs.qsize() == 2  # Stale entry is not counted
+    assert drain(jobs) == ["second", "first"]
+    assert not jobs.reprioritize(second)  # No longer waiting
+
+
+def test_get_times_out_when_empty():
+    with pytest.raises(queue.Empty):
+        PriorityJobQueue().get(timeout=0.05)
+
+
+def test_get_wakes_up_on_put():
+    jobs = PriorityJobQueue()
+    threading.Timer(0.05, lambda: jobs.put(Job("late"))).start()
+    started = time.monotonic()
+    assert jobs.get(timeout=2).id == "late"
+    assert time.monotonic() - started < 1
+
+
+def test_task_done_balances_puts():
+    jobs = PriorityJobQueue()
+    jobs.put(Job("a"))
+    jobs.get(timeout=0)
+    jobs.task_done()
+    with pytest.raises(ValueError):
+        jobs.task_done()
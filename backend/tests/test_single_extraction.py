@@ -0,0 +1,20 @@
+"""Tests for reusing the first yt-dlp extraction for the download"""
+import os
+
+from services.download_service import Download
+
+URL = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+
+
+def test_download_reuses_the_first_extraction(download_service, fake_ydl):
+    fake_ydl.infos[URL] = {'_type': 'video', 'id': "aaaaaaaaaaa", 'title': "Song", 'duration': 200}
+    download = Download("job", URL)
+    download_service.active_downloads[download.id] = download
+
+    download_service._download_worker(download)
+
+    assert download.status == "completed", download.error
+    assert fake_ydl.extracted == [(URL, False, False, None)]
+    assert len(fake_ydl.processed) == 1 and fake_ydl.processed[0]['id'] == "aaaaaaaaaaa"
+    assert download.video_title == "Song"
+    assert os.path.basename(download.file_path) == "Song [aaaaaaaaaaa].mp3"
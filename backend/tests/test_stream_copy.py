@@ -0,0 +1,63 @@
+"""Tests for the stream-copy decision of conversions"""
+import pytest
+
+from utils.media_probe import audio_bitrate, can_copy_audio
+
+
+def probe(codec, stream_bitrate=None, format_bitrate=None):
+    stream = {"codec_type": "audio", "codec_name": codec}
+    if stream_bitrate is not None:
+        stream["bit_rate"] = str(stream_bitrate)
+    fmt = {} if format_bitrate is None else {"bit_rate": str(format_bitrate)}
+    return {"format": fmt, "streams": [{"codec_type": "video", "codec_name": "h264"}, stream]}
+
+
+@pytest.mark.parametrize("source, fmt, quality, expected", [
+    (probe("mp3", 192000), "mp3", "192", True),     # Same bitrate
+    (probe("mp3", 128000), "mp3", "320", True),     # Upsampling would not add quality
+    (probe("mp3", 200000), "mp3", "192", True),     # Within VBR tolerance
+    (probe("mp3", 320000), "mp3", "192", False),    # Must shrink - re-encode
+    (probe("aac", 128000), "mp3", "320", False),    # Codec mismatch
+    (probe("opus", None, 130000), "ogg", "192", True),  # Container bitrate fallback
+    (probe("opus"), "ogg", "192", False),           # Unknown bitrate
+    (probe("flac"), "flac", "0", True),             # Lossless - bitrate irrelevant
+    (probe("pcm_s24le"), "wav", "0", False),        # Different sample format
+])
+def test_can_copy_audio(source, fmt, quality, expected):
+    assert can_copy_audio(source, fmt, quality) is expected
+
+
+def test_no_audio_stream_or_probe_cannot_copy():
+    assert not can_copy_audio({"streams": [{"codec_type": "video"}]}, "mp3", "192")
+    assert not can_copy_audio(None, "mp3", "192")
+
+
+def test_audio_bitrate_prefers_stream_value():
+    assert audio_bitrate(probe("mp3", 128000, 999000)) == 128000
+    assert audio_bitrate(probe("mp3", None, 999000)) == 999000
+
+
+def test_copy_runs_ffmpeg_without_reencoding(monkeypatch):
+    import asyncio
+    import threading
+    from services.conversion_service import Conversion, ConversionService
+
+    service = ConversionService.__new__(ConversionService)
+    service._encoder_slots = threading.BoundedSemaphore(1)
+    conversion = Conversion.__new__(Conversion)
+    for name, value in {"id": "c1", "duration": 10, "output_format": "mp3", "quality": "192",
+                        "status": "processing", "process": None, "progress": 0}.items():
+        object.__setattr__(conversion, name, value)
+    commands = []
+
+    async def fake_run_process(conv, cmd, output_path, on_time):
+        commands.append(cmd)
+
+    monkeypatch.setattr(service, "_run_process", fake_run_process)
+    asyncio.run(service._run_ffmpeg(conversion, "in.mp3", "out.mp3", copy_audio=True))
+    asyncio.run(service._run_ffmpeg(conversion, "in.mp3", "out.mp3"))
+
+    copy_cmd, encode_cmd = commands
+    assert ["-c:a", "copy"] == copy_cmd[copy_cmd.index("-c:a"):copy_cmd.index("-c:a") + 2]
+    assert "-acodec" not in copy_cmd
+    assert "libmp3lame" in encode_cmd and "192k" in encode_cmd
@@ -0,0 +1,85 @@
+"""Tests for per-client bounded WebSocket send queues"""
+import asyncio
+import json
+
+from api import websocket as ws
+from api.websocket import ClientChannel
+
+
+class FakeSocket:
+    """Records sent frames; send_text blocks while `gate` is cleared"""
+
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=None):
+        self.closed_with = code
+
+
+async def settle():
+    """Let the sender task run until it is idle or blocked"""
+    await asyncio.sleep(0.05)
+
+
+def test_frames_are_delivered_in_order():
+    async def scenario():
+        socket = FakeSocket()
+        channel = ClientChannel(socket)
+        for i in range(3):
+            channel.send({"n": i})
+        await settle()
+        channel.close()
+        return socket.sent
+
+    assert asyncio.run(scenario()) == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+def test_oldest_progress_frames_are_dropped_for_a_stalled_client(monkeypatch):
+    monkeypatch.setattr(ws, "MAX_PROGRESS_FRAMES", 2)
+
+    async def scenario():
+        socket = FakeSocket()
+        socket.gate.clear()
+        channel = ClientChannel(socket)
+        channel.send({"type": "status"})
+        await settle()  # Sender is now blocked on the first frame
+        for i in range(5):
+            channel.send({"type": "progress", "p": i}, droppable=True)
+        channel.send({"type": "completed"})
+        socket.gate.set()
+        await settle()
+        channel.close()
+        return socket.sent
+
+    assert asyncio.run(scenario()) == [
+        {"type": "status"},
+        {"type": "progress", "p": 3},
+        {"type": "progress", "p": 4},
+        {"type": "completed"},
+    ]
+
+
+def test_client_with_too_large_backlog_is_disconnected(monkeypatch):
+    monkeypatch.setattr(ws, "SLOW_CLIENT_BACKLOG", 3)
+    closed = []
+
+    async def scenario():
+        socket = FakeSocket()
+        socket.gate.clear()
+        channel = ClientChannel(socket, on_close=lambda: closed.append(True))
+        results = [channel.send({"type": "status", "n": i}) for i in range(5)]
+        await settle()
+        return socket, channel, results
+
+    socket, channel, results = asyncio.run(scenario())
+    assert results == [True, True, True, False, False]
+    assert channel.closed
+    assert socket.closed_with == 1008
+    assert closed == [True]
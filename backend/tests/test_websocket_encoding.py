@@ -0,0 +1,37 @@
+"""Tests for the default and compact event encodings"""
+from api.websocket import EventSubscriber, _compact, _verbose
+from utils.formatting import format_eta, format_speed
+
+EVENT = {
+    "id": "job", "kind": "download", "type": "progress", "progress": 50,
+    "speed_bps": 1572864, "eta_seconds": 90, "error": None, "seq": 7,
+}
+
+
+def test_verbose_adds_display_strings():
+    verbose = _verbose(EVENT)
+    assert verbose["speed"] == "1.50 MB/s"
+    assert verbose["eta"] == "01:30"
+    assert verbose["speed_bps"] == 1572864
+    status = {"type": "status", "status": "completed"}
+    assert _verbose(status) is status
+
+
+def test_compact_uses_short_keys_and_drops_nulls():
+    assert _compact(EVENT) == {"i": "job", "k": "d", "t": "progress", "p": 50,
+                               "s": 1572864, "e": 90, "q": 7}
+    assert "message" not in _compact({**EVENT, "message": "Downloading"})
+
+
+def test_subscriber_frames_follow_its_encoding():
+    compact = EventSubscriber(websocket=None, compact=True)
+    verbose = EventSubscriber(websocket=None)
+    assert compact.frame("events", "events", []) == {"t": "events", "ev": []}
+    assert verbose.frame("snapshot", "jobs", []) == {"type": "snapshot", "jobs": []}
+
+
+def test_formatting_helpers():
+    assert format_speed(None) is None
+    assert format_speed(512) == "512 B/s"
+    assert format_speed(2048) == "2.00 KB/s"
+    assert format_eta(3725) == "1:02:05"
@@ -0,0 +1,90 @@
+"""Tests for the multiplexed /ws/events socket"""
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import websocket as ws
+from api.websocket import ConnectionManager, _coalesce
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=None):
+        pass
+
+
+def test_coalesce_keeps_latest_progress_per_job():
+    events = [
+        {"id": "a", "kind": "download", "type": "progress", "progress": 1},
+        {"id": "b", "kind": "download", "type": "progress", "progress": 1},
+        {"id": "a", "kind": "download", "type": "status", "status": "downloading"},
+        {"id": "a", "kind": "download", "type": "progress", "progress": 2},
+        {"id": "a", "kind": "conversion", "type": "progress", "progress": 9},
+    ]
+    assert _coalesce(events) == [events[1], events[2], events[3], events[4]]
+
+
+def test_events_are_batched_per_subscriber(monkeypatch):
+    monkeypatch.setattr(ws, "EVENT_BATCH_INTERVAL", 0.01)
+
+    async def scenario():
+        manager = ConnectionManager()
+        everything = await manager.connect_events(FakeSocket())
+        everything.all_jobs = True
+        only_b = await manager.connect_events(FakeSocket(), compact=True)
+        only_b.job_ids.add("b")
+
+        await manager.broadcast("a", {"type": "progress", "progress": 1})
+        await manager.broadcast("a", {"type": "progress", "progress": 2})
+        await manager.broadcast("b", {"type": "status", "status": "completed"}, kind="conversion")
+        await asyncio.sleep(0.1)
+        manager.disconnect_events(everything)
+        manager.disconnect_events(only_b)
+        return everything.websocket.sent, only_b.websocket.sent
+
+    everything, only_b = asyncio.run(scenario())
+    assert len(everything) == 1
+    frame = everything[0]
+    assert frame["type"] == "events"
+    assert [(event["id"], event.get("progress")) for event in frame["events"]] == [("a", 2), ("b", None)]
+    assert only_b == [{"t": "events", "ev": [
+        {"i": "b", "k": "c", "t": "status", "st": "completed", "q": frame["events"][1]["seq"]},
+    ]}]
+
+
+def test_subscribe_sends_snapshot_of_requested_jobs(monkeypatch):
+    requested = []
+
+    async def job_snapshots(job_ids):
+        requested.append(job_ids)
+        return [{"kind": "download", "id": job_id, "status": "pending", "seq": 0}
+                for job_id in sorted(job_ids or ["x"])]
+
+    monkeypatch.setattr(ws, "manager", ConnectionManager())
+    monkeypatch.setattr(ws, "_job_snapshots", job_snapshots)
+    app = FastAPI()
+    app.include_router(ws.websocket_router)
+
+    with TestClient(app).websocket_connect("/ws/events") as socket:
+        socket.send_text(json.dumps({"action": "subscribe", "ids": ["a", "b"]}))
+        snapshot = socket.receive_json()
+        socket.send_text("not json")
+        error = socket.receive_json()
+        socket.send_text(json.dumps({"action": "subscribe", "all": True}))
+        everything = socket.receive_json()
+
+    assert snapshot["type"] == "snapshot"
+    assert [job["id"] for job in snapshot["jobs"]] == ["a", "b"]
+    assert error == {"type": "error", "message": "Invalid request"}
+    assert [job["id"] for job in everything["jobs"]] == ["x"]
+    assert requested == [{"a", "b"}, None]
@@ -0,0 +1,106 @@
+"""Tests for per-job event sequences and resync on reconnect"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import websocket as ws
+from api.websocket import ConnectionManager, JobEventLog
+
+
+def test_sequences_increase_per_job():
+    manager = ConnectionManager()
+    first = manager._record("a", "download", {"type": "progress", "progress": 1})
+    second = manager._record("b", "download", {"type": "progress", "progress": 1})
+    third = manager._record("a", "download", {"type": "status", "status": "completed"})
+    assert first["seq"] < second["seq"] < third["seq"]
+    assert manager.current_seq("a") == third["seq"]
+    assert manager.current_seq("unknown") == 0
+
+
+def test_replay_returns_only_missed_events():
+    manager = ConnectionManager()
+    seqs = [manager._record("a", "download", {"type": "progress", "progress": i})["seq"] for i in range(3)]
+    assert [event["progress"] for event in manager.replay("a", seqs[0])] == [1, 2]
+    assert manager.replay("a", seqs[-1]) == []
+    assert manager.replay("unknown", 0) is None
+
+
+def test_log_asks_for_a_snapshot_once_events_are_gone(monkeypatch):
+    monkeypatch.setattr(ws, "EVENT_HISTORY", 2)
+    log = JobEventLog()
+    for seq in (1, 2, 3):
+        log.append({"seq": seq})
+    assert log.since(0) is None  # Event 1 was pushed out
+    assert log.since(1) == [{"seq": 2}, {"seq": 3}]
+    assert log.since(4) is None  # From a future (other server run) - resync
+
+
+def test_least_recently_active_jobs_are_forgotten(monkeypatch):
+    monkeypatch.setattr(ws, "MAX_TRACKED_JOBS", 2)
+    manager = ConnectionManager()
+    for job_id in ("a", "b", "a", "c"):
+        manager._record(job_id, "download", {"type": "progress"})
+    assert manager.current_seq("b") == 0
+    assert manager.current_seq("a") and manager.current_seq("c")
+
+
+def test_recreated_log_does_not_claim_older_events(monkeypatch):
+    monkeypatch.setattr(ws, "MAX_TRACKED_JOBS", 1)
+    manager = ConnectionManager()
+    seen = manager._record("a", "download", {"type": "progress", "progress": 1})["seq"]
+    manager._record("a", "download", {"type": "info", "video_title": "Missed"})
+    manager._record("b", "download", {"type": "progress"})  # Evicts a's log
+    latest = manager._record("a", "download", {"type": "progress", "progress": 3})
+
+    assert manager.replay("a", seen) is None
+    assert manager.replay("a", latest["seq"] - 1) == [latest]
+
+    restarted = ConnectionManager()
+    restarted._record("a", "download", {"type": "progress", "progress": 4})
+    assert restarted.replay("a", latest["seq"]) is None
+
+
+def _client(monkeypatch, manager, snapshot=None):
+    async def status_snapshot(job_id):
+        return snapshot
+
+    monkeypatch.setattr(ws, "manager", manager)
+    monkeypatch.setattr(ws, "_status_snapshot", status_snapshot)
+    app = FastAPI()
+    app.include_router(ws.websocket_router)
+    return TestClient(app)
+
+
+def test_download_socket_replays_missed_events(monkeypatch):
+    manager = ConnectionManager()
+    seen = manager._record("job", "download", {"type": "progress", "progress": 10})["seq"]
+    missed = manager._record("job", "download", {"type": "progress", "progress": 20, "speed_bps": 2048})
+
+    with _client(monkeypatch, manager).websocket_connect(f"/ws/download/job?last_seq={seen}") as socket:
+        frame = socket.receive_json()
+    assert frame["seq"] == missed["seq"]
+    assert frame["progress"] == 20
+    assert frame["speed"] == "2.00 KB/s"
+
+
+def test_download_socket_sends_snapshot_without_last_seq(monkeypatch):
+    manager = ConnectionManager()
+    seq = manager._record("job", "download", {"type": "progress", "progress": 10})["seq"]
+    snapshot = {"type": "status", "id": "job", "status": "downloading", "progress": 10, "seq": seq}
+
+    with _client(monkeypatch, manager, snapshot).websocket_connect("/ws/download/job") as socket:
+        assert socket.receive_json() == snapshot
+        socket.send_text("ping")
+        assert socket.receive_json() == {"type": "pong"}
+
+
+def test_download_socket_sends_snapshot_after_eviction(monkeypatch):
+    monkeypatch.setattr(ws, "MAX_TRACKED_JOBS", 1)
+    manager = ConnectionManager()
+    seen = manager._record("job", "download", {"type": "progress", "progress": 10})["seq"]
+    manager._record("job", "download", {"type": "info", "video_title": "Missed"})
+    manager._record("other", "download", {"type": "progress"})
+    seq = manager._record("job", "download", {"type": "progress", "progress": 30})["seq"]
+    snapshot = {"type": "status", "id": "job", "status": "downloading", "progress": 30, "seq": seq}
+
+    with _client(monkeypatch, manager, snapshot).websocket_connect(f"/ws/download/job?last_seq={seen}") as socket:
+        assert socket.receive_json() == snapshot
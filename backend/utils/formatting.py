@@ -0,0 +1,27 @@
+"""
+Display formatting helpers
+Human-readable speed/ETA strings built from raw numbers, off the progress hot path
+"""
+from typing import Optional
+
+
+def format_speed(bytes_per_second: Optional[float]) -> Optional[str]:
+    """Format a transfer rate, e.g. 1289748 -> "1.23 MB/s" """
+    if bytes_per_second is None:
+        return None
+    if bytes_per_second >= 1024 * 1024:
+        return f"{bytes_per_second / (1024 * 1024):.2f} MB/s"
+    if bytes_per_second >= 1024:
+        return f"{bytes_per_second / 1024:.2f} KB/s"
+    return f"{bytes_per_second:.0f} B/s"
+
+
+def format_eta(seconds: Optional[float]) -> Optional[str]:
+    """Format remaining seconds like yt-dlp does, e.g. 90 -> "01:30", 3725 -> "1:02:05" """
+    if seconds is None:
+        return None
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
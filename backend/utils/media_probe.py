@@ -0,0 +1,168 @@
+"""
+Media probing helpers
+ffprobe stream/format info and the stream-copy decision for conversions.
+Probes are cached by (path, size, mtime), so each file is inspected once.
+"""
+import os
+import json
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Source audio codecs (ffprobe codec_name) an output format can hold without re-encoding
+COPYABLE_CODECS = {
+    "mp3": ("mp3",),
+    "aac": ("aac",),  # m4a container
+    "ogg": ("vorbis", "opus"),
+    "flac": ("flac",),
+    "wav": ("pcm_s16le",),
+}
+
+LOSSLESS_FORMATS = ("flac", "wav")
+
+# VBR sources average slightly above their nominal bitrate
+COPY_BITRATE_TOLERANCE = 1.05
+
+MAX_PROBE_CACHE = 512
+PROBE_TIMEOUT = 30  # seconds - a hung ffprobe must not stall a conversion
+
+_probe_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_probe_cache_lock = threading.Lock()
+
+
+def _ffprobe_cmd(path: str):
+    return [
+        'ffprobe', '-v', 'error',
+        '-show_format', '-show_streams',
+        '-of', 'json',
+        path
+    ]
+
+
+def _cache_key(path: str) -> Optional[Tuple[str, int, int]]:
+    """(path, size, mtime) identifying this version of the file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def _cached(key: Optional[Tuple[str, int, int]]) -> Optional[Dict[str, Any]]:
+    if key is None:
+        return None
+    with _probe_cache_lock:
+        probe = _probe_cache.get(key)
+        if probe is not None:
+            _probe_cache.move_to_end(key)
+        return probe
+
+
+def _store(key: Optional[Tuple[str, int, int]], probe: Optional[Dict[str, Any]]):
+    """Cache a successful probe (failures are retried next time)"""
+    if key is None or probe is None:
+        return
+    with _probe_cache_lock:
+        _probe_cache[key] = probe
+        _probe_cache.move_to_end(key)
+        while len(_probe_cache) > MAX_PROBE_CACHE:
+            _probe_cache.popitem(last=False)
+
+
+async def inspect_media(path: str, timeout: float = PROBE_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """
+    Run ffprobe without blocking the event loop and return its JSON
+    (format + streams), or None if it fails or takes longer than timeout
+    """
+    key = _cache_key(path)
+    if key is None:
+        return None  # Missing file
+    probe = _cached(key)
+    if probe is not None:
+        return probe
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *_ffprobe_cmd(path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.warning(f"ffprobe timed out after {timeout}s on {path}")
+            return None
+        if process.returncode == 0:
+            probe = json.loads(stdout)
+    except Exception as e:
+        logger.warning(f"Could not probe {path}: {e}")
+    _store(key, probe)
+    return probe
+
+
+def media_duration(probe: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Duration in seconds from ffprobe output"""
+    try:
+        return float(probe["format"]["duration"])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def audio_stream(probe: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """First audio stream from ffprobe output"""
+    for stream in (probe or {}).get("streams", []):
+        if stream.get("codec_type") == "audio":
+            return stream
+    return None
+
+
+def audio_bitrate(probe: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Audio bitrate in bits/s - the stream's, else the container's (webm/opus often lacks one)"""
+    for source in (audio_stream(probe) or {}, (probe or {}).get("format", {})):
+        try:
+            return int(source["bit_rate"])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def can_copy_audio(probe: Optional[Dict[str, Any]], output_format: str, quality: str) -> bool:
+    """
+    True if converting to output_format at quality (kbps) would not improve on
+    the source, so its audio can be stream-copied (remuxed) instead of re-encoded
+    """
+    stream = audio_stream(probe)
+    if not stream or stream.get("codec_name") not in COPYABLE_CODECS.get(output_format, ()):
+        return False
+    if output_format in LOSSLESS_FORMATS:
+        return True
+
+    bitrate = audio_bitrate(probe)
+    if bitrate is None:
+        return False
+    return bitrate <= int(quality) * 1000 * COPY_BITRATE_TOLERANCE
+
+
+def media_info(probe: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summary of ffprobe output: duration, codec, bitrate, channels, sample rate and tags"""
+    stream = audio_stream(probe) or {}
+    tags = dict(((probe or {}).get("format") or {}).get("tags") or {})
+    tags.update(stream.get("tags") or {})
+    try:
+        sample_rate = int(stream["sample_rate"])
+    except (KeyError, TypeError, ValueError):
+        sample_rate = None
+    return {
+        "duration": media_duration(probe),
+        "format": ((probe or {}).get("format") or {}).get("format_name"),
+        "codec": stream.get("codec_name"),
+        "bitrate": audio_bitrate(probe),
+        "channels": stream.get("channels"),
+        "sample_rate": sample_rate,
+        "tags": {key.lower(): value for key, value in tags.items()},
+    }
@@ -0,0 +1,44 @@
+"""
+YouTube URL helpers
+Video/playlist ID extraction and URL normalization
+"""
+import re
+from typing import Optional, Tuple
+
+_VIDEO_ID_PATTERNS = [
+    re.compile(r'(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/v/)([a-zA-Z0-9_-]{11})'),
+    re.compile(r'youtube\.com/shorts/([a-zA-Z0-9_-]{11})'),
+    re.compile(r'music\.youtube\.com/watch\?(?:.*&)?v=([a-zA-Z0-9_-]{11})'),
+]
+
+_PLAYLIST_ID_PATTERN = re.compile(r'[?&]list=([a-zA-Z0-9_-]+)')
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Extract the 11-character video ID from a YouTube URL"""
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def extract_playlist_id(url: str) -> Optional[str]:
+    """Extract the playlist ID (list=...) from a YouTube URL"""
+    match = _PLAYLIST_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
+    return None
+
+
+def extract_ids(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extract both video ID and playlist ID from a URL"""
+    return extract_video_id(url), extract_playlist_id(url)
+
+
+def normalize_youtube_url(url: str) -> Optional[str]:
+    """Normalize a YouTube video URL to its canonical form (video ID based)"""
+    video_id = extract_video_id(url)
+    if video_id:
+        return f"https://youtube.com/watch?v={video_id}"
+    return None
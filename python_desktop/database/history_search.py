@@ -0,0 +1,104 @@
+"""
+Geçmiş Arama
+İndirme geçmişi için FTS5 indeksi (başlık, kanal, dosya adı, URL).
+Tetikleyicilerle güncel tutulur; Türkçe harf katlama ve önek eşleşmesi yapar.
+"""
+import re
+import sqlite3
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# bm25() sıralaması için sütun ağırlıkları: başlık, kanal, dosya adı, URL
+RANK_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+# unicode61 büyük/küçük harfi ve (remove_diacritics 2 ile) ş/ğ/ç/ö/ü -> s/g/c/o/u
+# katlar. Türkçe noktalı/noktasız i'yi bilmez; bu yüzden ı ve İ hem indekslemeden
+# önce (tetikleyicilerde) hem de sorgudan önce (fold_turkish) i'ye çevrilir
+_FOLD_SQL = "replace(replace(coalesce({0}, ''), 'ı', 'i'), 'İ', 'i')"
+
+_INDEXED = (
+    _FOLD_SQL.format("new.video_title"),
+    _FOLD_SQL.format("new.channel_name"),
+    _FOLD_SQL.format("new.file_name"),
+    _FOLD_SQL.format("new.url"),
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def fold_turkish(text: str) -> str:
+    """ı/İ harflerini i yap (büyük/küçük harf ve diğer aksanlar tokenizer'da)"""
+    return text.replace("ı", "i").replace("İ", "i")
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Kullanıcı girdisi için FTS5 MATCH ifadesi: her kelime önek olarak
+    eşleşmeli, ör. 'sezen aks' -> '"sezen"* "aks"*'. Kelime yoksa None.
+    """
+    tokens = _TOKEN_PATTERN.findall(fold_turkish(text))
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def ensure_history_fts(cursor: sqlite3.Cursor) -> bool:
+    """
+    history_fts indeksini ve tetikleyicilerini yoksa oluştur, mevcut
+    kayıtlarla doldur. Silinmiş (is_deleted) kayıtlar indekslenmez.
+
+    Returns:
+        SQLite FTS5 desteklemiyorsa False (arama LIKE ile yapılır)
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'")
+    if cursor.fetchone():
+        return True
+
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE history_fts USING fts5(
+                video_title, channel_name, file_name, url,
+                tokenize = "unicode61 remove_diacritics 2"
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 kullanılamıyor, geçmiş araması LIKE ile yapılacak: {e}")
+        return False
+
+    values = ", ".join(_INDEXED)
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS history_fts_insert
+        AFTER INSERT ON download_history
+        WHEN coalesce(new.is_deleted, 0) = 0
+        BEGIN
+            INSERT INTO history_fts(rowid, video_title, channel_name, file_name, url)
+            VALUES (new.id, {values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS history_fts_update
+        AFTER UPDATE OF video_title, channel_name, file_name, url, is_deleted ON download_history
+        BEGIN
+            DELETE FROM history_fts WHERE rowid = old.id;
+            INSERT INTO history_fts(rowid, video_title, channel_name, file_name, url)
+            SELECT new.id, {values} WHERE coalesce(new.is_deleted, 0) = 0;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS history_fts_delete
+        AFTER DELETE ON download_history
+        BEGIN
+            DELETE FROM history_fts WHERE rowid = old.id;
+        END
+    ''')
+
+    backfill = ", ".join(value.replace("new.", "") for value in _INDEXED)
+    cursor.execute(f'''
+        INSERT INTO history_fts(rowid, video_title, channel_name, file_name, url)
+        SELECT id, {backfill} FROM download_history
+        WHERE coalesce(is_deleted, 0) = 0
+    ''')
+    logger.info(f"Geçmiş arama indeksi oluşturuldu ({cursor.rowcount} kayıt)")
+    return True
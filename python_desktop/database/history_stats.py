@@ -0,0 +1,133 @@
+"""
+Geçmiş İstatistikleri
+download_history üzerindeki tetikleyicilerle güncel tutulan özet tablolar
+(toplamlar, kanal bazında, gün bazında); istatistikler geçmiş taranmadan okunur
+"""
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _apply(row: str, sign: str, condition: str) -> str:
+    """Bir geçmiş kaydını özetlere ekleyen (sign '+') ya da çıkaran (sign '-') SQL"""
+    return f'''
+        UPDATE history_totals SET
+            downloads = downloads {sign} 1,
+            total_size = total_size {sign} coalesce({row}.file_size, 0),
+            total_duration = total_duration {sign} coalesce({row}.duration, 0)
+        WHERE id = 1 AND {condition};
+        INSERT INTO history_channel_stats(channel_name, downloads)
+        SELECT {row}.channel_name, {sign}1
+        WHERE {condition} AND coalesce({row}.channel_name, '') != ''
+        ON CONFLICT(channel_name) DO UPDATE SET downloads = downloads + excluded.downloads;
+        INSERT INTO history_daily_stats(day, downloads)
+        SELECT date({row}.downloaded_at, 'localtime'), {sign}1
+        WHERE {condition} AND {row}.downloaded_at IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET downloads = downloads + excluded.downloads;
+    '''
+
+
+_ADD_NEW = _apply("new", "+", "coalesce(new.is_deleted, 0) = 0")
+_REMOVE_OLD = _apply("old", "-", "coalesce(old.is_deleted, 0) = 0") + '''
+        DELETE FROM history_channel_stats WHERE channel_name = old.channel_name AND downloads <= 0;
+        DELETE FROM history_daily_stats WHERE day = date(old.downloaded_at, 'localtime') AND downloads <= 0;
+'''
+
+
+def _create_triggers(cursor: sqlite3.Cursor):
+    """Özetleri download_history ile eşzamanlı tutan tetikleyiciler"""
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS history_stats_insert
+        AFTER INSERT ON download_history
+        BEGIN {_ADD_NEW} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS history_stats_update
+        AFTER UPDATE OF is_deleted, file_size, duration, channel_name, downloaded_at ON download_history
+        BEGIN {_REMOVE_OLD} {_ADD_NEW} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS history_stats_delete
+        AFTER DELETE ON download_history
+        BEGIN {_REMOVE_OLD} END
+    ''')
+
+
+def _fill_daily_stats(cursor: sqlite3.Cursor):
+    """Silinmemiş kayıtları yerel gün bazında say"""
+    cursor.execute('''
+        INSERT INTO history_daily_stats(day, downloads)
+        SELECT date(downloaded_at, 'localtime'), COUNT(*) FROM download_history
+        WHERE is_deleted = 0 AND downloaded_at IS NOT NULL
+        GROUP BY date(downloaded_at, 'localtime')
+    ''')
+
+
+def _migrate_local_days(cursor: sqlite3.Cursor):
+    """
+    Günler eskiden UTC tarihiydi (downloaded_at UTC), "bugün" ise yerel
+    tarihle okunuyor - tetikleyicileri yeniden oluştur, günleri yeniden say
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'history_stats_insert'")
+    row = cursor.fetchone()
+    if row and "'localtime'" in row[0]:
+        return
+    for trigger in ("history_stats_insert", "history_stats_update", "history_stats_delete"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    _create_triggers(cursor)
+    cursor.execute("DELETE FROM history_daily_stats")
+    _fill_daily_stats(cursor)
+    logger.info("Geçiş: günlük geçmiş istatistikleri artık yerel tarih kullanıyor")
+
+
+def ensure_history_stats(cursor: sqlite3.Cursor):
+    """
+    Özet tabloları ve tetikleyicilerini yoksa oluştur, mevcut kayıtlarla
+    doldur. Silinmiş (is_deleted) kayıtlar sayılmaz.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'history_totals'")
+    if cursor.fetchone():
+        _migrate_local_days(cursor)
+        return
+
+    cursor.execute('''
+        CREATE TABLE history_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            downloads INTEGER NOT NULL,
+            total_size INTEGER NOT NULL,
+            total_duration INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE history_channel_stats (
+            channel_name TEXT PRIMARY KEY,
+            downloads INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX idx_channel_stats_downloads
+        ON history_channel_stats(downloads DESC)
+    ''')
+    cursor.execute('''
+        CREATE TABLE history_daily_stats (
+            day TEXT PRIMARY KEY,
+            downloads INTEGER NOT NULL
+        )
+    ''')
+
+    _create_triggers(cursor)
+
+    cursor.execute('''
+        INSERT INTO history_totals(id, downloads, total_size, total_duration)
+        SELECT 1, COUNT(*), coalesce(SUM(file_size), 0), coalesce(SUM(duration), 0)
+        FROM download_history WHERE is_deleted = 0
+    ''')
+    cursor.execute('''
+        INSERT INTO history_channel_stats(channel_name, downloads)
+        SELECT channel_name, COUNT(*) FROM download_history
+        WHERE is_deleted = 0 AND channel_name IS NOT NULL AND channel_name != ''
+        GROUP BY channel_name
+    ''')
+    _fill_daily_stats(cursor)
+    logger.info("Geçmiş istatistik tabloları oluşturuldu")
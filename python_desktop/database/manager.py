@@ -2,16 +2,23 @@ import sqlite3
 import os
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
+
+from .history_search import RANK_WEIGHTS, build_match_query, ensure_history_fts
+from .history_stats import ensure_history_stats
 
 logger = logging.getLogger(__name__)
 
+# IN (...) listelerinde tek sorguda kullanılacak en fazla parametre
+MAX_QUERY_PARAMS = 500
+
 
 class DatabaseManager:
     """İndirme geçmişi veritabanı yöneticisi"""
     
     def __init__(self, db_path: str = "mp3yap.db"):
         self.db_path = db_path
+        self.fts_enabled = False
         self.init_database()
     
     def init_db(self):
@@ -134,6 +141,21 @@ class DatabaseManager:
             self._add_is_deleted_columns(cursor)
             # video_id sütununu ekle
             self._add_video_id_columns(cursor)
+            # Tekrar kontrolü için video_id indeksleri (sorgulardaki koşullarla aynı)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_queue_active_video_id
+                ON download_queue(video_id)
+                WHERE is_deleted = 0 AND status != 'completed' AND video_id IS NOT NULL
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_history_video_file
+                ON download_history(video_id, file_path)
+                WHERE is_deleted = 0 AND video_id IS NOT NULL AND video_id != ''
+            ''')
+            # Geçmiş araması için tam metin indeksi
+            self.fts_enabled = ensure_history_fts(cursor)
+            # İstatistikler için tetikleyicilerle tutulan özet tablolar
+            ensure_history_stats(cursor)
             conn.commit()
     
     def add_download(self, video_info: Dict) -> int:
@@ -182,16 +204,26 @@ class DatabaseManager:
             return [dict(row) for row in cursor.fetchall()]
     
     def search_downloads(self, query: str) -> List[Dict]:
-        """İndirme geçmişinde arama yap"""
+        """İndirme geçmişinde arama yap (başlık, kanal, dosya adı, URL; en iyi eşleşme önce)"""
+        match = build_match_query(query) if self.fts_enabled else None
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM download_history 
-                WHERE (video_title LIKE ? OR channel_name LIKE ? OR url LIKE ?)
-                AND is_deleted = 0
-                ORDER BY downloaded_at DESC
-            ''', (f'%{query}%', f'%{query}%', f'%{query}%'))
+            if match:
+                weights = ", ".join(str(w) for w in RANK_WEIGHTS)
+                cursor.execute(f'''
+                    SELECT h.* FROM history_fts
+                    JOIN download_history h ON h.id = history_fts.rowid
+                    WHERE history_fts MATCH ? AND h.is_deleted = 0
+                    ORDER BY bm25(history_fts, {weights}), h.downloaded_at DESC
+                ''', (match,))
+            else:
+                cursor.execute('''
+                    SELECT * FROM download_history 
+                    WHERE (video_title LIKE ? OR channel_name LIKE ? OR url LIKE ?)
+                    AND is_deleted = 0
+                    ORDER BY downloaded_at DESC
+                ''', (f'%{query}%', f'%{query}%', f'%{query}%'))
             
             return [dict(row) for row in cursor.fetchall()]
     
@@ -221,35 +253,29 @@ class DatabaseManager:
             return dict(row) if row else None
     
     def get_statistics(self) -> Dict:
-        """İndirme istatistiklerini getir"""
+        """İndirme istatistiklerini getir (tetikleyicilerle tutulan özet tablolardan)"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
-            # Toplam indirme sayısı
-            cursor.execute('SELECT COUNT(*) FROM download_history WHERE is_deleted = 0')
-            total_downloads = cursor.fetchone()[0]
-            
-            # Toplam dosya boyutu
-            cursor.execute('SELECT SUM(file_size) FROM download_history WHERE is_deleted = 0')
-            total_size = cursor.fetchone()[0] or 0
+            # Toplam indirme sayısı ve dosya boyutu
+            cursor.execute('SELECT downloads, total_size FROM history_totals WHERE id = 1')
+            total_downloads, total_size = cursor.fetchone()
             
             # En çok indirilen kanal
             cursor.execute('''
-                SELECT channel_name, COUNT(*) as count 
-                FROM download_history 
-                WHERE channel_name IS NOT NULL AND channel_name != '' AND is_deleted = 0
-                GROUP BY channel_name 
-                ORDER BY count DESC 
+                SELECT channel_name, downloads FROM history_channel_stats
+                ORDER BY downloads DESC 
                 LIMIT 5
             ''')
             top_channels = cursor.fetchall()
             
             # Bugünkü indirmeler
             cursor.execute('''
-                SELECT COUNT(*) FROM download_history 
-                WHERE DATE(downloaded_at) = DATE('now', 'localtime') AND is_deleted = 0
+                SELECT downloads FROM history_daily_stats
+                WHERE day = DATE('now', 'localtime')
             ''')
-            today_downloads = cursor.fetchone()[0]
+            row = cursor.fetchone()
+            today_downloads = row[0] if row else 0
             
             return {
                 'total_downloads': total_downloads,
@@ -413,6 +439,26 @@ class DatabaseManager:
             ''')
             return {row[0] for row in cursor.fetchall()}
     
+    def get_downloaded_video_ids(self, video_ids: Iterable[str]) -> set:
+        """Verilen ID'lerden dosyası hâlâ diskte olan indirilmiş videoları set olarak getir"""
+        video_ids = list(dict.fromkeys(video_ids))
+        downloaded = set()
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(video_ids), MAX_QUERY_PARAMS):
+                chunk = video_ids[start:start + MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                # Kısmi kapsayan indeks: yalnızca adayların satırları okunur
+                cursor.execute(f'''
+                    SELECT video_id, file_path FROM download_history INDEXED BY idx_history_video_file
+                    WHERE video_id IN ({placeholders})
+                      AND is_deleted = 0 AND video_id IS NOT NULL AND video_id != ''
+                ''', chunk)
+                for video_id, file_path in cursor.fetchall():
+                    if video_id not in downloaded and file_path and os.path.exists(file_path):
+                        downloaded.add(video_id)
+        return downloaded
+    
     def add_to_queue_batch(self, items: List[Dict]) -> int:
         """Birden fazla öğeyi kuyruğa toplu ekle"""
         if not items:
@@ -0,0 +1,187 @@
+"""
+Metadata Cache
+SQLite-backed cache of yt-dlp extraction results keyed by video/playlist id
+Entries expire after a TTL and the table is bounded with LRU eviction
+"""
+import sqlite3
+import json
+import time
+import logging
+import threading
+from typing import Dict, Optional, Any
+from utils.youtube_utils import extract_ids
+
+logger = logging.getLogger(__name__)
+
+# Video metadata rarely changes, playlist contents do
+VIDEO_TTL_SECONDS = 7 * 24 * 3600
+PLAYLIST_TTL_SECONDS = 6 * 3600
+MAX_ENTRIES = 5000
+
+# Fields kept from a yt-dlp info dict (formats, thumbnails etc. are dropped)
+VIDEO_FIELDS = ('id', 'title', 'duration', 'uploader', 'channel', 'channel_url',
+                'uploader_url', 'webpage_url')
+ENTRY_FIELDS = ('id', 'url', 'title', 'duration', 'uploader', 'channel')
+PLAYLIST_FIELDS = ('id', 'title', 'uploader', 'channel', 'webpage_url', 'playlist_count')
+
+
+def cache_key_for_url(url: str) -> Optional[str]:
+    """Cache key for a URL - playlist id wins, like yt-dlp's default (noplaylist=False)"""
+    video_id, playlist_id = extract_ids(url)
+    if playlist_id:
+        return f"playlist:{playlist_id}"
+    if video_id:
+        return f"video:{video_id}"
+    return None
+
+
+def cache_key_for_info(info: Dict[str, Any]) -> Optional[str]:
+    """Cache key for a yt-dlp info dict"""
+    item_id = info.get('id')
+    if not item_id:
+        return None
+    kind = 'playlist' if info.get('_type') == 'playlist' else 'video'
+    return f"{kind}:{item_id}"
+
+
+def slim_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a yt-dlp info dict to the fields worth caching"""
+    def pick(source: Dict[str, Any], fields) -> Dict[str, Any]:
+        # Missing values are left out so callers' .get() defaults still apply
+        return {key: source[key] for key in fields if source.get(key) is not None}
+
+    if info.get('_type') == 'playlist':
+        data = pick(info, PLAYLIST_FIELDS)
+        data['_type'] = 'playlist'
+        data['entries'] = [
+            pick(entry, ENTRY_FIELDS)
+            for entry in (info.get('entries') or [])
+            if entry
+        ]
+        if not data.get('playlist_count'):
+            data['playlist_count'] = len(data['entries'])
+        return data
+
+    data = pick(info, VIDEO_FIELDS)
+    data['_type'] = 'video'
+    return data
+
+
+class MetadataCache:
+    """Persistent yt-dlp metadata cache (thread-safe, call from background threads)"""
+
+    def __init__(self, db_path: str = "mp3yap.db", max_entries: int = MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.init_database()
+
+    def init_database(self):
+        """Create the cache table"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metadata_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_metadata_cache_accessed
+                ON metadata_cache(accessed_at)
+            ''')
+            conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get cached metadata for a URL, or None on miss/expiry"""
+        key = cache_key_for_url(url)
+        return self.get_by_key(key) if key else None
+
+    def get_by_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get cached metadata by cache key and refresh its LRU timestamp"""
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT data FROM metadata_cache
+                WHERE cache_key = ? AND expires_at > ?
+            ''', (key, now))
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            cursor.execute('''
+                UPDATE metadata_cache SET accessed_at = ? WHERE cache_key = ?
+            ''', (now, key))
+            conn.commit()
+
+        try:
+            return json.loads(row[0])
+        except (TypeError, ValueError):
+            logger.warning(f"Corrupt metadata cache entry: {key}")
+            return None
+
+    def put(self, info: Dict[str, Any]) -> None:
+        """Store metadata from a yt-dlp info dict"""
+        if not info:
+            return
+        key = cache_key_for_info(info)
+        if not key:
+            return
+
+        data = slim_info(info)
+        ttl = PLAYLIST_TTL_SECONDS if data['_type'] == 'playlist' else VIDEO_TTL_SECONDS
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO metadata_cache
+                (cache_key, data, created_at, accessed_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (key, json.dumps(data, ensure_ascii=False), now, now, now + ttl))
+            self._evict(cursor, now)
+            conn.commit()
+
+    def invalidate(self, url: str) -> None:
+        """Drop the cached entry for a URL"""
+        key = cache_key_for_url(url)
+        if not key:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM metadata_cache WHERE cache_key = ?', (key,))
+            conn.commit()
+
+    def _evict(self, cursor: sqlite3.Cursor, now: float) -> None:
+        """Remove expired entries, then least recently used ones over the size bound"""
+        cursor.execute('DELETE FROM metadata_cache WHERE expires_at <= ?', (now,))
+
+        cursor.execute('SELECT COUNT(*) FROM metadata_cache')
+        overflow = cursor.fetchone()[0] - self.max_entries
+        if overflow > 0:
+            cursor.execute('''
+                DELETE FROM metadata_cache WHERE cache_key IN (
+                    SELECT cache_key FROM metadata_cache
+                    ORDER BY accessed_at ASC
+                    LIMIT ?
+                )
+            ''', (overflow,))
+            logger.debug(f"Metadata cache evicted {overflow} entries")
+
+
+# Global metadata cache instance with thread-safe initialization
+_metadata_cache = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Get or create global metadata cache instance (thread-safe)"""
+    global _metadata_cache
+    if _metadata_cache is None:
+        with _metadata_cache_lock:
+            # Double-checked locking pattern
+            if _metadata_cache is None:
+                _metadata_cache = MetadataCache()
+    return _metadata_cache
@@ -10,6 +10,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from PyQt5.QtCore import QThread, pyqtSignal, QObject
 import yt_dlp
 
+from database.metadata_cache import get_metadata_cache
 from utils.translation_manager import translation_manager
 
 logger = logging.getLogger(__name__)
@@ -108,29 +109,36 @@ class UrlAnalyzer:
                 'skip_download': True,
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if info and info.get('_type') == 'playlist':
-                    playlist_title = info.get('title', translation_manager.tr("common.labels.unnamed_playlist"))
-                    playlist_size = info.get('playlist_count', 0)
-                    if playlist_size == 0 and 'entries' in info:
-                        playlist_size = len(info['entries'])
-                    uploader = info.get('uploader', info.get('channel', ''))
+            # Cached result avoids re-fetching the playlist page
+            metadata_cache = get_metadata_cache()
+            info = metadata_cache.get(url)
+            if info is None:
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.extract_info(url, download=False)
+                if info:
+                    metadata_cache.put(info)
+
+            if info and info.get('_type') == 'playlist':
+                playlist_title = info.get('title', translation_manager.tr("common.labels.unnamed_playlist"))
+                playlist_size = info.get('playlist_count', 0)
+                if playlist_size == 0 and 'entries' in info:
+                    playlist_size = len(info['entries'])
+                uploader = info.get('uploader', info.get('channel', ''))
                     
-                    return {
-                        'url': url,
-                        'is_playlist': True,
-                        'title': playlist_title,
-                        'video_count': playlist_size,
-                        'uploader': uploader
-                    }
-                else:
-                    return {
-                        'url': url,
-                        'is_playlist': False,
-                        'title': translation_manager.tr("common.labels.single_video"),
-                        'video_count': 1
-                    }
+                return {
+                    'url': url,
+                    'is_playlist': True,
+                    'title': playlist_title,
+                    'video_count': playlist_size,
+                    'uploader': uploader
+                }
+            else:
+                return {
+                    'url': url,
+                    'is_playlist': False,
+                    'title': translation_manager.tr("common.labels.single_video"),
+                    'video_count': 1
+                }
         except Exception as e:
             logger.warning(f"Playlist bilgisi alınamadı: {e}")
             return {
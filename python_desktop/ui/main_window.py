@@ -19,6 +19,7 @@ from ui.converter_widget import ConverterWidget
 from ui.preloader_widget import PreloaderWidget
 from utils.config import Config
 from database.manager import DatabaseManager
+from database.metadata_cache import get_metadata_cache
 from styles import style_manager
 from utils.icon_manager import icon_manager
 from utils.platform_utils import get_keyboard_icon, get_modifier_symbol, convert_shortcut_for_platform
@@ -84,57 +85,68 @@ class QueueProcessThread(QThread):
                 'skip_download': True,
             }
 
-            # Mevcut video ID'lerini al
-            existing_video_ids = self.db_manager.get_existing_queue_video_ids()
+            metadata_cache = get_metadata_cache()
+
+            # Eklenecek adaylar: (öğe, başlık, aynı partide tekrarı engelle)
+            candidates = []
 
             for url in self.urls:
                 try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        info = ydl.extract_info(url, download=False)
+                    # Önce yerel metadata önbelleğine bak
+                    info = metadata_cache.get(url)
+                    if info is None:
+                        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                            info = ydl.extract_info(url, download=False)
                         if info:
-                            if info.get('_type') == 'playlist':
-                                # Playlist ise her video için kontrol et
-                                playlist_title = info.get('title') or translation_manager.tr("common.labels.unnamed_playlist")
-                                entries = info.get('entries', [])
-                                for idx, entry in enumerate(entries):
-                                    video_id = entry.get('id')
-                                    video_url = entry.get('url', '')
-                                    video_title = entry.get('title', f'Video {idx+1}')
-                                    full_title = f"[{playlist_title}] {video_title}"
-
-                                    # Duplicate kontrolü
-                                    if video_id and video_id in existing_video_ids:
-                                        duplicate_videos.append(video_title)
-                                    else:
-                                        items_to_add.append({
-                                            'url': video_url,
-                                            'video_title': full_title,
-                                            'video_id': video_id
-                                        })
-                                        if video_id:
-                                            existing_video_ids.add(video_id)
-                            else:
-                                # Tek video
-                                video_id = info.get('id')
-                                video_title = info.get('title') or translation_manager.tr("common.labels.unnamed_video")
-
-                                # Duplicate kontrolü
-                                if video_id and video_id in existing_video_ids:
-                                    duplicate_videos.append(video_title)
-                                else:
-                                    items_to_add.append({
-                                        'url': url,
-                                        'video_title': video_title,
-                                        'video_id': video_id
-                                    })
+                            metadata_cache.put(info)
+                    if info:
+                        if info.get('_type') == 'playlist':
+                            # Playlist ise her video için kontrol et
+                            playlist_title = info.get('title') or translation_manager.tr("common.labels.unnamed_playlist")
+                            entries = info.get('entries', [])
+                            for idx, entry in enumerate(entries):
+                                video_id = entry.get('id')
+                                video_url = entry.get('url', '')
+                                video_title = entry.get('title', f'Video {idx+1}')
+                                full_title = f"[{playlist_title}] {video_title}"
+                                candidates.append(({
+                                    'url': video_url,
+                                    'video_title': full_title,
+                                    'video_id': video_id
+                                }, video_title, True))
+                        else:
+                            # Tek video
+                            video_id = info.get('id')
+                            video_title = info.get('title') or translation_manager.tr("common.labels.unnamed_video")
+                            candidates.append(({
+                                'url': url,
+                                'video_title': video_title,
+                                'video_id': video_id
+                            }, video_title, False))
                 except Exception as e:
                     logger.warning(f"Failed to fetch video info: {e}")
                     # Hata durumunda URL ile ekle
-                    items_to_add.append({
+                    candidates.append(({
                         'url': url,
                         'video_title': None,
                         'video_id': None
-                    })
+                    }, None, False))
+
+            # Mevcut video ID'leri: kuyruktakiler + adaylardan dosyası duran indirmeler
+            existing_video_ids = self.db_manager.get_existing_queue_video_ids()
+            existing_video_ids |= self.db_manager.get_downloaded_video_ids(
+                item['video_id'] for item, _, _ in candidates if item['video_id']
+            )
+
+            # Duplicate kontrolü
+            for item, video_title, remember in candidates:
+                video_id = item['video_id']
+                if video_id and video_id in existing_video_ids:
+                    duplicate_videos.append(video_title)
+                else:
+                    items_to_add.append(item)
+                    if remember and video_id:
+                        existing_video_ids.add(video_id)
 
             # Toplu ekleme yap
             added_count = self.db_manager.add_to_queue_batch(items_to_add)
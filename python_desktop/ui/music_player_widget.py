@@ -8,6 +8,7 @@ from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QPushButton,
                             QLabel, QSlider, QFrame)
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QProcess
 from utils.icon_manager import icon_manager
+from utils.media_probe import probe_media, media_info
 from utils.translation_manager import translation_manager
 
 logger = logging.getLogger(__name__)
@@ -304,18 +305,9 @@ class MusicPlayerWidget(QFrame):
             self.status_label.setText("▶ Çalıyor")
             self.start_time = 0
 
-            # Get duration
-            try:
-                import subprocess
-                result = subprocess.run(
-                    ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                     '-of', 'default=noprint_wrappers=1:nokey=1', abs_path],
-                    capture_output=True, text=True, timeout=2
-                )
-                if result.returncode == 0:
-                    self.duration = int(float(result.stdout.strip()))
-            except:
-                self.duration = 0
+            # Get duration (probe is cached per file version)
+            duration = media_info(probe_media(abs_path, timeout=2))["duration"]
+            self.duration = int(duration) if duration else 0
 
             # Start timer
             self.timer.start()
@@ -0,0 +1,84 @@
+"""
+Medya İnceleme
+Tek bir ffprobe çağrısıyla süre, codec, bit hızı, kanal ve etiket bilgisi;
+sonuçlar (yol, boyut, değiştirilme zamanı) ile önbelleğe alınır
+"""
+import os
+import json
+import logging
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_PROBE_CACHE = 512
+
+_probe_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_probe_cache_lock = threading.Lock()
+
+
+def _cache_key(path: str) -> Optional[Tuple[str, int, int]]:
+    """Dosyanın bu sürümünü tanımlayan (yol, boyut, mtime); dosya yoksa None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def probe_media(path: str, timeout: float = 5) -> Optional[Dict[str, Any]]:
+    """ffprobe JSON çıktısını (format + akışlar) döndürür, başarısızsa None"""
+    key = _cache_key(path)
+    if key is None:
+        return None
+
+    with _probe_cache_lock:
+        probe = _probe_cache.get(key)
+        if probe is not None:
+            _probe_cache.move_to_end(key)
+            return probe
+
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_format', '-show_streams', '-of', 'json', path],
+            capture_output=True, text=True, timeout=timeout
+        )
+        if result.returncode != 0:
+            return None
+        probe = json.loads(result.stdout)
+    except Exception as e:
+        logger.warning(f"Medya incelenemedi {path}: {e}")
+        return None
+
+    with _probe_cache_lock:
+        _probe_cache[key] = probe
+        while len(_probe_cache) > MAX_PROBE_CACHE:
+            _probe_cache.popitem(last=False)
+    return probe
+
+
+def media_info(probe: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """ffprobe çıktısının özeti: süre, codec, bit hızı, kanal, örnekleme hızı ve etiketler"""
+    fmt = (probe or {}).get("format") or {}
+    stream = next(
+        (s for s in (probe or {}).get("streams", []) if s.get("codec_type") == "audio"), {}
+    )
+
+    def number(value, cast):
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            return None
+
+    tags = dict(fmt.get("tags") or {})
+    tags.update(stream.get("tags") or {})
+    return {
+        "duration": number(fmt.get("duration"), float),
+        "codec": stream.get("codec_name"),
+        "bitrate": number(stream.get("bit_rate"), int) or number(fmt.get("bit_rate"), int),
+        "channels": stream.get("channels"),
+        "sample_rate": number(stream.get("sample_rate"), int),
+        "tags": {key.lower(): value for key, value in tags.items()},
+    }